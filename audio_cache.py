@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+WhisperUI decoded-audio cache
+Decoded 16 kHz mono float32 audio stored as .npy files keyed by the media
+file's content hash, so re-running a file with another model or language maps
+the samples from disk instead of decoding the container again
+
+Inspect or clear it from the command line:
+    python audio_cache.py --list
+    python audio_cache.py --clear
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import chunked
+import result_cache
+from result_cache import CACHE_ROOT, evict_lru
+
+
+# Default disk quota, override with WHISPERUI_AUDIO_CACHE_MB (one hour of audio is about 230 MB)
+DEFAULT_MAX_MB = 4096
+
+
+def max_mb_from_env():
+    try:
+        return int(os.environ.get("WHISPERUI_AUDIO_CACHE_MB", DEFAULT_MAX_MB))
+    except ValueError:
+        return DEFAULT_MAX_MB
+
+
+class AudioCache:
+    """Memory-mappable decoded audio, one .npy file per content hash, LRU under a disk quota"""
+
+    def __init__(self, directory=None, max_mb=None, decode=None):
+        self.directory = Path(directory or os.path.join(CACHE_ROOT, "audio"))
+        self.max_bytes = (max_mb_from_env() if max_mb is None else max_mb) * 1024 * 1024
+        self.decode = decode or chunked.load_audio  # path -> 16 kHz mono float32 on a miss
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, content_hash):
+        return self.directory / f"{content_hash}-{chunked.SAMPLING_RATE}.npy"
+
+    def get(self, content_hash):
+        """Map cached samples read-only (pages load on demand), or None on a miss"""
+        import numpy as np
+
+        path = self._path(content_hash)
+        try:
+            audio = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+        # Touch so eviction treats this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return audio
+
+    def put(self, content_hash, audio):
+        """Store decoded samples and return them mapped from the cache file
+
+        Audio larger than the whole quota is not cached and comes back as is.
+        """
+        import numpy as np
+
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        if audio.nbytes > self.max_bytes:
+            return audio
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so a crash never leaves a truncated array behind
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, audio)
+            os.replace(tmp_path, self._path(content_hash))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict_to_limit(keep=content_hash)
+        mapped = self.get(content_hash)
+        return audio if mapped is None else mapped
+
+    def load(self, path, content_hash=None):
+        """Decoded audio for a media file: mapped from the cache, or decoded and cached"""
+        content_hash = content_hash or result_cache.file_content_hash(path)
+        audio = self.get(content_hash)
+        if audio is not None:
+            self.hits += 1
+            return audio
+
+        self.misses += 1
+        audio = self.decode(str(path))
+        try:
+            return self.put(content_hash, audio)
+        except OSError:
+            return audio  # A full or read-only disk must not fail the transcription
+
+    def _files(self):
+        if not self.directory.is_dir():
+            return []
+        return [path for path in self.directory.glob("*.npy") if path.is_file()]
+
+    def evict_to_limit(self, keep=None):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            files = self._files()
+            if keep is not None:
+                # Never evict the entry that was just written
+                files = [path for path in files if path != self._path(keep)]
+                try:
+                    budget = self.max_bytes - self._path(keep).stat().st_size
+                except OSError:
+                    budget = self.max_bytes
+            else:
+                budget = self.max_bytes
+            evict_lru(files, budget)
+
+    def entries(self):
+        """Describe cached audio, most recently used first"""
+        result = []
+        for path in self._files():
+            stat = path.stat()
+            result.append({
+                "key": path.name.rsplit("-", 1)[0],
+                "bytes": stat.st_size,
+                "seconds": max(0, stat.st_size - 128) / 4 / chunked.SAMPLING_RATE,  # float32 after the .npy header
+                "last_used": stat.st_mtime,
+            })
+        return sorted(result, key=lambda entry: entry["last_used"], reverse=True)
+
+    def stats(self):
+        files = self._files()
+        return {
+            "directory": str(self.directory),
+            "entries": len(files),
+            "bytes": sum(path.stat().st_size for path in files),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self):
+        """Delete every cached array, returning how many were removed"""
+        removed = 0
+        with self._lock:
+            for path in self._files():
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the WhisperUI decoded-audio cache")
+    parser.add_argument("--list", action="store_true", help="List cached audio")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached audio")
+    args = parser.parse_args(argv)
+
+    cache = AudioCache()
+    if args.clear:
+        print(f"Removed {cache.clear()} cached file(s) from {cache.directory}")
+        return 0
+
+    if args.list:
+        for entry in cache.entries():
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))
+            print(f"{used}  {entry['bytes'] / 1048576:8.1f} MB  {entry['seconds'] / 60:7.1f} min  {entry['key']}")
+
+    stats = cache.stats()
+    print(f"{stats['entries']} entries, {stats['bytes'] / 1048576:.1f} of {stats['max_bytes'] / 1048576:.0f} MB "
+          f"in {stats['directory']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
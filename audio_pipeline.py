@@ -0,0 +1,130 @@
+"""
+WhisperUI decode pipeline
+Producer/consumer stage that decodes upcoming media files to 16 kHz mono
+float32 on a background thread while the current file is being transcribed,
+with per-stage timings showing how much decode time was hidden
+"""
+
+import queue
+import threading
+import time
+from collections import namedtuple
+
+
+# One decoded item: the item from the source, its audio (None on error), the error and the decode time
+Decoded = namedtuple("Decoded", "item audio error decode_seconds")
+
+_END = object()
+
+
+class StageTimings:
+    """Thread-safe totals for the decode and inference stages"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.files = 0
+        self.decode_seconds = 0.0  # time spent decoding, on the decode thread
+        self.inference_seconds = 0.0  # time spent transcribing decoded audio
+        self.wait_seconds = 0.0  # time inference sat idle waiting for decoded audio
+
+    def add(self, decode=0.0, inference=0.0, wait=0.0, files=0):
+        with self._lock:
+            self.decode_seconds += decode
+            self.inference_seconds += inference
+            self.wait_seconds += wait
+            self.files += files
+
+    def merge(self, other):
+        """Add totals from another StageTimings or its as_dict()"""
+        if isinstance(other, StageTimings):
+            other = other.as_dict()
+        self.add(other["decode_seconds"], other["inference_seconds"], other["wait_seconds"], other["files"])
+
+    @property
+    def hidden_seconds(self):
+        """Decode time that overlapped with inference instead of delaying it"""
+        return max(0.0, self.decode_seconds - self.wait_seconds)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "files": self.files,
+                "decode_seconds": self.decode_seconds,
+                "inference_seconds": self.inference_seconds,
+                "wait_seconds": self.wait_seconds,
+                "hidden_seconds": self.hidden_seconds,
+            }
+
+    def summary(self):
+        """One-line summary for logs and status bars"""
+        data = self.as_dict()
+        return (f"decode {data['decode_seconds']:.1f}s ({data['hidden_seconds']:.1f}s hidden), "
+                f"inference {data['inference_seconds']:.1f}s, waited {data['wait_seconds']:.1f}s")
+
+
+class DecodePipeline:
+    """Iterate over items with their audio decoded ahead of time
+
+    Items are pulled from the source lazily, only when a decode slot is free,
+    so at most `depth` decoded files wait in memory next to the one being
+    transcribed. The consumer should report its inference time with
+    timings.add(inference=...).
+    """
+
+    def __init__(self, items, decode, depth=1, timings=None):
+        self.items = iter(items)
+        self.decode = decode  # decode(item) -> float32 array
+        self.depth = max(0, depth)
+        self.timings = timings or StageTimings()
+        self._ready = queue.Queue()
+        # One slot for the item being transcribed plus `depth` decoded ahead
+        self._slots = threading.Semaphore(self.depth + 1)
+        self._closed = threading.Event()
+        self._holding = False  # consumer holds a slot for its current item
+        self._thread = threading.Thread(target=self._produce, name="audio-decode", daemon=True)
+        self._thread.start()
+
+    def _produce(self):
+        try:
+            while True:
+                self._slots.acquire()
+                if self._closed.is_set():
+                    break
+                try:
+                    item = next(self.items)
+                except StopIteration:
+                    break
+
+                started = time.perf_counter()
+                try:
+                    audio, error = self.decode(item), None
+                except Exception as e:
+                    audio, error = None, e
+                seconds = time.perf_counter() - started
+                self.timings.add(decode=seconds)
+                self._ready.put(Decoded(item, audio, error, seconds))
+        finally:
+            self._ready.put(_END)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # Moving on frees the previous item's slot so the next decode can start
+        if self._holding:
+            self._holding = False
+            self._slots.release()
+
+        started = time.perf_counter()
+        decoded = self._ready.get()
+        if decoded is _END:
+            self._ready.put(_END)
+            raise StopIteration
+        self._holding = True
+        self.timings.add(wait=time.perf_counter() - started, files=1)
+        return decoded
+
+    def close(self):
+        """Stop decoding ahead; the current decode finishes in the background"""
+        self._closed.set()
+        self._slots.release()  # Wake the producer if it is waiting for a slot
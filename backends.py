@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+WhisperUI inference backends
+One interface over faster-whisper (CPU edition) and openai-whisper (GPU
+edition): load a model, stream transcriber.Segment records from it, and add
+word timings to a finished transcript. Libraries are imported on first use
+
+Try a backend from the command line (openai-whisper also runs on CPU-only torch):
+    python backends.py --backend openai-whisper --device cpu --model tiny FILE
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import chunked
+import presets
+import transcriber
+
+
+SAMPLING_RATE = 16000
+STREAM_CHUNK_SECONDS = 30.0  # openai-whisper is fed silence-split pieces of about this length
+
+
+class Backend:
+    """Interface implemented by each speech recognition library"""
+
+    name = None
+    supports_parallel_chunks = False  # One model can transcribe several chunks concurrently
+
+    def import_library(self):
+        """Import the inference stack (slow, done off the UI thread)"""
+        raise NotImplementedError
+
+    def load_model(self, model_size, device="cpu", compute_type="int8", **options):
+        raise NotImplementedError
+
+    def load_audio(self, path):
+        """Decode a media file to 16 kHz mono float32"""
+        raise NotImplementedError
+
+    def decoding_options(self, preset):
+        """Keyword arguments for transcribe() from a presets.py preset name"""
+        raise NotImplementedError
+
+    def cache_model_name(self, model_size):
+        """Model name in result cache keys (transcripts differ between libraries)"""
+        return model_size
+
+    def transcribe(self, model, audio, language=None, beam_size=5, best_of=5, temperature=None,
+                   word_timestamps=False, stop_event=None, clip_start=0.0, initial_prompt=None):
+        """Return (segment generator, TranscriptInfo); segments are yielded as they are decoded"""
+        raise NotImplementedError
+
+    def align_words(self, model, audio, segments, language, workers=1, progress=None, stop_event=None):
+        """Return the segments with word timings, or None if stopped"""
+        raise NotImplementedError
+
+
+class FasterWhisperBackend(Backend):
+    """CTranslate2 models through faster-whisper"""
+
+    name = "faster-whisper"
+    supports_parallel_chunks = True
+
+    def import_library(self):
+        transcriber.import_backend()
+
+    def load_model(self, model_size, device="cpu", compute_type="int8", **options):
+        return transcriber.load_model(model_size, device=device, compute_type=compute_type, **options)
+
+    def load_audio(self, path):
+        return chunked.load_audio(str(path))
+
+    def decoding_options(self, preset):
+        return presets.faster_whisper_options(preset)
+
+    def transcribe(self, model, audio, language=None, beam_size=5, best_of=5, temperature=None,
+                   word_timestamps=False, stop_event=None, clip_start=0.0, initial_prompt=None):
+        return transcriber.transcribe(
+            model, audio,
+            language=language,
+            beam_size=beam_size,
+            best_of=best_of,
+            temperature=temperature,
+            word_timestamps=word_timestamps,
+            stop_event=stop_event,
+            clip_start=clip_start,
+            initial_prompt=initial_prompt
+        )
+
+    def align_words(self, model, audio, segments, language, workers=1, progress=None, stop_event=None):
+        import word_alignment
+        return word_alignment.align_words(model, audio, segments, language, workers=workers,
+                                          progress=progress, stop_event=stop_event)
+
+
+class OpenAIWhisperBackend(Backend):
+    """PyTorch models through openai-whisper, on CUDA or CPU
+
+    whisper's transcribe() only returns once the whole input is done, so the
+    audio is fed in silence-split pieces of about 30 s. Each piece is
+    conditioned on the text before it and decoded in the language of the
+    first, and its segments are yielded as soon as it finishes.
+    """
+
+    name = "openai-whisper"
+
+    def __init__(self):
+        self.fp16 = None  # Half precision on CUDA; None decides from the model's device alone
+
+    def import_library(self):
+        import whisper  # noqa: F401
+
+    def load_model(self, model_size, device="cpu", compute_type="float32", **options):
+        """compute_type only distinguishes cache entries, whisper picks fp16 on CUDA itself"""
+        import whisper
+
+        # Set download_root to user's home directory to avoid permission issues
+        download_root = os.path.expanduser("~/.cache/whisper")
+        os.makedirs(download_root, exist_ok=True)
+        return whisper.load_model(model_size, device=device, download_root=download_root)
+
+    def load_audio(self, path):
+        import whisper
+        return whisper.load_audio(str(path))  # ffmpeg, 16 kHz mono float32
+
+    def decoding_options(self, preset):
+        return presets.openai_whisper_options(preset)
+
+    def cache_model_name(self, model_size):
+        return f"openai-whisper/{model_size}"
+
+    def transcribe(self, model, audio, language=None, beam_size=5, best_of=5, temperature=None,
+                   word_timestamps=False, stop_event=None, clip_start=0.0, initial_prompt=None):
+        import numpy as np
+
+        if isinstance(audio, str):
+            audio = self.load_audio(audio)
+        duration = len(audio) / SAMPLING_RATE
+        start_sample = int(clip_start * SAMPLING_RATE)
+        chunks = [
+            (offset + clip_start, end + clip_start, samples)
+            for offset, end, samples in chunked.split_audio(audio[start_sample:], STREAM_CHUNK_SECONDS)
+        ]
+        options = {
+            "beam_size": beam_size,
+            "best_of": best_of,
+            "word_timestamps": word_timestamps,
+            "fp16": str(model.device).startswith("cuda") and self.fp16 is not False,
+            "verbose": None,  # No console output
+        }
+        if temperature is not None:
+            options["temperature"] = tuple(temperature)
+
+        def run(samples, lang, prompt):
+            return model.transcribe(np.ascontiguousarray(samples, dtype=np.float32),
+                                    language=lang, initial_prompt=prompt, **options)
+
+        # The first piece settles the language, so info is complete before any segment is pulled
+        first = run(chunks[0][2], language, initial_prompt) if chunks else {"segments": [], "language": language}
+        language = language or first.get("language")
+        info = transcriber.TranscriptInfo(language, None, duration)
+
+        def stream():
+            prompt = initial_prompt
+            for index, (offset, end, _) in enumerate(chunks):
+                if stop_event is not None and stop_event.is_set():
+                    return
+                result = first if index == 0 else run(chunks[index][2], language, prompt)
+                for item in result["segments"]:
+                    if stop_event is not None and stop_event.is_set():
+                        return
+                    segment = transcriber.shift_segment(_segment_from_dict(item), offset, limit=end)
+                    if segment.text.strip():
+                        prompt = segment.text.strip()
+                    yield segment
+
+        return stream(), info
+
+    def align_words(self, model, audio, segments, language, workers=1, progress=None, stop_event=None):
+        """Force-align the segments' text with whisper's cross-attention timing
+
+        Consecutive segments are aligned together, one decoder pass per 30 s
+        window as whisper does while transcribing, instead of one per segment.
+        workers is ignored: alignment hooks the model's attention layers, so
+        one model can only align one window at a time.
+        """
+        import numpy as np
+        import whisper
+        from whisper.audio import HOP_LENGTH, N_FRAMES
+        from whisper.timing import add_word_timestamps
+        from whisper.tokenizer import get_tokenizer
+
+        tokenizer = get_tokenizer(
+            model.is_multilingual,
+            num_languages=getattr(model, "num_languages", 99),
+            language=language or "en",
+            task="transcribe"
+        )
+        dtype = next(model.parameters()).dtype
+        window_seconds = N_FRAMES * HOP_LENGTH / SAMPLING_RATE
+        token_limit = model.dims.n_text_ctx // 2  # Whisper's own token limit for one window
+        segments = list(segments)
+        tokens = [tokenizer.encode(" " + segment.text.strip()) if segment.text.strip() else []
+                  for segment in segments]
+
+        # Windows of consecutive segments (first index, end index) that fit one mel and one decoder pass
+        windows = []
+        for index, segment in enumerate(segments):
+            if windows:
+                first, end, count = windows[-1]
+                if segment.end - segments[first].start <= window_seconds and count + len(tokens[index]) <= token_limit:
+                    windows[-1] = (first, index + 1, count + len(tokens[index]))
+                    continue
+            windows.append((index, index + 1, len(tokens[index])))
+
+        aligned = []
+        for first, end, _ in windows:
+            if stop_event is not None and stop_event.is_set():
+                return None
+            seek = int(segments[first].start * SAMPLING_RATE) // HOP_LENGTH
+            clip = np.asarray(audio[seek * HOP_LENGTH:int(segments[end - 1].end * SAMPLING_RATE)], dtype=np.float32)
+            items = {
+                index: {"seek": seek, "start": segments[index].start, "end": segments[index].end, "tokens": tokens[index]}
+                for index in range(first, end) if tokens[index]
+            }
+            if items and len(clip) >= HOP_LENGTH:
+                num_frames = min(N_FRAMES, len(clip) // HOP_LENGTH)
+                mel = whisper.log_mel_spectrogram(clip, model.dims.n_mels)
+                mel = whisper.pad_or_trim(mel[:, :num_frames], N_FRAMES).to(model.device).to(dtype)
+                # Word times come back relative to the window's seek, which every item shares
+                add_word_timestamps(
+                    segments=list(items.values()), model=model, tokenizer=tokenizer, mel=mel, num_frames=num_frames,
+                    last_speech_timestamp=segments[first - 1].end if first else 0.0
+                )
+            else:
+                items = {}
+            for index in range(first, end):
+                segment = segments[index]
+                words = None
+                if index in items:
+                    words = [
+                        transcriber.Word(word["start"], word["end"], word["word"], word["probability"])
+                        for word in items[index].get("words", ())
+                    ]
+                aligned.append(transcriber.Segment(segment.start, segment.end, segment.text, words))
+            if progress:
+                progress(len(aligned), len(segments))
+        return aligned
+
+
+def _segment_from_dict(item):
+    """transcriber.Segment from an openai-whisper segment dict"""
+    words = None
+    if item.get("words"):
+        words = [
+            transcriber.Word(word["start"], word["end"], word["word"], word.get("probability", 0.0))
+            for word in item["words"]
+        ]
+    return transcriber.Segment(item["start"], item["end"], item["text"], words)
+
+
+BACKENDS = {
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+}
+
+
+def get_backend(name):
+    return BACKENDS[name]()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a transcript from one inference backend")
+    parser.add_argument("file", help="Audio or video file")
+    parser.add_argument("--backend", default=FasterWhisperBackend.name, choices=BACKENDS)
+    parser.add_argument("--model", default="tiny", choices=transcriber.MODEL_SIZES)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--compute-type", default=None, help="faster-whisper compute type (default: int8)")
+    parser.add_argument("--preset", default=presets.DEFAULT_PRESET, choices=presets.PRESET_NAMES)
+    parser.add_argument("--language", default="Auto", help="Language name or ISO code (default: Auto)")
+    parser.add_argument("--words", action="store_true", help="Align word timings after transcribing")
+    args = parser.parse_args(argv)
+
+    backend = get_backend(args.backend)
+    started = time.perf_counter()
+    model = backend.load_model(args.model, device=args.device,
+                               compute_type=args.compute_type or ("int8" if args.backend == "faster-whisper" else "float32"))
+    audio = backend.load_audio(args.file)
+    print(f"Loaded {args.backend} {args.model} and audio in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    started = time.perf_counter()
+    segments, info = backend.transcribe(model, audio, language=transcriber.get_language_code(args.language),
+                                        **backend.decoding_options(args.preset))
+    collected = []
+    for segment in segments:
+        if not collected:
+            print(f"First segment after {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        collected.append(segment)
+        print(transcriber.format_segment_line(segment), flush=True)
+    elapsed = time.perf_counter() - started
+    print(f"{len(collected)} segments, language {info.language}, {info.duration / elapsed:.1f}x real time",
+          file=sys.stderr)
+
+    if args.words:
+        started = time.perf_counter()
+        aligned = backend.align_words(model, audio, collected, info.language)
+        print(f"Aligned {sum(len(s.words or ()) for s in aligned)} words in {time.perf_counter() - started:.1f}s",
+              file=sys.stderr)
+        print(transcriber.generate_srt_words(aligned))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
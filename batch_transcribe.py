@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+WhisperUI Batch Transcription
+Headless command line tool that transcribes a directory or glob of media files
+across a pool of worker processes, each holding its own WhisperModel
+
+Examples:
+    python batch_transcribe.py ~/Recordings --model small --workers 4
+    python batch_transcribe.py "calls/**/*.mp3" --formats txt,srt,srt_words
+    python batch_transcribe.py ~/Recordings --formats all
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import chunked
+import cpu_tuning
+import transcriber
+from audio_cache import AudioCache
+from audio_pipeline import DecodePipeline, StageTimings
+
+
+# Model held by each worker process (loaded once by the pool initializer)
+_worker_model = None
+_worker_options = {}
+_worker_jobs = None  # shared queue of (file_path, output_base), None ends a worker
+_worker_results = None  # shared queue of per-file result dicts
+
+
+def collect_files(inputs, recursive=False):
+    """Expand directories, globs and plain paths into a sorted list of media files"""
+    files = []
+    seen = set()
+
+    def add(path):
+        path = Path(path)
+        if path.is_file() and path.suffix.lower() in transcriber.MEDIA_EXTENSIONS:
+            resolved = path.resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                files.append(path)
+
+    for item in inputs:
+        path = Path(item).expanduser()
+        if path.is_dir():
+            pattern = "**/*" if recursive else "*"
+            for child in sorted(path.glob(pattern)):
+                add(child)
+        elif path.is_file():
+            add(path)
+        else:
+            for match in sorted(glob.glob(str(path), recursive=True)):
+                add(match)
+
+    return files
+
+
+def output_base_for(file_path, output_dir=None):
+    """Build the output path prefix for a media file"""
+    file_path = Path(file_path)
+    directory = Path(output_dir) if output_dir else file_path.parent
+    return str(directory / file_path.stem)
+
+
+def _init_worker(model_size, device, compute_type, cpu_threads, options, jobs, results):
+    """Pool initializer: load this worker's model once"""
+    global _worker_model, _worker_options, _worker_jobs, _worker_results
+    _worker_model = transcriber.load_model(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads
+    )
+    _worker_options = options
+    _worker_jobs = jobs
+    _worker_results = results
+
+
+def _transcribe_job(file_path, output_base, audio):
+    """Transcribe one decoded file in a worker process and write its outputs"""
+    started = time.perf_counter()
+    try:
+        segments, info = transcriber.transcribe(
+            _worker_model,
+            audio,
+            language=_worker_options["language"],
+            beam_size=_worker_options["beam_size"],
+            word_timestamps=transcriber.needs_words(_worker_options["formats"])
+        )
+        segments = list(segments)
+        # Every requested format is written in one pass over the segments
+        written = transcriber.write_outputs(segments, output_base, _worker_options["formats"], info=info)
+        return {
+            "file": file_path,
+            "ok": True,
+            "outputs": written,
+            "language": info.language,
+            "duration": info.duration,
+            "elapsed": time.perf_counter() - started,
+        }
+    except Exception as e:
+        return {
+            "file": file_path,
+            "ok": False,
+            "error": str(e),
+            "elapsed": time.perf_counter() - started,
+        }
+
+
+def _run_worker():
+    """Work through the shared job queue, decoding the next file while this one is transcribed"""
+    decode = AudioCache().load if _worker_options["cache_audio"] else chunked.load_audio
+    pipeline = DecodePipeline(
+        iter(_worker_jobs.get, None),
+        lambda job: decode(job[0]),
+        depth=_worker_options["prefetch"]
+    )
+    for (file_path, output_base), audio, error, decode_seconds in pipeline:
+        if error is not None:
+            result = {"file": file_path, "ok": False, "error": f"decode failed: {error}", "elapsed": 0.0}
+        else:
+            result = _transcribe_job(file_path, output_base, audio)
+            pipeline.timings.add(inference=result["elapsed"])
+        del audio  # Drop this file's samples before the next one is handed over
+        result["decode"] = decode_seconds
+        _worker_results.put(result)
+    return pipeline.timings.as_dict()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Transcribe many audio/video files with faster-whisper"
+    )
+    parser.add_argument("inputs", nargs="+", help="Files, directories or glob patterns")
+    parser.add_argument("--model", default="base", choices=transcriber.MODEL_SIZES, help="Model size (default: base)")
+    parser.add_argument("--language", default="Auto", help="Language name or ISO code (default: Auto)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) // 4),
+                        help="Number of worker processes, each loads its own model")
+    parser.add_argument("--cpu-threads", type=int, default=0,
+                        help="CPU threads per worker (default: calibrated with one worker, else cores divided by workers)")
+    parser.add_argument("--device", default="cpu", help="Inference device (default: cpu)")
+    parser.add_argument("--compute-type", help="CTranslate2 compute type (default: calibrated, else int8)")
+    parser.add_argument("--beam-size", type=int, default=5, help="Beam size (default: 5)")
+    parser.add_argument("--formats", default="txt,srt",
+                        help=f"Comma separated outputs: {', '.join(transcriber.EXPORTERS)}, or all (default: txt,srt)")
+    parser.add_argument("--output-dir", help="Write outputs here instead of next to each input")
+    parser.add_argument("--recursive", action="store_true", help="Scan directories recursively")
+    parser.add_argument("--prefetch", type=int, default=1,
+                        help="Files each worker decodes ahead while transcribing (default: 1, 0 disables overlap)")
+    parser.add_argument("--cache-audio", action="store_true",
+                        help="Keep decoded audio in the on-disk audio cache so re-runs with other settings skip decoding")
+    parser.add_argument("--skip-existing", action="store_true",
+                        help="Skip files whose outputs already exist (useful to resume a run)")
+    args = parser.parse_args(argv)
+
+    args.formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    if args.formats == ("all",):
+        args.formats = tuple(transcriber.EXPORTERS)
+    unknown = [f for f in args.formats if f not in transcriber.EXPORTERS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+    args.workers = max(1, args.workers)
+    if args.device == "cpu":
+        # Fill in what wasn't given from the cpu_tuning.py calibration
+        args.compute_type, args.cpu_threads = cpu_tuning.resolve(
+            args.model, args.compute_type, args.cpu_threads, streams=args.workers
+        )
+    else:
+        args.compute_type = args.compute_type or "int8"
+        if args.cpu_threads <= 0:
+            args.cpu_threads = max(1, (os.cpu_count() or 1) // args.workers)
+    return args
+
+
+def run(args):
+    """Run a batch, returning the number of failed files"""
+    files = collect_files(args.inputs, recursive=args.recursive)
+    if not files:
+        print("No media files found.", file=sys.stderr)
+        return 0
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    jobs = []
+    for file_path in files:
+        output_base = output_base_for(file_path, args.output_dir)
+        if args.skip_existing and all(
+            os.path.exists(output_base + transcriber.EXPORTERS[f].suffix) for f in args.formats
+        ):
+            continue
+        jobs.append((str(file_path), output_base))
+
+    skipped = len(files) - len(jobs)
+    print(f"{len(jobs)} file(s) to transcribe with {args.workers} worker(s)"
+          + (f", {skipped} skipped" if skipped else ""))
+
+    options = {
+        "language": transcriber.get_language_code(args.language),
+        "beam_size": args.beam_size,
+        "formats": args.formats,
+        "prefetch": args.prefetch,
+        "cache_audio": args.cache_audio,
+    }
+
+    # Workers pull from a shared queue so each can claim its next file early and decode it
+    manager = multiprocessing.Manager()
+    job_queue = manager.Queue()
+    result_queue = manager.Queue()
+    for job in jobs:
+        job_queue.put(job)
+    for _ in range(args.workers):
+        job_queue.put(None)
+
+    failed = 0
+    audio_seconds = 0.0
+    timings = StageTimings()
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(args.model, args.device, args.compute_type, args.cpu_threads, options, job_queue, result_queue)
+    ) as pool:
+        workers = [pool.submit(_run_worker) for _ in range(args.workers)]
+        done = 0
+        while done < len(jobs):
+            try:
+                result = result_queue.get(timeout=1.0)
+            except queue.Empty:
+                if all(worker.done() for worker in workers):
+                    break  # Every worker exited (or crashed) without reporting the rest
+                continue
+            done += 1
+            name = Path(result["file"]).name
+            if result["ok"]:
+                audio_seconds += result["duration"]
+                print(f"[{done}/{len(jobs)}] ✓ {name} ({result['duration']:.0f}s audio in {result['elapsed']:.1f}s, "
+                      f"decode {result['decode']:.1f}s)")
+            else:
+                failed += 1
+                print(f"[{done}/{len(jobs)}] ✗ {name}: {result['error']}", file=sys.stderr)
+
+        for worker in workers:
+            try:
+                timings.merge(worker.result())
+            except Exception as e:
+                print(f"Worker failed: {e}", file=sys.stderr)
+    manager.shutdown()
+
+    # Files a crashed worker never reported count as failures
+    failed += len(jobs) - done
+
+    elapsed = time.perf_counter() - started
+    speed = audio_seconds / elapsed if elapsed > 0 else 0.0
+    print(f"Done in {elapsed:.1f}s: {len(jobs) - failed} ok, {failed} failed, {speed:.1f}x real time")
+    print(f"Stages: {timings.summary()}")
+    return failed
+
+
+def main(argv=None):
+    multiprocessing.freeze_support()  # Required for PyInstaller
+    args = parse_args(argv)
+    return 1 if run(args) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sequential vs parallel chunked transcription of one long file
+
+    python benchmarks/bench_chunked.py recording.mp3 --model base --workers 4
+
+Prints wall-clock time, real-time factor and segment counts for both paths as JSON.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import chunked
+import transcriber
+
+
+def run(label, segments, info, started):
+    """Drain a segment stream and time it"""
+    segments = list(segments)
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": label,
+        "seconds": round(elapsed, 2),
+        "audio_seconds": round(info.duration, 2),
+        "realtime_factor": round(info.duration / elapsed, 2) if elapsed else None,  # Audio seconds per wall second
+        "segments": len(segments),
+        "words": sum(len(s.words or []) for s in segments),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sequential and chunked transcription")
+    parser.add_argument("file", help="Audio/video file (longer is more representative)")
+    parser.add_argument("--model", default="base", choices=transcriber.MODEL_SIZES)
+    parser.add_argument("--workers", type=int, default=chunked.default_workers())
+    parser.add_argument("--language", default=None, help="ISO code, skips detection differences between runs")
+    args = parser.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    audio = chunked.load_audio(args.file)  # Decode once so both runs measure inference only
+
+    sequential_model = transcriber.load_model(args.model)
+    started = time.perf_counter()
+    segments, info = transcriber.transcribe(sequential_model, audio, language=args.language)
+    sequential = run("sequential", segments, info, started)
+    del sequential_model
+
+    parallel_model = transcriber.load_model(
+        args.model,
+        num_workers=args.workers,
+        cpu_threads=max(1, cores // args.workers)
+    )
+    started = time.perf_counter()
+    segments, info = chunked.transcribe_chunked(parallel_model, audio, workers=args.workers, language=args.language)
+    parallel = run(f"chunked x{args.workers}", segments, info, started)
+
+    report = {
+        "file": args.file,
+        "model": args.model,
+        "cores": cores,
+        "results": [sequential, parallel],
+        "speedup": round(sequential["seconds"] / parallel["seconds"], 2) if parallel["seconds"] else None,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
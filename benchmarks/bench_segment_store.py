@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory of a list of faster-whisper Segment objects vs SegmentStore
+
+    python benchmarks/bench_segment_store.py --hours 8
+
+Builds a synthetic transcript shaped like faster-whisper output (about one
+segment every 4 s, 12 words each, with token ids) and reports the traced
+allocation size of each representation as JSON.
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from segment_store import SegmentStore
+
+try:
+    from faster_whisper.transcribe import Segment, Word
+except ImportError:
+    # Same fields as faster-whisper's records when it isn't installed
+    Segment = namedtuple("Segment", "id seek start end text tokens avg_logprob compression_ratio no_speech_prob words temperature")
+    Word = namedtuple("Word", "start end word probability")
+
+VOCABULARY = [f" {w}" for w in (
+    "the and to of a in that is it you for was on with as have be at this not "
+    "but they we he from so what about there all one more can just like know"
+).split()]
+
+
+def synthetic_segments(hours, words_per_segment=12, seconds_per_segment=4.0, seed=0):
+    """Yield faster-whisper-shaped segments covering the given duration"""
+    rng = random.Random(seed)
+    count = int(hours * 3600 / seconds_per_segment)
+    for i in range(count):
+        start = i * seconds_per_segment
+        step = seconds_per_segment / words_per_segment
+        words = []
+        for j in range(words_per_segment):
+            # Build fresh strings like the tokenizer decode does, not shared literals
+            text = "".join(rng.choice(VOCABULARY))
+            words.append(Word(start + j * step, start + (j + 0.8) * step, text, rng.random()))
+        yield Segment(
+            i, int(start * 100), start, start + seconds_per_segment,
+            "".join(w.word for w in words),
+            [rng.randrange(50000) for _ in range(words_per_segment + 4)],
+            -0.3, 1.4, 0.01, words, 0.0
+        )
+
+
+def measure(build):
+    """Traced bytes still allocated after build() and the time it took"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"bytes": current, "peak_bytes": peak, "build_seconds": round(elapsed, 3)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare transcript memory use")
+    parser.add_argument("--hours", type=float, default=8.0, help="Recording length to simulate")
+    args = parser.parse_args(argv)
+
+    objects, object_stats = measure(lambda: list(synthetic_segments(args.hours)))
+    segment_count = len(objects)
+    del objects
+
+    # Streamed straight into the store, as the app does, so objects never pile up
+    store, store_stats = measure(lambda: SegmentStore(synthetic_segments(args.hours)))
+
+    report = {
+        "hours": args.hours,
+        "segments": segment_count,
+        "words": len(store.word_ids),
+        "list_of_objects": object_stats,
+        "segment_store": dict(store_stats, nbytes=store.nbytes()),
+        "reduction": round(object_stats["bytes"] / store_stats["bytes"], 1) if store_stats["bytes"] else None,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
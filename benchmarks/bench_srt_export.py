@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark: word-level SRT export, per-word sentence rebuild vs streaming exporter
+
+    python benchmarks/bench_srt_export.py --words 100000
+
+Builds a synthetic transcript in a SegmentStore and writes the karaoke SRT
+both ways, reporting wall time and traced peak memory as JSON.
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import transcriber
+from segment_store import SegmentStore
+
+
+def synthetic_store(total_words, words_per_segment):
+    """Transcript with total_words words, a quarter second each"""
+    store = SegmentStore()
+    segment_count = max(1, total_words // words_per_segment)
+    for i in range(segment_count):
+        start = i * words_per_segment * 0.25
+        words = [
+            transcriber.Word(start + j * 0.25, start + (j + 0.9) * 0.25, f" word{(i * 7 + j) % 500}", 0.9)
+            for j in range(words_per_segment)
+        ]
+        store.append(transcriber.Segment(start, start + words_per_segment * 0.25,
+                                         "".join(w.word for w in words), words))
+    return store
+
+
+def legacy_srt_words(segments):
+    """Previous exporter: rebuilds the whole sentence for every word, then writes one string"""
+    srt_content = []
+    subtitle_index = 1
+    for segment in segments:
+        if segment.words:
+            for word_idx, word in enumerate(segment.words):
+                text_parts = []
+                for i, w in enumerate(segment.words):
+                    if i == word_idx:
+                        text_parts.append(f"<u>{w.word.strip()}</u>")
+                    else:
+                        text_parts.append(w.word.strip())
+                srt_content.append(f"{subtitle_index}\n"
+                                   f"{transcriber.format_srt_timestamp(word.start)} --> "
+                                   f"{transcriber.format_srt_timestamp(word.end)}\n"
+                                   f"{' '.join(text_parts)}\n")
+                subtitle_index += 1
+    return "\n".join(srt_content)
+
+
+def measure(export):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    export()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(elapsed, 3), "peak_bytes": peak}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare word-level SRT export speed and memory")
+    parser.add_argument("--words", type=int, default=100000, help="Words in the synthetic transcript")
+    parser.add_argument("--words-per-segment", type=int, default=100, help="Words per segment")
+    args = parser.parse_args(argv)
+
+    store = synthetic_store(args.words, args.words_per_segment)
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = os.path.join(directory, "legacy.srt")
+        streaming_path = os.path.join(directory, "streaming.srt")
+
+        def run_legacy():
+            with open(legacy_path, 'w', encoding='utf-8') as f:
+                f.write(legacy_srt_words(store))
+
+        legacy = measure(run_legacy)
+        streaming = measure(lambda: transcriber.write_export(streaming_path, transcriber.iter_srt_words(store)))
+        identical = Path(legacy_path).read_bytes() == Path(streaming_path).read_bytes()
+        output_bytes = os.path.getsize(streaming_path)
+
+    report = {
+        "words": len(store.word_ids),
+        "segments": len(store),
+        "output_bytes": output_bytes,
+        "identical_output": identical,
+        "legacy": legacy,
+        "streaming": streaming,
+        "speedup": round(legacy["seconds"] / streaming["seconds"], 1) if streaming["seconds"] else None,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: transcription path, UI queue and exports on synthetic audio
+
+    python benchmarks/run_suite.py --output bench-1.4.json
+    python benchmarks/run_suite.py --compare bench-1.3.json --output bench-1.4.json
+
+Runs every case in a fresh process (so peak RSS is per case) against the
+deterministic stub backend, plus real faster-whisper models that are already
+in the local model cache. Nothing is downloaded. Prints or writes a JSON
+report with stable keys, and --compare prints the change per metric against an
+earlier report.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+SCHEMA = 1
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def drain(segments, info, started):
+    """Consume a segment stream, timing the first segment and the whole run"""
+    first = None
+    collected = []
+    for segment in segments:
+        if first is None:
+            first = time.perf_counter() - started
+        collected.append(segment)
+    elapsed = time.perf_counter() - started
+    return collected, {
+        "seconds": round(elapsed, 4),
+        "audio_seconds": round(info.duration, 2),
+        # Audio seconds per wall-clock second, like run_metrics and cpu_tuning (higher is faster)
+        "realtime_factor": round(info.duration / elapsed, 2) if elapsed else None,
+        "time_to_first_segment": None if first is None else round(first, 4),
+        "segments": len(collected),
+    }
+
+
+def case_transcribe(params):
+    """Sequential transcription through transcriber.transcribe"""
+    import transcriber
+    from stub_backend import synthetic_speech, load_stub
+
+    audio = synthetic_speech(params["audio_seconds"])
+    model = load_stub()
+    started = time.perf_counter()
+    segments, info = transcriber.transcribe(model, audio, word_timestamps=True)
+    _, result = drain(segments, info, started)
+    return result
+
+
+def case_transcribe_chunked(params):
+    """Parallel chunked transcription through chunked.transcribe_chunked"""
+    import chunked
+    from stub_backend import synthetic_speech, load_stub
+
+    audio = synthetic_speech(params["audio_seconds"])
+    model = load_stub()
+    started = time.perf_counter()
+    segments, info = chunked.transcribe_chunked(model, audio, workers=params["workers"], word_timestamps=True)
+    _, result = drain(segments, info, started)
+    result["workers"] = params["workers"]
+    return result
+
+
+def case_real_model(params):
+    """A real faster-whisper model, only if it is already downloaded"""
+    import transcriber
+    from stub_backend import synthetic_speech
+
+    try:
+        WhisperModel = transcriber.import_backend().WhisperModel
+    except ImportError:
+        return {"skipped": "faster-whisper not installed"}
+
+    started = time.perf_counter()
+    try:
+        model = WhisperModel(params["model"], device="cpu", compute_type="int8", local_files_only=True)
+    except Exception as e:
+        return {"skipped": f"model not available locally ({type(e).__name__})"}
+    load_seconds = time.perf_counter() - started
+
+    audio = synthetic_speech(params["audio_seconds"])
+    started = time.perf_counter()
+    # Fixed language so detection on synthetic audio doesn't add noise
+    segments, info = transcriber.transcribe(model, audio, language="en", word_timestamps=False)
+    _, result = drain(segments, info, started)
+    result["model_load_seconds"] = round(load_seconds, 3)
+    return result
+
+
+class FakeRoot:
+    """Single-threaded after() loop standing in for the Tk main loop"""
+
+    def __init__(self):
+        self._timers = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def after(self, ms, callback):
+        with self._lock:
+            self._next_id += 1
+            self._timers[self._next_id] = (time.perf_counter() + ms / 1000.0, callback)
+            return self._next_id
+
+    def after_cancel(self, timer_id):
+        with self._lock:
+            self._timers.pop(timer_id, None)
+
+    def run_until(self, done):
+        while not done():
+            with self._lock:
+                due = [(at, timer_id) for timer_id, (at, _) in self._timers.items()]
+            if not due:
+                time.sleep(0.001)
+                continue
+            at, timer_id = min(due)
+            delay = at - time.perf_counter()
+            if delay > 0:
+                time.sleep(min(delay, 0.005))
+                continue
+            with self._lock:
+                _, callback = self._timers.pop(timer_id)
+            callback()
+
+
+def case_ui_queue(params):
+    """Latency from a worker thread queuing a transcript line to the widget update"""
+    import transcriber
+    from ui_updates import UIUpdateQueue
+    from stub_backend import synthetic_speech, load_stub
+
+    audio = synthetic_speech(params["audio_seconds"])
+    segments, _ = transcriber.transcribe(load_stub(), audio, word_timestamps=False)
+    segments = list(segments)
+
+    latencies = []
+    appended = [0]
+
+    def append(text):
+        now = time.perf_counter()
+        for line in text.splitlines():
+            stamp, _, _ = line.partition("|")
+            latencies.append(now - float(stamp))
+            appended[0] += 1
+
+    root = FakeRoot()
+    updates = UIUpdateQueue(root, append, lambda: None, interval_ms=params["interval_ms"])
+    updates.start()
+
+    def produce():
+        # Segments arrive in small bursts, like a fast model streaming them
+        for index, segment in enumerate(segments):
+            updates.put(f"{time.perf_counter()}|{transcriber.format_segment_line(segment)}\n")
+            if index % 5 == 4:
+                time.sleep(params["burst_interval_ms"] / 1000.0)
+
+    started = time.perf_counter()
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    root.run_until(lambda: appended[0] >= len(segments))
+    updates.stop()
+    return {
+        "items": len(segments),
+        "widget_updates": updates.updates,
+        "seconds": round(time.perf_counter() - started, 4),
+        "latency_ms_p50": round(percentile(latencies, 0.5) * 1000, 2),
+        "latency_ms_p95": round(percentile(latencies, 0.95) * 1000, 2),
+        "latency_ms_max": round(max(latencies) * 1000, 2),
+        "interval_ms": params["interval_ms"],
+    }
+
+
+def case_export(params):
+    """generate_srt and generate_srt_words on a stub transcript held in a SegmentStore"""
+    import transcriber
+    from segment_store import SegmentStore
+    from stub_backend import synthetic_speech, load_stub
+
+    audio = synthetic_speech(params["audio_seconds"])
+    segments, _ = transcriber.transcribe(load_stub(), audio, word_timestamps=True)
+    store = SegmentStore(segments)
+    del audio
+
+    result = {"segments": len(store), "words": len(store.word_ids)}
+    for name in ("generate_srt", "generate_srt_words"):
+        started = time.perf_counter()
+        output = getattr(transcriber, name)(store)
+        result[f"{name}_seconds"] = round(time.perf_counter() - started, 4)
+        result[f"{name}_bytes"] = len(output.encode("utf-8"))
+    return result
+
+
+CASES = {
+    "transcribe_stub": (case_transcribe, {}),
+    "transcribe_chunked_stub": (case_transcribe_chunked, {"workers": 4}),
+    "ui_queue": (case_ui_queue, {"interval_ms": 100, "burst_interval_ms": 40}),
+    "export": (case_export, {}),
+}
+
+
+def run_case(name, params):
+    """Run one case and attach its peak RSS (called in a fresh process)"""
+    function = CASES[name][0] if name in CASES else case_real_model
+    result = function(params)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def git_version():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty", "--tags"],
+            cwd=ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(report, baseline):
+    """Print numeric changes per case and metric against an earlier report"""
+    print(f"Compared with {baseline.get('version') or 'baseline'}:", file=sys.stderr)
+    for name, result in report["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if not previous:
+            print(f"  {name}: new case", file=sys.stderr)
+            continue
+        for metric, value in result.items():
+            old = previous.get(metric)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old and value != old:
+                change = (value - old) / old * 100
+                print(f"  {name}.{metric}: {old} -> {value} ({change:+.1f}%)", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline WhisperUI benchmark suite")
+    parser.add_argument("--audio-seconds", type=float, default=600.0, help="Synthetic audio length for stub cases")
+    parser.add_argument("--export-seconds", type=float, default=3600.0, help="Transcript length for the export case")
+    parser.add_argument("--models", default="tiny,base", help="Local faster-whisper models to include if present")
+    parser.add_argument("--model-seconds", type=float, default=60.0, help="Synthetic audio length for real models")
+    parser.add_argument("--cases", help="Comma separated subset of cases to run")
+    parser.add_argument("--in-process", action="store_true", help="Run cases in this process (peak RSS is then cumulative)")
+    parser.add_argument("--output", help="Write the report here instead of stdout")
+    parser.add_argument("--compare", help="Earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    plan = {}
+    for name, (_, params) in CASES.items():
+        seconds = args.export_seconds if name == "export" else args.audio_seconds
+        plan[name] = dict(params, audio_seconds=seconds)
+    for model in filter(None, (m.strip() for m in args.models.split(","))):
+        plan[f"model_{model}"] = {"model": model, "audio_seconds": args.model_seconds}
+    if args.cases:
+        wanted = set(args.cases.split(","))
+        plan = {name: params for name, params in plan.items() if name in wanted}
+
+    report = {
+        "schema": SCHEMA,
+        "version": git_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "cases": {},
+    }
+    for name, params in plan.items():
+        print(f"Running {name}...", file=sys.stderr)
+        try:
+            if args.in_process:
+                result = run_case(name, params)
+            else:
+                # A fresh interpreter per case keeps peak RSS and caches independent
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    result = pool.submit(run_case, name, params).result()
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        report["cases"][name] = dict(result, params=params)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
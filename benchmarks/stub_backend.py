@@ -0,0 +1,150 @@
+"""
+Deterministic stand-in for a faster-whisper WhisperModel plus synthetic audio
+
+The stub finds the "utterances" in synthetic_speech() audio by frame energy and
+returns one segment per utterance with evenly spaced words, doing a fixed
+amount of FFT work per 30 s window so timings scale with audio length. Same
+audio in, same segments out, no model files or network needed. It also has
+the pieces of WhisperModel that word_alignment.align_words uses, spreading
+each segment's words evenly over it.
+"""
+
+import time
+import types
+
+import numpy as np
+
+import transcriber
+
+
+SAMPLING_RATE = 16000
+WINDOW_SECONDS = 30.0
+FRAME_SECONDS = 0.03
+
+VOCABULARY = (
+    "the quick brown fox jumps over lazy dog while seven bright stars fade "
+    "into morning light and quiet rivers carry old stories toward distant hills"
+).split()
+
+
+def synthetic_speech(seconds, seed=0, sampling_rate=SAMPLING_RATE):
+    """Utterances of 1.5-6 s voiced-like tones separated by 0.3-1.5 s of near silence"""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sampling_rate)
+    audio = (rng.standard_normal(total) * 0.001).astype(np.float32)  # background noise floor
+
+    position = int(rng.uniform(0.2, 1.0) * sampling_rate)
+    while position < total:
+        length = min(int(rng.uniform(1.5, 6.0) * sampling_rate), total - position)
+        t = np.arange(length) / sampling_rate
+        pitch = rng.uniform(90, 220)
+        # A few harmonics under a slow syllable-rate envelope
+        voiced = sum(np.sin(2 * np.pi * pitch * h * t) / h for h in (1, 2, 3, 4))
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(3, 6) * t) ** 2
+        audio[position:position + length] += (0.2 * voiced * envelope).astype(np.float32)
+        position += length + int(rng.uniform(0.3, 1.5) * sampling_rate)
+    return audio
+
+
+class StubTokenizer:
+    """Stands in for the tokenizers.Tokenizer faster-whisper wraps: one token per word"""
+
+    def encode(self, text, add_special_tokens=True):
+        ids = [VOCABULARY.index(word) if word in VOCABULARY else len(VOCABULARY) for word in text.split()]
+        return types.SimpleNamespace(ids=ids)
+
+
+class StubFeatureExtractor:
+    """Stands in for faster-whisper's FeatureExtractor: one empty frame per hop"""
+
+    hop_length = 160
+    nb_max_frames = 3000
+
+    def __call__(self, audio):
+        return np.zeros((80, len(audio) // self.hop_length), dtype=np.float32)
+
+
+class StubModel:
+    """Mimics WhisperModel.transcribe: lazy segment generator plus info"""
+
+    def __init__(self, model_size="stub", seconds_per_window=0.0, **kwargs):
+        self.model_size = model_size
+        self.seconds_per_window = seconds_per_window  # extra sleep per window to mimic slower models
+        # What word_alignment.align_words reaches for on a WhisperModel
+        self.hf_tokenizer = StubTokenizer()
+        self.model = types.SimpleNamespace(is_multilingual=False)
+        self.feature_extractor = StubFeatureExtractor()
+
+    def encode(self, features):
+        return features
+
+    def add_word_timestamps(self, segments, tokenizer, encoder_output, num_frames, prepend_punctuations,
+                            append_punctuations, last_speech_timestamp):
+        """Evenly spaced words over each (single-subsegment) segment, like _segment()"""
+        for (subsegment,) in segments:
+            start, end, tokens = subsegment["start"], subsegment["end"], subsegment["tokens"]
+            step = (end - start) / len(tokens)
+            subsegment["words"] = [
+                {"start": round(start + i * step, 2), "end": round(start + (i + 0.9) * step, 2),
+                 "word": " " + (VOCABULARY[token] if token < len(VOCABULARY) else "?"), "probability": 0.9}
+                for i, token in enumerate(tokens)
+            ]
+
+    def transcribe(self, audio, beam_size=5, language=None, word_timestamps=False,
+                   clip_timestamps=None, initial_prompt=None, **kwargs):
+        if isinstance(audio, str):
+            audio = transcriber.import_backend().decode_audio(audio, sampling_rate=SAMPLING_RATE)
+        audio = np.asarray(audio, dtype=np.float32)
+        duration = len(audio) / SAMPLING_RATE
+        start = clip_timestamps[0] if clip_timestamps else 0.0
+        info = transcriber.TranscriptInfo(language or "en", 1.0, duration)
+        return self._segments(audio, start, duration, word_timestamps), info
+
+    def _segments(self, audio, start, duration, word_timestamps):
+        frame = int(FRAME_SECONDS * SAMPLING_RATE)
+        window = start
+        carry = None  # utterance still open at the end of the previous window
+        while window < duration:
+            first = int(window * SAMPLING_RATE)
+            samples = audio[first:first + int(WINDOW_SECONDS * SAMPLING_RATE)]
+            n_frames = len(samples) // frame
+            if n_frames == 0:
+                break
+
+            # Fixed spectral work per window, standing in for the encoder
+            frames = samples[:n_frames * frame].reshape(n_frames, frame)
+            np.abs(np.fft.rfft(frames * np.hanning(frame), axis=1))
+            if self.seconds_per_window:
+                time.sleep(self.seconds_per_window)
+
+            voiced = np.square(frames).mean(axis=1) > 1e-4
+            for index, is_voiced in enumerate(voiced):
+                at = window + index * FRAME_SECONDS
+                if is_voiced and carry is None:
+                    carry = at
+                elif not is_voiced and carry is not None:
+                    yield self._segment(carry, at, word_timestamps)
+                    carry = None
+            window += WINDOW_SECONDS
+
+        if carry is not None:
+            yield self._segment(carry, duration, word_timestamps)
+
+    @staticmethod
+    def _segment(start, end, word_timestamps):
+        count = max(1, int((end - start) * 2.5))
+        step = (end - start) / count
+        seed = int(start * 100)
+        texts = [" " + VOCABULARY[(seed + i * 7) % len(VOCABULARY)] for i in range(count)]
+        words = None
+        if word_timestamps:
+            words = [
+                transcriber.Word(start + i * step, start + (i + 0.9) * step, text, 0.9)
+                for i, text in enumerate(texts)
+            ]
+        return transcriber.Segment(start, end, "".join(texts), words)
+
+
+def load_stub(model_size="stub", device="cpu", compute_type="int8", **kwargs):
+    """Loader with the transcriber.load_model signature"""
+    return StubModel(model_size, **kwargs)
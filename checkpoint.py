@@ -0,0 +1,130 @@
+"""
+WhisperUI transcription checkpoints
+Segments are appended to a JSON-lines file as they come out of the model, so a
+stopped or crashed transcription can resume from the end of the last saved
+segment instead of from second zero
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import transcriber
+from result_cache import CACHE_ROOT
+
+
+# fsync at most this often so a power loss costs seconds, not the whole run
+FSYNC_INTERVAL = 10.0
+
+
+class SavedRun:
+    """Contents of a checkpoint file"""
+
+    def __init__(self, header, info, segments):
+        self.header = header  # settings and file name the run was started with
+        self.info = info  # {"language": ..., "duration": ...} once known
+        self.segments = segments
+
+    @property
+    def resume_point(self):
+        """Seconds into the audio where decoding should continue"""
+        return self.segments[-1].end if self.segments else 0.0
+
+    @property
+    def language(self):
+        return (self.info or {}).get("language")
+
+
+class Checkpoint:
+    """Append-only checkpoint file for one audio file and set of settings"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+        self._last_sync = 0.0
+        self._valid_bytes = None  # Length of the intact part, known after load()
+
+    @classmethod
+    def for_key(cls, run_key, directory=None):
+        """Checkpoint for a run key (the same key the result cache uses)"""
+        directory = Path(directory or os.path.join(CACHE_ROOT, "checkpoints"))
+        return cls(directory / f"{run_key}.jsonl")
+
+    def exists(self):
+        return self.path.is_file()
+
+    def load(self):
+        """Read a saved run, or None; a line torn by a crash is ignored"""
+        if not self.exists():
+            return None
+
+        header, info, segments = {}, None, []
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("torn line")
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Partial last line from a crash, everything before it is good
+                valid_bytes += len(line)
+                kind = record.pop("type", None)
+                if kind == "header":
+                    header = record
+                elif kind == "info":
+                    info = record
+                elif kind == "segment":
+                    segments.append(transcriber.segment_from_dict(record))
+        self._valid_bytes = valid_bytes
+        return SavedRun(header, info, segments)
+
+    def start(self, header):
+        """Begin a fresh checkpoint, replacing any previous one"""
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write(dict(header, type="header", started=time.time()))
+
+    def reopen(self):
+        """Continue appending to an existing checkpoint (resume)"""
+        self.close()
+        if self._valid_bytes is None:
+            self.load()
+        # Drop a torn trailing line so new records start on a clean line
+        os.truncate(self.path, self._valid_bytes)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def write_info(self, info):
+        """Record the detected language and duration once transcription has started"""
+        self._write({"type": "info", "language": info.language, "duration": info.duration})
+
+    def append(self, segment):
+        """Save one finished segment"""
+        self._write(dict(transcriber.segment_to_dict(segment), type="segment"))
+
+    def _write(self, record):
+        if self._file is None:
+            return
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        # Flushing hands the line to the OS so an app crash loses nothing
+        self._file.flush()
+        now = time.monotonic()
+        if now - self._last_sync >= FSYNC_INTERVAL:
+            os.fsync(self._file.fileno())
+            self._last_sync = now
+
+    def close(self):
+        """Stop writing, keeping the file for a later resume"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def delete(self):
+        """Remove the checkpoint once the run has completed"""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,171 @@
+"""
+WhisperUI parallel chunked transcription
+Splits one long recording at silence boundaries and transcribes the chunks
+concurrently on a single faster-whisper model loaded with num_workers > 1,
+then stitches the results back into one ordered segment stream
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import transcriber
+
+
+SAMPLING_RATE = 16000
+FRAME_SECONDS = 0.03  # energy frame length for silence search
+SMOOTH_SECONDS = 0.3  # window the silence must span
+SEARCH_SECONDS = 10.0  # how far from the ideal cut to look for silence
+MIN_CHUNK_SECONDS = 30.0
+MAX_CHUNK_SECONDS = 300.0
+
+
+def default_workers():
+    """Concurrent chunks for this machine"""
+    return max(2, min(8, (os.cpu_count() or 2) // 2))
+
+
+def load_audio(audio):
+    """Decode a media file to 16 kHz mono float32, arrays pass through"""
+    if isinstance(audio, str):
+        return transcriber.import_backend().decode_audio(audio, sampling_rate=SAMPLING_RATE)
+    return audio
+
+
+def choose_chunk_seconds(duration, workers):
+    """Aim for about two chunks per worker so slow chunks don't leave workers idle"""
+    return max(MIN_CHUNK_SECONDS, min(MAX_CHUNK_SECONDS, duration / (workers * 2)))
+
+
+def find_split_points(audio, chunk_seconds, sampling_rate=SAMPLING_RATE):
+    """Return sample offsets of cuts near every chunk_seconds, placed in the quietest spot"""
+    import numpy as np
+
+    frame = int(FRAME_SECONDS * sampling_rate)
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return []
+
+    # Frame energies, smoothed so a cut lands in a pause rather than between two syllables
+    energy = np.square(audio[:n_frames * frame].reshape(n_frames, frame)).mean(axis=1)
+    smooth = max(1, int(SMOOTH_SECONDS / FRAME_SECONDS))
+    energy = np.convolve(energy, np.ones(smooth) / smooth, mode="same")
+
+    frames_per_chunk = chunk_seconds / FRAME_SECONDS
+    search = int(SEARCH_SECONDS / FRAME_SECONDS)
+    min_gap = int(MIN_CHUNK_SECONDS / FRAME_SECONDS) // 2
+
+    cuts = []
+    previous = 0
+    target = frames_per_chunk
+    while target < n_frames - min_gap:
+        low = max(previous + min_gap, int(target) - search)
+        high = min(n_frames - min_gap, int(target) + search)
+        if low < high:
+            cut = low + int(np.argmin(energy[low:high]))
+            cuts.append(cut * frame)
+            previous = cut
+        target += frames_per_chunk
+    return cuts
+
+
+def split_audio(audio, chunk_seconds, sampling_rate=SAMPLING_RATE):
+    """Split audio into (offset_seconds, end_seconds, samples) chunks at silence boundaries"""
+    bounds = [0] + find_split_points(audio, chunk_seconds, sampling_rate) + [len(audio)]
+    return [
+        (start / sampling_rate, end / sampling_rate, audio[start:end])  # slices are views, no copy
+        for start, end in zip(bounds, bounds[1:])
+        if end > start
+    ]
+
+
+def transcribe_chunked(model, audio, workers=None, chunk_seconds=None, language=None,
+                       beam_size=5, word_timestamps=True, stop_event=None, clip_start=0.0,
+                       best_of=5, temperature=None):
+    """Transcribe one recording as concurrent chunks
+
+    Returns (segments, info) like transcriber.transcribe. Segments are yielded
+    in order with absolute timestamps as soon as every earlier chunk is done.
+    The model should be loaded with num_workers >= workers so chunks really
+    run in parallel. clip_start skips already transcribed audio (resume).
+    """
+    workers = workers or default_workers()
+    audio = load_audio(audio)
+    duration = len(audio) / SAMPLING_RATE
+    # Only the remainder is split; chunk offsets start at clip_start so times stay absolute
+    start_sample = int(clip_start * SAMPLING_RATE)
+    chunks = [
+        (offset + clip_start, end + clip_start, samples)
+        for offset, end, samples in split_audio(
+            audio[start_sample:],
+            chunk_seconds or choose_chunk_seconds(duration - clip_start, workers)
+        )
+    ]
+    if len(chunks) <= 1:
+        # Too short to split, nothing to gain over the sequential path
+        return transcriber.transcribe(
+            model, audio,
+            language=language,
+            beam_size=beam_size,
+            best_of=best_of,
+            temperature=temperature,
+            word_timestamps=word_timestamps,
+            stop_event=stop_event,
+            clip_start=clip_start
+        )
+
+    def collect(segments, offset, end):
+        result = []
+        for segment in segments:
+            # Whisper can emit text for the padded tail of a chunk, that time belongs to the next one
+            if segment.start + offset >= end:
+                continue
+            result.append(transcriber.shift_segment(segment, offset, limit=end))
+        return result
+
+    def run_chunk(index, lang):
+        offset, end, samples = chunks[index]
+        segments, _ = transcriber.transcribe(
+            model, samples,
+            language=lang,
+            beam_size=beam_size,
+            best_of=best_of,
+            temperature=temperature,
+            word_timestamps=word_timestamps,
+            stop_event=stop_event
+        )
+        return collect(segments, offset, end)
+
+    # The first chunk settles the language so every chunk decodes the same way
+    first_segments, first_info = transcriber.transcribe(
+        model, chunks[0][2],
+        language=language,
+        beam_size=beam_size,
+        best_of=best_of,
+        temperature=temperature,
+        word_timestamps=word_timestamps,
+        stop_event=stop_event
+    )
+    language = language or first_info.language
+    info = transcriber.TranscriptInfo(language, first_info.language_probability, duration)
+
+    def stream():
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunk")
+        futures = [executor.submit(collect, first_segments, chunks[0][0], chunks[0][1])]
+        futures += [executor.submit(run_chunk, index, language) for index in range(1, len(chunks))]
+        try:
+            last_end = clip_start
+            for future in futures:
+                for segment in future.result():
+                    if stop_event is not None and stop_event.is_set():
+                        return
+                    # Keep the stitched stream monotonic across seams
+                    if segment.start < last_end:
+                        segment = segment._replace(start=last_end, end=max(segment.end, last_end))
+                    last_end = segment.end
+                    yield segment
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    return stream(), info
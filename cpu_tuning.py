@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+WhisperUI CPU tuning
+One-time calibration that times a short clip across CTranslate2 compute types
+and thread counts, saving the fastest configuration per model size so the
+app and the command line tools use it automatically on this machine
+
+Calibrate from the command line:
+    python cpu_tuning.py --model base
+    python cpu_tuning.py --model small --clip interview.mp3
+    python cpu_tuning.py --list
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from result_cache import CACHE_ROOT
+
+
+COMPUTE_TYPES = ("int8", "int8_float32", "int16", "float32")
+DEFAULT_COMPUTE_TYPE = "int8"
+CLIP_SECONDS = 30.0  # One decoding window
+WARMUP_SECONDS = 5.0
+SAMPLING_RATE = 16000
+
+
+def default_profile_path():
+    """Tuning profile, override with WHISPERUI_TUNING_FILE"""
+    return os.environ.get("WHISPERUI_TUNING_FILE", os.path.join(CACHE_ROOT, "cpu_tuning.json"))
+
+
+def machine_id():
+    """Fingerprint of the hardware and runtime a profile was measured on"""
+    try:
+        from importlib.metadata import version
+        runtime = version("ctranslate2")
+    except Exception:
+        runtime = "unknown"
+    return f"{platform.system()}-{platform.machine()}-{os.cpu_count() or 1}cpu-ctranslate2-{runtime}"
+
+
+def thread_candidates(cores=None):
+    """Thread counts worth trying: a quarter, half and all of the cores"""
+    cores = cores or os.cpu_count() or 1
+    return sorted({max(1, cores // 4), max(1, cores // 2), cores})
+
+
+def supported_compute_types():
+    """Compute types the installed CTranslate2 build supports on this CPU"""
+    try:
+        import ctranslate2
+        return set(ctranslate2.get_supported_compute_types("cpu"))
+    except Exception:
+        return set(COMPUTE_TYPES)
+
+
+def calibration_clip(seconds=CLIP_SECONDS):
+    """Synthetic voiced-like tones for when no real recording is given
+
+    A real speech clip gives more representative timings, since the decoder
+    does little work on audio it can't transcribe.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    total = int(seconds * SAMPLING_RATE)
+    audio = (rng.standard_normal(total) * 0.001).astype(np.float32)
+    position = 0
+    while position < total:
+        length = min(int(rng.uniform(1.5, 4.0) * SAMPLING_RATE), total - position)
+        t = np.arange(length) / SAMPLING_RATE
+        pitch = rng.uniform(90, 220)
+        voiced = sum(np.sin(2 * np.pi * pitch * h * t) / h for h in (1, 2, 3))
+        audio[position:position + length] += (0.2 * voiced).astype(np.float32)
+        position += length + int(rng.uniform(0.3, 1.0) * SAMPLING_RATE)
+    return audio
+
+
+def load_profile(path=None):
+    """Saved tuning for this machine, or an empty profile if none (or it was made elsewhere)"""
+    try:
+        with open(path or default_profile_path(), encoding='utf-8') as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        profile = {}
+    if profile.get("machine") != machine_id():
+        # Measured on other hardware or another CTranslate2 build, so it no longer applies
+        return {"machine": machine_id(), "models": {}}
+    profile.setdefault("models", {})
+    return profile
+
+
+def save_profile(profile, path=None):
+    """Write the profile atomically"""
+    path = path or default_profile_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def tuned_settings(model_size, path=None):
+    """Best calibrated {compute_type, cpu_threads, ...} for a model size, or None"""
+    return load_profile(path)["models"].get(model_size)
+
+
+def resolve(model_size, compute_type=None, cpu_threads=0, streams=1, path=None):
+    """Fill in compute type and threads from the tuning profile where not given explicitly
+
+    streams is how many models share the CPU; calibrated thread counts are for
+    one model, so with several the cores are split between them instead.
+    """
+    tuned = tuned_settings(model_size, path) or {}
+    if not compute_type:
+        compute_type = tuned.get("compute_type", DEFAULT_COMPUTE_TYPE)
+    if not cpu_threads or cpu_threads <= 0:
+        if streams <= 1 and tuned.get("cpu_threads"):
+            cpu_threads = tuned["cpu_threads"]
+        else:
+            cpu_threads = max(1, (os.cpu_count() or 1) // max(1, streams))
+    return compute_type, cpu_threads
+
+
+def _time_trial(loader, model_size, compute_type, cpu_threads, audio, language):
+    """Load one configuration and time it on the clip"""
+    import transcriber
+
+    started = time.perf_counter()
+    model = loader(model_size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+    load_seconds = time.perf_counter() - started
+    try:
+        def run(samples):
+            segments, _ = transcriber.transcribe(model, samples, language=language, word_timestamps=False)
+            for _ in segments:
+                pass
+
+        # First call pays one-off setup costs, keep it out of the measurement
+        run(audio[:int(WARMUP_SECONDS * SAMPLING_RATE)])
+        started = time.perf_counter()
+        run(audio)
+        seconds = time.perf_counter() - started
+    finally:
+        del model
+        gc.collect()
+    return {
+        "compute_type": compute_type,
+        "cpu_threads": cpu_threads,
+        "seconds": round(seconds, 3),
+        "load_seconds": round(load_seconds, 3),
+        "realtime_factor": round(len(audio) / SAMPLING_RATE / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def calibrate(model_size, audio=None, language="en", compute_types=None, threads=None,
+              loader=None, progress=None, stop_event=None, path=None):
+    """Find and save the fastest compute type and thread count for a model size
+
+    Searches in two passes to keep the number of model loads small: every
+    compute type with all cores, then the other thread counts with the
+    fastest type. progress(done, total, label) is called before each trial.
+    Returns the saved settings, or None if stopped or nothing could run.
+    """
+    import transcriber
+
+    loader = loader or transcriber.load_model
+    audio = calibration_clip() if audio is None else audio[:int(CLIP_SECONDS * SAMPLING_RATE)]
+    supported = supported_compute_types()
+    compute_types = [ct for ct in (compute_types or COMPUTE_TYPES) if ct in supported]
+    threads = threads or thread_candidates()
+    full = max(threads)
+    total = len(compute_types) + len(threads) - 1
+    trials = []
+    done = [0]
+
+    def trial(compute_type, cpu_threads):
+        if stop_event is not None and stop_event.is_set():
+            return None
+        if progress:
+            progress(done[0], total, f"{compute_type}, {cpu_threads} threads")
+        done[0] += 1
+        try:
+            result = _time_trial(loader, model_size, compute_type, cpu_threads, audio, language)
+        except Exception as e:
+            result = {"compute_type": compute_type, "cpu_threads": cpu_threads, "error": str(e)}
+        trials.append(result)
+        return result
+
+    for compute_type in compute_types:
+        trial(compute_type, full)
+
+    measured = [t for t in trials if "seconds" in t]
+    if not measured:
+        return None
+    best_type = min(measured, key=lambda t: t["seconds"])["compute_type"]
+    for cpu_threads in threads:
+        if cpu_threads != full:
+            trial(best_type, cpu_threads)
+
+    if stop_event is not None and stop_event.is_set():
+        return None
+    best = min((t for t in trials if "seconds" in t), key=lambda t: t["seconds"])
+    settings = dict(best, calibrated=time.time(), clip_seconds=round(len(audio) / SAMPLING_RATE, 1), trials=trials)
+
+    profile = load_profile(path)
+    profile["models"][model_size] = settings
+    save_profile(profile, path)
+    return settings
+
+
+def describe(settings):
+    """One-line description of tuned settings"""
+    if not settings:
+        return "not calibrated"
+    text = f"{settings['compute_type']}, {settings['cpu_threads']} threads"
+    if settings.get("realtime_factor"):
+        text += f" ({settings['realtime_factor']:.1f}x real time)"
+    return text
+
+
+def main(argv=None):
+    import transcriber
+
+    parser = argparse.ArgumentParser(description="Calibrate CPU compute type and threads for faster-whisper models")
+    parser.add_argument("--model", action="append", choices=transcriber.MODEL_SIZES,
+                        help="Model size to calibrate (repeatable, default: base)")
+    parser.add_argument("--clip", help="Speech recording to time on (first 30 s; default: synthetic audio)")
+    parser.add_argument("--language", default="English", help="Language of the clip (default: English)")
+    parser.add_argument("--threads", help="Comma separated thread counts to try (default: quarter, half and all cores)")
+    parser.add_argument("--list", action="store_true", help="Show the saved tuning and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        profile = load_profile()
+        print(f"Tuning for {profile['machine']} in {default_profile_path()}")
+        for model_size, settings in sorted(profile["models"].items()):
+            print(f"  {model_size:<9} {describe(settings)}")
+        return 0
+
+    audio = None
+    if args.clip:
+        import chunked
+        audio = chunked.load_audio(args.clip)
+    threads = [int(t) for t in args.threads.split(",")] if args.threads else None
+
+    def progress(done, total, label):
+        print(f"  [{done + 1}/{total}] {label}...", flush=True)
+
+    failed = 0
+    for model_size in args.model or ["base"]:
+        print(f"Calibrating {model_size}:")
+        settings = calibrate(model_size, audio, language=transcriber.get_language_code(args.language),
+                             threads=threads, progress=progress)
+        if settings is None:
+            print("  No configuration could be loaded.", file=sys.stderr)
+            failed += 1
+            continue
+        for result in settings["trials"]:
+            if "error" in result:
+                print(f"  {result['compute_type']:<13} {result['cpu_threads']:>3} threads  failed: {result['error']}")
+            else:
+                print(f"  {result['compute_type']:<13} {result['cpu_threads']:>3} threads  {result['seconds']:7.2f}s"
+                      f"  {result['realtime_factor']:6.1f}x real time")
+        print(f"  Best: {describe(settings)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+WhisperUI hardware probe
+Capabilities of the machine the GPU edition runs on: whether CUDA is present
+and usable, whether fp16 works on it, the GPU's name and memory, CPU cores and
+free system memory. Probing imports torch and initialises CUDA in a child
+process, which takes seconds, so the stable part of the result is saved and
+reused by later launches until torch, the NVIDIA driver or the visible
+devices change; free memory is read again on every launch without torch
+
+Show or refresh the saved capabilities from the command line:
+    python hardware_probe.py
+    python hardware_probe.py --refresh
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from result_cache import CACHE_ROOT
+
+
+STATE_VERSION = 2
+PROBE_TIMEOUT = 120.0  # Seconds before a probe that hangs in the driver is given up
+
+# Saved between launches; free GPU and system memory change constantly and are re-read instead
+STABLE_FIELDS = ("cuda_present", "cuda_usable", "fp16", "gpu_name", "gpu_memory_total", "cpu_cores", "memory_total")
+
+
+def default_state_path():
+    """Saved probe result, override with WHISPERUI_HARDWARE_FILE"""
+    return os.environ.get("WHISPERUI_HARDWARE_FILE", os.path.join(CACHE_ROOT, "hardware.json"))
+
+
+def package_version(name):
+    """Installed version of a package without importing it"""
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return None
+
+
+def driver_version():
+    """NVIDIA driver version without initialising CUDA, None if there is no driver"""
+    try:
+        with open("/proc/driver/nvidia/version", encoding='utf-8') as f:
+            # "NVRM version: NVIDIA UNIX x86_64 Kernel Module  550.54.14  ..."
+            for token in f.readline().split():
+                if token[:1].isdigit() and "." in token:
+                    return token
+    except OSError:
+        pass
+    if sys.platform == "darwin":
+        return None  # No CUDA on macOS
+    try:
+        import subprocess
+        output = subprocess.run(
+            ["nvidia-smi", "--query-gpu=driver_version", "--format=csv,noheader"],
+            capture_output=True, text=True, timeout=10,
+            # No console window flashing up in the Windows GUI build
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        ).stdout.split()
+        return output[0] if output else None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def fingerprint():
+    """What a saved probe result depends on, cheap to compute (torch is not imported)"""
+    return {
+        "state_version": STATE_VERSION,
+        "platform": f"{platform.system()}-{platform.machine()}",
+        "torch": package_version("torch"),
+        "driver": driver_version(),
+        "cuda_visible_devices": os.environ.get("CUDA_VISIBLE_DEVICES"),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def system_memory():
+    """(total, available) system memory in bytes, None where unknown"""
+    try:
+        with open("/proc/meminfo", encoding='utf-8') as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        total = int(fields["MemTotal"].split()[0]) * 1024
+        available = int(fields.get("MemAvailable", fields["MemFree"]).split()[0]) * 1024
+        return total, available
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        page = os.sysconf("SC_PAGE_SIZE")
+        total = os.sysconf("SC_PHYS_PAGES") * page
+        try:
+            available = os.sysconf("SC_AVPHYS_PAGES") * page
+        except (ValueError, OSError):
+            available = None  # Not on macOS
+        return total, available
+    except (AttributeError, ValueError, OSError):
+        return None, None
+
+
+def gpu_free_memory():
+    """Free memory in bytes of the first visible GPU via nvidia-smi (no CUDA start-up), None if unknown"""
+    if sys.platform == "darwin":
+        return None
+    command = ["nvidia-smi", "--query-gpu=memory.free", "--format=csv,noheader,nounits"]
+    visible = (os.environ.get("CUDA_VISIBLE_DEVICES") or "").split(",")[0].strip()
+    if visible:
+        command += ["-i", visible]  # torch's device 0 is the first visible one
+    try:
+        import subprocess
+        output = subprocess.run(
+            command, capture_output=True, text=True, timeout=10,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        ).stdout.split()
+        return int(output[0]) * 1024 * 1024 if output else None  # MiB
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def current_memory(capabilities):
+    """Free GPU and system memory right now, cheap enough for every launch"""
+    total_memory, available_memory = system_memory()
+    return {
+        "gpu_memory_free": gpu_free_memory() if capabilities.get("cuda_usable") else None,
+        "memory_total": total_memory or capabilities.get("memory_total"),
+        "memory_available": available_memory,
+    }
+
+
+def _cpu_only(error=None):
+    """Capabilities with no GPU found yet"""
+    total_memory, available_memory = system_memory()
+    return {
+        "cuda_present": False,
+        "cuda_usable": False,
+        "fp16": False,
+        "gpu_name": None,
+        "gpu_memory_total": None,
+        "gpu_memory_free": None,
+        "cpu_cores": os.cpu_count() or 1,
+        "memory_total": total_memory,
+        "memory_available": available_memory,
+        "error": error,
+    }
+
+
+def probe():
+    """Measure the capabilities now (slow: imports torch and initialises CUDA)
+
+    Call probe_in_child() instead from a process that should not keep torch
+    or a CUDA context afterwards.
+    """
+    started = time.perf_counter()
+    capabilities = _cpu_only()
+    try:
+        import torch
+
+        capabilities["cuda_present"] = torch.cuda.is_available()
+        if capabilities["cuda_present"]:
+            try:
+                # Allocating proves the GPU works with this torch build (compute capability may be too new)
+                torch.zeros(1).cuda()
+                capabilities["cuda_usable"] = True
+            except Exception:
+                pass
+        if capabilities["cuda_usable"]:
+            capabilities["gpu_name"] = torch.cuda.get_device_name(0)
+            free, total = torch.cuda.mem_get_info(0)
+            capabilities["gpu_memory_free"] = free
+            capabilities["gpu_memory_total"] = total
+            try:
+                a = torch.ones((8, 8), dtype=torch.float16, device="cuda")
+                capabilities["fp16"] = bool(torch.isfinite(a @ a).all())
+            except Exception:
+                capabilities["fp16"] = False
+    except Exception as e:
+        capabilities["error"] = f"{type(e).__name__}: {e}"
+    capabilities["probe_seconds"] = round(time.perf_counter() - started, 3)
+    capabilities["probed"] = time.time()
+    return capabilities
+
+
+def probe_in_child(timeout=PROBE_TIMEOUT):
+    """Run probe() in a short-lived process and return its result
+
+    torch and the CUDA context stay in the child, so the caller holds no GPU
+    memory for them; the child exits once the result is back.
+    """
+    import multiprocessing
+
+    started = time.perf_counter()
+    # spawn: a fresh interpreter, as for the inference worker
+    pool = multiprocessing.get_context("spawn").Pool(1)
+    try:
+        return pool.apply_async(probe).get(timeout)
+    except Exception as e:
+        # A crashed or hung probe (e.g. a stuck driver) leaves the app on CPU
+        capabilities = _cpu_only(error=f"{type(e).__name__}: {e}" if str(e) else type(e).__name__)
+        capabilities["probe_seconds"] = round(time.perf_counter() - started, 3)
+        capabilities["probed"] = time.time()
+        return capabilities
+    finally:
+        pool.terminate()
+
+
+def load_state(path=None):
+    """Saved {fingerprint, capabilities}, or None"""
+    try:
+        with open(path or default_state_path(), encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def save_state(state, path=None):
+    """Write the state atomically"""
+    path = path or default_state_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def forget(path=None):
+    """Drop the saved result so the next launch probes again"""
+    try:
+        os.unlink(path or default_state_path())
+    except OSError:
+        pass
+
+
+def capabilities(refresh=False, path=None):
+    """Return (capabilities, cached): the saved result when nothing changed, else a fresh probe
+
+    The probe runs in a child process. Only STABLE_FIELDS are saved; a
+    cached result gets free memory read now.
+    A probe that failed to import torch isn't saved, so installing it is
+    noticed on the next launch.
+    """
+    current = fingerprint()
+    if not refresh:
+        state = load_state(path)
+        if state and state.get("fingerprint") == current and state.get("capabilities"):
+            saved = state["capabilities"]
+            return dict(saved, **current_memory(saved), error=None), True
+    result = probe_in_child()
+    if result["error"] is None:
+        try:
+            stable = {name: result[name] for name in STABLE_FIELDS}
+            save_state({"fingerprint": current, "capabilities": stable, "probed": result["probed"]}, path)
+        except OSError:
+            pass  # A read-only cache only costs the next launch a probe
+    return result, False
+
+
+def format_bytes(size):
+    return "unknown" if size is None else f"{size / (1024 ** 3):.1f} GB"
+
+
+def describe(capabilities):
+    """One-line summary such as 'GPU (CUDA): NVIDIA RTX 3060, fp16, 11.2 GB free'
+
+    Shows total GPU memory when the free amount couldn't be read.
+    """
+    if capabilities["cuda_usable"]:
+        precision = "fp16" if capabilities["fp16"] else "fp32 only"
+        if capabilities.get("gpu_memory_free") is not None:
+            memory = f"{format_bytes(capabilities['gpu_memory_free'])} free"
+        else:
+            memory = f"{format_bytes(capabilities['gpu_memory_total'])} total"
+        return f"GPU (CUDA): {capabilities['gpu_name']}, {precision}, {memory}"
+    if capabilities["cuda_present"]:
+        return f"CPU (GPU not compatible), {capabilities['cpu_cores']} cores"
+    return f"CPU, {capabilities['cpu_cores']} cores"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the hardware capabilities the GPU edition uses")
+    parser.add_argument("--refresh", action="store_true", help="Probe again even if nothing changed")
+    parser.add_argument("--forget", action="store_true", help="Delete the saved result and exit")
+    args = parser.parse_args(argv)
+
+    if args.forget:
+        forget()
+        print(f"Removed {default_state_path()}")
+        return 0
+
+    result, cached = capabilities(refresh=args.refresh)
+    source = "saved result, free memory read now" if cached else f"probed in {result['probe_seconds']:.1f}s"
+    print(f"{describe(result)} ({source}, {default_state_path()})")
+    print(f"  System memory: {format_bytes(result['memory_available'])} available "
+          f"of {format_bytes(result['memory_total'])}")
+    if result["gpu_memory_total"]:
+        print(f"  GPU memory: {format_bytes(result['gpu_memory_free'])} free "
+              f"of {format_bytes(result['gpu_memory_total'])}")
+    if result["error"]:
+        print(f"  Probe failed: {result['error']}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
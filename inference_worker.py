@@ -0,0 +1,400 @@
+"""
+WhisperUI inference worker
+Model loading, audio decoding, transcription, word alignment and CPU
+calibration run in a child process that the app talks to over a pipe, so
+they never hold the GUI process's GIL. Segments stream back as they are decoded. kill() ends the
+process at once, even in the middle of a segment or a model load, and its
+models' memory goes straight back to the operating system; the next request
+starts a fresh worker
+"""
+
+import multiprocessing
+import threading
+import traceback
+from collections import namedtuple
+
+from model_cache import ModelCache
+
+
+# Handle for a model resident in the worker, passed back in to transcribe with it
+RemoteModel = namedtuple("RemoteModel", ["key", "options"])
+
+
+class WorkerStopped(Exception):
+    """The worker was killed (Stop) while serving a request"""
+
+
+class WorkerError(RuntimeError):
+    """A request failed inside the worker, or the worker died"""
+
+
+def serve(conn, backend_name, settings):
+    """Worker process: answer requests until the app closes the pipe"""
+    import backends
+    import chunked
+    import transcriber
+    from audio_cache import AudioCache
+
+    backend = backends.get_backend(backend_name)
+    for name, value in settings.items():
+        setattr(backend, name, value)
+    try:
+        backend.import_library()
+    except Exception:
+        pass  # Reported when a model is loaded
+    models = ModelCache(backend.load_model)
+    audio_cache = AudioCache(decode=backend.load_audio)
+    prepared = [None, None]  # (content_hash, samples) of the last file, reused by the next request
+
+    def load_audio(path, content_hash):
+        """Samples of a file, and whether they came without decoding"""
+        if prepared[0] == content_hash:
+            return prepared[1], True
+        prepared[:] = None, None  # Let the previous file's mapping go first
+        hits = audio_cache.hits
+        samples = audio_cache.load(path, content_hash)
+        prepared[:] = content_hash, samples
+        return samples, audio_cache.hits > hits
+
+    conn.send(("ready", None))
+    while True:
+        try:
+            command, args = conn.recv()
+        except (EOFError, OSError):
+            return  # The app exited or dropped the worker
+
+        try:
+            reply = None
+            if command == "configure":
+                for name, value in args.items():
+                    setattr(backend, name, value)
+            elif command == "load":
+                models.get(*args["key"], **args["options"])
+            elif command == "audio":
+                samples, cached = load_audio(args["path"], args["hash"])
+                reply = {"duration": len(samples) / chunked.SAMPLING_RATE, "cached": cached}
+            elif command == "transcribe":
+                model = models.get(*args["key"], **args["options"])
+                samples, _ = load_audio(args["path"], args["hash"])
+                decode_options = dict(args["decode_options"])
+                if args["workers"] > 1 and backend.supports_parallel_chunks:
+                    # Silence-split chunks decoded concurrently; a prompt only applies to one sequential decode
+                    decode_options.pop("initial_prompt", None)
+                    segments, info = chunked.transcribe_chunked(model, samples, workers=args["workers"], **decode_options)
+                else:
+                    segments, info = backend.transcribe(model, samples, **decode_options)
+                # Plain namedtuples: faster-whisper's own classes would import its whole stack in the app to unpickle
+                conn.send(("info", transcriber.TranscriptInfo(info.language, info.language_probability, info.duration)))
+                for segment in segments:
+                    conn.send(("segment", transcriber.shift_segment(segment, 0)))
+            elif command == "align":
+                model = models.get(*args["key"], **args["options"])
+                samples, _ = load_audio(args["path"], args["hash"])
+                reply = backend.align_words(
+                    model, samples, args["segments"], args["language"],
+                    workers=args["workers"],
+                    progress=lambda done, total: conn.send(("progress", (done, total)))
+                )
+            elif command == "calibrate":
+                import cpu_tuning
+                samples = load_audio(args["path"], args["hash"])[0] if args["path"] else None
+                reply = cpu_tuning.calibrate(
+                    args["model_size"], samples, language=args["language"], loader=backend.load_model,
+                    progress=lambda done, total, label: conn.send(("progress", (done, total, label)))
+                )
+            elif command == "evict":
+                models.clear()
+            else:
+                raise ValueError(f"Unknown request: {command}")
+        except Exception as e:
+            traceback.print_exc()  # Full traceback on the worker's stderr, the message goes to the app
+            conn.send(("state", {"stats": models.stats(), "summary": models.summary()}))
+            conn.send(("error", str(e) or type(e).__name__))
+            continue
+        conn.send(("state", {"stats": models.stats(), "summary": models.summary()}))
+        conn.send(("done", reply))
+
+
+class _Stream:
+    """Segments of one transcribe request, read from the pipe as they arrive
+
+    Holds the worker until the stream is exhausted; closing it early kills
+    the worker, since the rest of the segments are still on their way.
+    """
+
+    def __init__(self, worker, conn):
+        self.worker = worker
+        self.conn = conn
+        self.finished = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.finished:
+            raise StopIteration
+        try:
+            kind, value = self.worker._receive(self.conn)
+        except BaseException:
+            self.finished = True
+            self.worker._release()
+            raise
+        if kind == "segment":
+            return value
+        self.finished = True
+        self.worker._release()
+        if kind == "error":
+            raise WorkerError(value)
+        raise StopIteration
+
+    def close(self):
+        if not self.finished:
+            self.finished = True
+            self.worker.kill()
+            self.worker._release()
+
+    def __del__(self):
+        self.close()
+
+
+class InferenceWorker:
+    """App-side handle on the worker process, with ModelCache's lookup methods
+
+    Requests are served one at a time; a request made while another is
+    running (a background warm-up during a transcription) waits its turn.
+    Requests can name an owner (the window or queue that made them), so
+    cancel(owner) stops that owner's work without touching anyone else's.
+    """
+
+    def __init__(self, backend_name):
+        self.backend_name = backend_name
+        self.settings = {}  # Backend attributes, applied again to each new worker
+        self._process = None
+        self._conn = None
+        self._busy = threading.Lock()  # Released by whichever thread finishes the request
+        self._owner = None  # Who made the request being served, None for background work
+        self._owner_lock = threading.Lock()  # Keeps cancel() from killing a request that just took over
+        self._killed = False
+        self._loading = set()
+        self._stats = None
+        self._summary = None
+        self.restarts = 0
+
+    # Process lifetime
+
+    def start(self):
+        """Start the worker if it isn't running, returns once the inference library is imported"""
+        self._acquire(None)
+        try:
+            self._ensure_started()
+        finally:
+            self._release()
+
+    def _ensure_started(self):
+        if self._process is not None and self._process.is_alive() and not self._killed:
+            return
+        self._cleanup()
+        # spawn: a clean interpreter without the GUI's threads or Tk state, and the only method on Windows/macOS apps
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=serve,
+            args=(child_conn, self.backend_name, dict(self.settings)),
+            name="whisperui-inference",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()  # Only the worker holds its end, so its exit shows up as EOF here
+        self._process, self._conn, self._killed = process, parent_conn, False
+        self._receive(parent_conn)  # "ready"
+
+    def kill(self):
+        """Stop the worker immediately (any thread), whatever it is doing"""
+        process = self._process
+        if process is None or not process.is_alive():
+            return
+        self._killed = True
+        process.kill()
+        self.restarts += 1
+
+    def cancel(self, owner):
+        """Kill the worker if it is serving a request made by owner
+
+        An idle worker, or one busy with someone else's request or a
+        background warm-up, keeps running and keeps its models.
+        """
+        with self._owner_lock:
+            if owner is not None and self._busy.locked() and self._owner is owner:
+                self.kill()
+
+    def close(self):
+        """Shut the worker down (app exit)"""
+        self.kill()
+        self._cleanup()
+
+    def _cleanup(self):
+        if self._conn is not None:
+            self._conn.close()
+        if self._process is not None:
+            self._process.join(timeout=5)
+        self._process, self._conn = None, None
+        self._loading.clear()
+        self._stats, self._summary = None, None
+
+    def is_running(self):
+        return self._process is not None and self._process.is_alive() and not self._killed
+
+    # Messaging
+
+    def _receive(self, conn):
+        """Next message from the worker, raising if it died"""
+        while True:
+            try:
+                kind, value = conn.recv()
+            except (EOFError, OSError):
+                if self._killed:
+                    raise WorkerStopped("Stopped")
+                exit_code = self._process.exitcode if self._process is not None else None
+                raise WorkerError(f"The inference process exited unexpectedly (exit code {exit_code})")
+            if kind == "state":
+                self._stats, self._summary = value["stats"], value["summary"]
+                continue
+            return kind, value
+
+    def _acquire(self, owner):
+        self._busy.acquire()
+        with self._owner_lock:
+            self._owner = owner
+
+    def _release(self):
+        with self._owner_lock:
+            self._owner = None
+            if self._busy.locked():
+                self._busy.release()
+
+    def _request(self, command, args=None, progress=None, owner=None):
+        """Send one request and wait for its reply"""
+        self._acquire(owner)
+        try:
+            self._ensure_started()
+            conn = self._conn
+            try:
+                conn.send((command, args))
+                while True:
+                    kind, value = self._receive(conn)
+                    if kind == "progress" and progress:
+                        progress(*value)
+                    elif kind == "done":
+                        return value
+                    elif kind == "error":
+                        raise WorkerError(value)
+            except OSError:
+                raise WorkerStopped("Stopped") if self._killed else WorkerError("The inference process is not running")
+        finally:
+            self._release()
+
+    # Backend settings
+
+    def configure(self, **settings):
+        """Set backend attributes (e.g. fp16) now and in every later worker"""
+        self.settings.update(settings)
+        if self.is_running():
+            self._request("configure", settings)
+
+    # ModelCache lookups
+
+    def contains(self, model_size, device="cpu", compute_type="int8", **load_kwargs):
+        """Check whether a model is resident in the worker"""
+        key = ModelCache.make_key(model_size, device, compute_type, **load_kwargs)
+        return self._stats is not None and ModelCache._key_name(key) in self._stats["resident"]
+
+    def is_loading(self, model_size, device="cpu", compute_type="int8", **load_kwargs):
+        """Check whether a model is being loaded (or waiting for the worker to load it)"""
+        return ModelCache.make_key(model_size, device, compute_type, **load_kwargs) in self._loading
+
+    def get(self, model_size, device="cpu", compute_type="int8", owner=None, **load_kwargs):
+        """Load a model in the worker (if it isn't resident) and return a handle to it
+
+        A load without an owner (background warm-up) is never cancelled.
+        """
+        key = ModelCache.make_key(model_size, device, compute_type, **load_kwargs)
+        self._loading.add(key)
+        try:
+            self._request("load", {"key": (model_size, device, compute_type), "options": load_kwargs}, owner=owner)
+        finally:
+            self._loading.discard(key)
+        return RemoteModel((model_size, device, compute_type), load_kwargs)
+
+    def clear(self):
+        """Drop every model in the worker"""
+        if self.is_running():
+            self._request("evict")
+
+    def stats(self):
+        return self._stats or {"resident": [], "resident_mb": 0}
+
+    def summary(self):
+        """One-line model cache summary for the status bar"""
+        return self._summary or "no models loaded"
+
+    # Inference
+
+    def prepare_audio(self, path, content_hash, owner=None):
+        """Decode (or map from the audio cache) a file in the worker, returns (duration, cached)"""
+        reply = self._request("audio", {"path": str(path), "hash": content_hash}, owner=owner)
+        return reply["duration"], reply["cached"]
+
+    def transcribe(self, model, path, content_hash, workers=1, owner=None, **decode_options):
+        """Start transcribing a file with a resident model, returns (segment stream, TranscriptInfo)
+
+        workers > 1 transcribes silence-split chunks concurrently where the
+        backend supports it. The stream yields segments as the worker decodes
+        them; cancel(owner) kills the worker until the stream is finished.
+        """
+        self._acquire(owner)
+        try:
+            self._ensure_started()
+            conn = self._conn
+            conn.send(("transcribe", {
+                "key": model.key,
+                "options": model.options,
+                "path": str(path),
+                "hash": content_hash,
+                "workers": workers,
+                "decode_options": decode_options,
+            }))
+            kind, value = self._receive(conn)
+            if kind == "error":
+                raise WorkerError(value)
+        except OSError:
+            self._release()
+            raise WorkerStopped("Stopped") if self._killed else WorkerError("The inference process is not running")
+        except BaseException:
+            self._release()
+            raise
+        return _Stream(self, conn), value
+
+    def calibrate(self, model_size, path=None, content_hash=None, language="en", progress=None, owner=None):
+        """Time a model size across compute types and thread counts (see cpu_tuning.calibrate)
+
+        Runs in the worker so the trial models never load into the app.
+        Returns the saved settings, or None if nothing could run.
+        """
+        return self._request("calibrate", {
+            "model_size": model_size,
+            "path": str(path) if path else None,
+            "hash": content_hash,
+            "language": language,
+        }, progress=progress, owner=owner)
+
+    def align_words(self, model, path, content_hash, segments, language, workers=1, progress=None, owner=None):
+        """Word timings for a finished transcript (see Backend.align_words)"""
+        return self._request("align", {
+            "key": model.key,
+            "options": model.options,
+            "path": str(path),
+            "hash": content_hash,
+            "segments": list(segments),
+            "language": language,
+            "workers": workers,
+        }, progress=progress, owner=owner)
@@ -0,0 +1,239 @@
+"""
+WhisperUI job queue
+Ordered list of media files to transcribe and a scheduler thread that runs them
+back to back, in list order or shortest job first by media duration, decoding
+the next file while the current one is transcribed
+"""
+
+import itertools
+import threading
+import time
+from pathlib import Path
+
+from audio_pipeline import DecodePipeline, StageTimings
+
+
+QUEUED = "Queued"
+RUNNING = "Running"
+DONE = "Done"
+FAILED = "Failed"
+
+_job_ids = itertools.count(1)
+
+
+def media_duration(path):
+    """Duration of a media file in seconds read from its container header, or None"""
+    try:
+        import av  # Installed with faster-whisper
+    except ImportError:
+        return None
+    try:
+        with av.open(str(path)) as container:
+            if container.duration is not None:
+                return container.duration / av.time_base
+            for stream in container.streams.audio:
+                if stream.duration is not None and stream.time_base is not None:
+                    return float(stream.duration * stream.time_base)
+    except Exception:
+        pass
+    return None
+
+
+class QueueJob:
+    """One file in the queue"""
+
+    def __init__(self, path):
+        self.id = next(_job_ids)
+        self.path = str(path)
+        self.name = Path(path).name
+        self.duration = None  # seconds, filled in by the duration probe
+        self.status = QUEUED
+        self.progress = 0.0  # fraction of the audio transcribed
+        self.error = None
+        self.outputs = []
+        self.cached = False
+        self.elapsed = None  # wall seconds spent transcribing
+
+    @property
+    def speed(self):
+        """Audio seconds per wall second once finished"""
+        if self.status == DONE and self.duration and self.elapsed:
+            return self.duration / self.elapsed
+        return None
+
+
+class JobScheduler:
+    """Runs queued jobs one at a time on a background thread
+
+    run_job(job, audio, stop_event) transcribes a job and returns its output
+    paths, or None when it was stopped part way. decode(job) returns the
+    job's audio array (or None to let run_job read the file) and runs ahead
+    on a decode thread. on_change(job) is called from worker threads after
+    any change (job is None for list changes).
+    """
+
+    def __init__(self, run_job, on_change=None, decode=None, prefetch=1):
+        self.run_job = run_job
+        self.on_change = on_change or (lambda job: None)
+        self.decode = decode or (lambda job: None)
+        self.prefetch = prefetch  # files decoded ahead of the one being transcribed
+        self.shortest_first = False
+        self.stop_event = threading.Event()
+        self.timings = StageTimings()
+        self._jobs = []
+        self._claimed = set()  # ids of jobs handed to the decode stage but not started yet
+        self._lock = threading.Lock()
+        self._thread = None
+        self.started = None  # wall time the current run began
+        self.finished = None
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs)
+
+    def add(self, paths):
+        """Queue files (ignoring ones already queued and not finished) and probe their durations"""
+        with self._lock:
+            pending = {job.path for job in self._jobs if job.status != DONE}
+            added = [QueueJob(path) for path in dict.fromkeys(map(str, paths)) if path not in pending]
+            self._jobs.extend(added)
+        if added:
+            self.on_change(None)
+            threading.Thread(target=self._probe_durations, args=(added,), daemon=True).start()
+        return added
+
+    def _probe_durations(self, jobs):
+        for job in jobs:
+            job.duration = media_duration(job.path)
+            self.on_change(job)
+
+    def remove(self, job_ids):
+        """Remove jobs that are not running"""
+        job_ids = set(job_ids)
+        with self._lock:
+            self._jobs = [job for job in self._jobs if job.id not in job_ids or job.status == RUNNING]
+        self.on_change(None)
+
+    def clear_finished(self):
+        with self._lock:
+            self._jobs = [job for job in self._jobs if job.status not in (DONE, FAILED)]
+        self.on_change(None)
+
+    def move(self, job_id, delta):
+        """Move a job up (negative delta) or down in the list"""
+        with self._lock:
+            index = next((i for i, job in enumerate(self._jobs) if job.id == job_id), None)
+            if index is None:
+                return
+            target = max(0, min(len(self._jobs) - 1, index + delta))
+            self._jobs.insert(target, self._jobs.pop(index))
+        self.on_change(None)
+
+    def retry(self, job_ids):
+        """Queue failed jobs again"""
+        with self._lock:
+            for job in self._jobs:
+                if job.id in job_ids and job.status == FAILED:
+                    job.status, job.error, job.progress = QUEUED, None, 0.0
+        self.on_change(None)
+
+    def next_job(self):
+        """The job to run next: first in the list, or the shortest known duration"""
+        with self._lock:
+            queued = [job for job in self._jobs if job.status == QUEUED and job.id not in self._claimed]
+        if not queued:
+            return None
+        if self.shortest_first:
+            # Unknown durations go last, ties keep list order
+            return min(queued, key=lambda job: job.duration if job.duration is not None else float("inf"))
+        return queued[0]
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start working through the queue, returns False if already running"""
+        if self.running:
+            return False
+        self.stop_event.clear()
+        self.started = time.time()
+        self.finished = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop after the current job; it is put back in the queue"""
+        self.stop_event.set()
+
+    def _claim_jobs(self):
+        """Yield jobs in run order for the decode stage, claiming each so the next pick skips it"""
+        while not self.stop_event.is_set():
+            job = self.next_job()
+            if job is None:
+                return
+            with self._lock:
+                self._claimed.add(job.id)
+            yield job
+
+    def _run(self):
+        self.timings = StageTimings()
+        try:
+            # The decode stage stops claiming once the queue looks empty, so look again for files added meanwhile
+            while not self.stop_event.is_set() and self.next_job() is not None:
+                pipeline = DecodePipeline(self._claim_jobs(), self.decode, depth=self.prefetch, timings=self.timings)
+                try:
+                    for job, audio, error, _ in pipeline:
+                        with self._lock:
+                            self._claimed.discard(job.id)
+                            # Removed from the list or retried elsewhere while it was being decoded
+                            skip = job.status != QUEUED or job not in self._jobs
+                        if self.stop_event.is_set():
+                            break
+                        if skip:
+                            continue
+
+                        job.status, job.error, job.progress = RUNNING, None, 0.0
+                        self.on_change(job)
+                        started = time.perf_counter()
+                        try:
+                            if error is not None:
+                                raise error
+                            outputs = self.run_job(job, audio, self.stop_event)
+                        except Exception as e:
+                            job.status, job.error = FAILED, str(e)
+                        else:
+                            if outputs is None:
+                                # Stopped part way, start over on the next run
+                                job.status, job.progress = QUEUED, 0.0
+                            else:
+                                job.status, job.outputs, job.progress = DONE, outputs, 1.0
+                                job.elapsed = time.perf_counter() - started
+                        self.timings.add(inference=time.perf_counter() - started)
+                        del audio
+                        self.on_change(job)
+                finally:
+                    pipeline.close()
+                    with self._lock:
+                        self._claimed.clear()
+        finally:
+            self.finished = time.time()
+            self.on_change(None)
+
+    def summary(self):
+        """Counts and overall throughput of the finished jobs"""
+        jobs = self.jobs()
+        done = [job for job in jobs if job.status == DONE]
+        audio = sum(job.duration or 0.0 for job in done)
+        busy = sum(job.elapsed or 0.0 for job in done)
+        return {
+            "total": len(jobs),
+            "done": len(done),
+            "failed": sum(1 for job in jobs if job.status == FAILED),
+            "queued": sum(1 for job in jobs if job.status == QUEUED),
+            "audio_seconds": audio,
+            "busy_seconds": busy,
+            "speed": audio / busy if busy else None,
+            "remaining_seconds": sum(job.duration or 0.0 for job in jobs if job.status in (QUEUED, RUNNING)),
+        }
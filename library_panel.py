@@ -0,0 +1,166 @@
+"""
+WhisperUI library panel
+Window for searching every stored transcript as you type: matching segments
+are listed with their file and time, and opening one shows that transcript
+in the main window scrolled to the match
+"""
+
+import time
+import tkinter as tk
+from tkinter import messagebox
+from tkinter import ttk
+
+import transcriber
+from transcript_library import format_date
+
+
+# Pause in typing before the search runs
+SEARCH_DELAY_MS = 150
+RESULT_LIMIT = 200
+
+
+class LibraryPanel:
+    """Toplevel window searching the app's TranscriptLibrary"""
+
+    def __init__(self, app):
+        self.app = app
+        self.root = app.root
+        self.library = app.library
+        self.query = tk.StringVar()
+        self.results = {}  # Tree item -> (transcript_id, start seconds)
+        self._search_after_id = None
+
+        self.window = tk.Toplevel(self.root)
+        self.window.title("Transcript Library")
+        self.window.geometry("860x460")
+        # Closing only hides the window, the next search is as fast as the first
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+        self.setup_ui()
+        self.query.trace_add("write", self._schedule_search)
+        self.search()
+
+    def show(self):
+        self.window.deiconify()
+        self.window.lift()
+        self.entry.focus_set()
+        self.search()  # Pick up transcripts finished since it was last shown
+
+    def setup_ui(self):
+        frame = tk.Frame(self.window, padx=10, pady=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        search_frame = tk.Frame(frame)
+        search_frame.pack(fill=tk.X)
+        tk.Label(search_frame, text="Search:", font=("Helvetica", 11)).pack(side=tk.LEFT, padx=(0, 5))
+        self.entry = tk.Entry(search_frame, textvariable=self.query, font=("Helvetica", 12))
+        self.entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.entry.bind("<Return>", lambda event: self.open_selected())
+        self.entry.bind("<Down>", lambda event: self._focus_results())
+        self.entry.focus_set()
+
+        list_frame = tk.Frame(frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(8, 0))
+        columns = ("file", "time", "text", "date")
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="browse")
+        for column, title, width, anchor in (
+            ("file", "File", 200, tk.W),
+            ("time", "Time", 70, tk.E),
+            ("text", "Text", 440, tk.W),
+            ("date", "Transcribed", 120, tk.W),
+        ):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor=anchor, stretch=(column == "text"))
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.bind("<Double-1>", lambda event: self.open_selected())
+        self.tree.bind("<Return>", lambda event: self.open_selected())
+
+        bottom_frame = tk.Frame(frame)
+        bottom_frame.pack(fill=tk.X, pady=(8, 0))
+        tk.Button(bottom_frame, text="Open", command=self.open_selected,
+                  font=("Helvetica", 11)).pack(side=tk.LEFT, padx=(0, 5))
+        tk.Button(bottom_frame, text="Delete Transcript", command=self.delete_selected,
+                  font=("Helvetica", 11)).pack(side=tk.LEFT, padx=(0, 10))
+        self.summary_label = tk.Label(bottom_frame, text="", fg="#666", font=("Helvetica", 10))
+        self.summary_label.pack(side=tk.LEFT)
+
+    def _focus_results(self):
+        children = self.tree.get_children()
+        if children:
+            self.tree.focus_set()
+            self.tree.selection_set(children[0])
+            self.tree.focus(children[0])
+
+    def _schedule_search(self, *args):
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DELAY_MS, self.search)
+
+    def search(self):
+        """List the segments matching the query, or the latest transcripts when it is empty (main thread)"""
+        self._search_after_id = None
+        text = self.query.get().strip()
+        started = time.perf_counter()
+        try:
+            if text:
+                rows = [
+                    (row["transcript_id"], row["start_seconds"],
+                     (row["file_name"], transcriber.format_timestamp(row["start_seconds"]), row["snippet"],
+                      format_date(row["created"])))
+                    for row in self.library.search(text, limit=RESULT_LIMIT)
+                ]
+            else:
+                rows = [
+                    (row["id"], 0.0,
+                     (row["file_name"], "", f"{row['segment_count']} segments, {row['model'] or '-'}, "
+                                            f"{row['language'] or '-'}", format_date(row["created"])))
+                    for row in self.library.recent(limit=RESULT_LIMIT)
+                ]
+        except Exception as e:
+            self.summary_label.config(text=f"Library unavailable: {e}", fg="#F44336")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.tree.delete(*self.tree.get_children())
+        self.results = {}
+        for transcript_id, start, values in rows:
+            item = self.tree.insert("", tk.END, values=values)
+            self.results[item] = (transcript_id, start)
+
+        if text:
+            more = "+" if len(rows) == RESULT_LIMIT else ""
+            summary = f"{len(rows)}{more} matching segments ({elapsed_ms:.0f} ms)"
+        else:
+            stats = self.library.stats()
+            summary = (f"{stats['transcripts']} transcripts, {stats['audio_hours']:.1f} h of audio. "
+                       "Type to search what was said")
+        self.summary_label.config(text=summary, fg="#666")
+
+    def _selected(self):
+        selection = self.tree.selection() or self.tree.get_children()[:1]
+        return self.results.get(selection[0]) if selection else None
+
+    def open_selected(self):
+        """Show the selected transcript in the main window at the matching segment"""
+        selected = self._selected()
+        if selected is None:
+            return
+        transcript_id, start = selected
+        if self.app.open_library_transcript(transcript_id, start):
+            self.root.lift()
+
+    def delete_selected(self):
+        selected = self._selected()
+        if selected is None:
+            return
+        meta = self.library.get(selected[0])
+        if meta is None:
+            return
+        if not messagebox.askyesno("Delete Transcript",
+                                   f"Remove the transcript of {meta['file_name']} from the library?",
+                                   parent=self.window):
+            return
+        self.library.delete(selected[0])
+        self.search()
@@ -4,46 +4,110 @@ WhisperOSX - Audio/Video Transcription App
 Uses faster-whisper for efficient CPU-based transcription
 """
 
+import startup_timing
 import tkinter as tk
-from tkinter import filedialog, scrolledtext, messagebox
+from tkinter import filedialog, messagebox
 from tkinter import ttk
 from pathlib import Path
+import os
 import threading
 import multiprocessing
 import sys
 import traceback
-from faster_whisper import WhisperModel
+import transcriber
+import chunked
+import result_cache
+import transcript_library
+import backends
+from checkpoint import Checkpoint
+from segment_store import SegmentStore
+from ui_updates import UIUpdateQueue
+from transcript_view import TranscriptView, parse_timestamp
+from run_metrics import RunMetrics
+from inference_worker import InferenceWorker, WorkerStopped
+import cpu_tuning
+import presets
+import word_alignment
+from queue_panel import QueuePanel
+from library_panel import LibraryPanel
+
+startup_timing.mark("imports")
 
 
 class WhisperApp:
+    # The GPU edition (main_gpu.py) overrides these
+    window_title = "Whisper Transcription Tool"
+    edition = "cpu"
+    backend_class = backends.FasterWhisperBackend
+
     def __init__(self, root):
         self.root = root
-        self.root.title("Whisper Transcription Tool")
+        self.root.title(self.window_title)
         self.root.geometry("1000x600")
 
-        # Model will be loaded lazily
+        # Inference runs in a child process, where models are loaded lazily and kept resident in an LRU cache
+        self.backend = self.backend_class()
+        self.worker = InferenceWorker(self.backend.name)
+        self.model_cache = self.worker  # Same lookups as ModelCache, the models live in the worker
         self.model = None
         self.loaded_model_size = None  # Track which model is currently loaded
+        self.result_cache = result_cache.ResultCache()  # Finished transcripts keyed by audio content and settings
+        # Every finished transcript, searchable; write failures show up in the status bar
+        self.library = transcript_library.TranscriptLibrary(on_error=self._on_library_error)
         self.model_size = tk.StringVar(value="base")
         self.language = tk.StringVar(value="Auto")
+        self.preset = tk.StringVar(value=presets.DEFAULT_PRESET)  # Decoding speed/accuracy trade-off
+        self.parallel_chunks = tk.BooleanVar(value=False)  # Split long files and transcribe chunks concurrently
+        self.compute_type = tk.StringVar(value="Auto")  # Auto uses the calibrated setting for the model size
+        self.cpu_threads = tk.StringVar(value="Auto")
+        self.calibrating = False
         self.current_file = None
-        self.segments_data = []  # Store segments with timestamps for SRT export
+        self.segments_data = SegmentStore()  # Compact columnar segments with timestamps for SRT export
+        self.transcript_source = None  # Audio, model and settings behind segments_data, for deferred word alignment
         self.stop_event = threading.Event()  # Event to signal transcription stop
+        self.transcribing = False
+        self.run_metrics = None  # Timings of the current (or last) transcription
+        self.queue_panel = None  # Multi-file queue window, created on first use
+        self.library_panel = None  # Transcript search window, created on first use
+        # Formats written by Export All, in one pass over the transcript
+        self.export_formats = {name: tk.BooleanVar(value=name in ("txt", "srt")) for name in transcriber.EXPORTERS}
+
+        # Background model warm-up: one worker thread always loads the latest selection
+        self._warmup_lock = threading.Lock()
+        self._warmup_target = None
+        self._warmup_thread = None
+        self._warmup_after_id = None
 
         self.setup_ui()
 
+        # Start loading the selected model as soon as the window is up
+        self.model_size.trace_add("write", self.schedule_warm_up)
+        self.parallel_chunks.trace_add("write", self.schedule_warm_up)
+        self.compute_type.trace_add("write", self.schedule_warm_up)
+        self.cpu_threads.trace_add("write", self.schedule_warm_up)
+        self.model_size.trace_add("write", self._refresh_presets)
+        self.preset.trace_add("write", self._refresh_presets)
+        self.root.after_idle(self.start_background_setup)
+
+    def title_text(self):
+        return "Whisper Transcription"
+
+    def start_background_setup(self):
+        """First work after the window is up: warm up the selected model"""
+        self.warm_up_model()
+
     def setup_ui(self):
         # Main container
         main_frame = tk.Frame(self.root, padx=20, pady=20)
         main_frame.pack(fill=tk.BOTH, expand=True)
 
         # Title
-        title_label = tk.Label(
+        self.title_label = tk.Label(
             main_frame,
-            text="Whisper Transcription",
+            text=self.title_text(),
             font=("Helvetica", 18, "bold")
         )
-        title_label.pack(pady=(0, 20))
+        self.title_label.pack(pady=(0, 20))
 
         # Controls frame
         controls_frame = tk.Frame(main_frame)
@@ -93,6 +157,32 @@ class WhisperApp:
         )
         self.language_dropdown.pack(side=tk.LEFT)
 
+        # Decoding preset, each entry shows the speed it reached on earlier runs
+        preset_frame = tk.Frame(controls_frame)
+        preset_frame.pack(side=tk.LEFT, padx=(0, 10))
+
+        tk.Label(preset_frame, text="Preset:", font=("Helvetica", 11)).pack(side=tk.LEFT, padx=(0, 5))
+        self.preset_dropdown = tk.OptionMenu(preset_frame, self.preset, *presets.PRESET_NAMES)
+        self.preset_dropdown.config(
+            font=("Helvetica", 11),
+            bg="white",
+            fg="black",
+            highlightthickness=1,
+            relief=tk.RAISED,
+            width=9
+        )
+        self.preset_dropdown.pack(side=tk.LEFT)
+
+        # Second row: edition specific hardware settings on the left, preset speed on the right
+        options_frame = tk.Frame(main_frame)
+        options_frame.pack(fill=tk.X)
+        self.setup_hardware_controls(controls_frame, options_frame)
+
+        # Measured speed of the selected preset with the selected model
+        self.preset_label = tk.Label(options_frame, text="", fg="#666", font=("Helvetica", 10))
+        self.preset_label.pack(side=tk.RIGHT)
+        self._refresh_presets()
+
         # Buttons frame (to organize on next row)
         buttons_frame = tk.Frame(main_frame)
         buttons_frame.pack(pady=(10, 10))
@@ -115,6 +205,42 @@ class WhisperApp:
         )
         self.btn_select.pack(side=tk.LEFT, padx=5)
 
+        # Queue button (many files, run unattended)
+        self.btn_queue = tk.Button(
+            buttons_frame,
+            text="Queue...",
+            command=self.open_queue,
+            bg="#E8F5E9",
+            fg="#2E7D32",
+            font=("Helvetica", 13, "bold"),
+            padx=20,
+            pady=12,
+            relief=tk.RAISED,
+            bd=2,
+            activebackground="#C8E6C9",
+            activeforeground="#1B5E20",
+            highlightthickness=0
+        )
+        self.btn_queue.pack(side=tk.LEFT, padx=5)
+
+        # Library button (search every past transcript)
+        self.btn_library = tk.Button(
+            buttons_frame,
+            text="Library...",
+            command=self.open_library,
+            bg="#E8F5E9",
+            fg="#2E7D32",
+            font=("Helvetica", 13, "bold"),
+            padx=20,
+            pady=12,
+            relief=tk.RAISED,
+            bd=2,
+            activebackground="#C8E6C9",
+            activeforeground="#1B5E20",
+            highlightthickness=0
+        )
+        self.btn_library.pack(side=tk.LEFT, padx=5)
+
         # Start button
         self.btn_start = tk.Button(
             buttons_frame,
@@ -215,6 +341,21 @@ class WhisperApp:
         )
         self.btn_save_srt_words.pack(side=tk.LEFT, padx=5)
 
+        # Export several formats at once
+        export_frame = tk.Frame(main_frame)
+        export_frame.pack(pady=(0, 10))
+        tk.Label(export_frame, text="Formats:", font=("Helvetica", 11)).pack(side=tk.LEFT)
+        for name, variable in self.export_formats.items():
+            tk.Checkbutton(export_frame, text=name, variable=variable, font=("Helvetica", 11)).pack(side=tk.LEFT)
+        self.btn_export = tk.Button(
+            export_frame,
+            text="Export All...",
+            command=self.export_all,
+            font=("Helvetica", 11),
+            state=tk.DISABLED
+        )
+        self.btn_export.pack(side=tk.LEFT, padx=(10, 0))
+
         # Status label
         self.status = tk.Label(
             main_frame,
@@ -236,16 +377,88 @@ class WhisperApp:
         text_frame = tk.Frame(main_frame)
         text_frame.pack(fill=tk.BOTH, expand=True)
 
-        tk.Label(text_frame, text="Transcription:", font=("Helvetica", 12, "bold")).pack(anchor=tk.W)
+        header_frame = tk.Frame(text_frame)
+        header_frame.pack(fill=tk.X)
+
+        tk.Label(header_frame, text="Transcription:", font=("Helvetica", 12, "bold")).pack(side=tk.LEFT)
+
+        # Jump to any point of a long transcript
+        tk.Label(header_frame, text="Go to:", font=("Helvetica", 10)).pack(side=tk.LEFT, padx=(15, 3))
+        self.goto_entry = tk.Entry(header_frame, width=9, font=("Helvetica", 10))
+        self.goto_entry.pack(side=tk.LEFT)
+        self.goto_entry.bind("<Return>", lambda event: self.go_to_timestamp())
+
+        # UI updates per second, to confirm the main thread keeps up during long transcriptions
+        self.ui_rate_label = tk.Label(header_frame, text="", fg="#999", font=("Helvetica", 9))
+        self.ui_rate_label.pack(side=tk.RIGHT)
+
+        # Live per-stage timings of the current run, the last run's breakdown afterwards
+        self.perf_label = tk.Label(header_frame, text="", fg="#999", font=("Helvetica", 9))
+        self.perf_label.pack(side=tk.RIGHT, padx=(0, 10))
+
+        # Only the segments on screen are rendered, read from segments_data
+        self.transcript_view = TranscriptView(text_frame, lambda: self.segments_data, font=("Courier", 11))
+        self.transcript_view.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+
+        # The worker thread queues segment counts, a fixed-rate tick shows the newest one
+        self.ui_updates = UIUpdateQueue(self.root, self.transcript_view.set_count, self.transcript_view.clear,
+                                        combine=max)
+        self.ui_updates.start()
+        self.root.after(1000, self._refresh_ui_rate)
+
+    def setup_hardware_controls(self, controls_frame, options_frame):
+        """Parallel chunking and CPU tuning controls"""
+        # Parallel chunked mode for long recordings
+        self.parallel_check = tk.Checkbutton(
+            controls_frame,
+            text="Parallel chunks (long files)",
+            variable=self.parallel_chunks,
+            font=("Helvetica", 11)
+        )
+        self.parallel_check.pack(side=tk.LEFT, padx=(0, 10))
 
-        self.text_area = scrolledtext.ScrolledText(
-            text_frame,
-            height=20,
-            width=80,
-            font=("Courier", 11),
-            wrap=tk.WORD
+        # CPU tuning: calibrated per model size, with a manual override
+        tk.Label(options_frame, text="Compute:", font=("Helvetica", 11)).pack(side=tk.LEFT, padx=(0, 5))
+        self.compute_dropdown = tk.OptionMenu(options_frame, self.compute_type, "Auto", *cpu_tuning.COMPUTE_TYPES)
+        self.compute_dropdown.config(
+            font=("Helvetica", 11),
+            bg="white",
+            fg="black",
+            highlightthickness=1,
+            relief=tk.RAISED,
+            width=12
+        )
+        self.compute_dropdown.pack(side=tk.LEFT, padx=(0, 10))
+
+        tk.Label(options_frame, text="Threads:", font=("Helvetica", 11)).pack(side=tk.LEFT, padx=(0, 5))
+        thread_choices = sorted(set(cpu_tuning.thread_candidates()) | ({1, 2, 4, 8} & set(range(1, (os.cpu_count() or 1) + 1))))
+        self.threads_dropdown = tk.OptionMenu(options_frame, self.cpu_threads, "Auto", *map(str, thread_choices))
+        self.threads_dropdown.config(
+            font=("Helvetica", 11),
+            bg="white",
+            fg="black",
+            highlightthickness=1,
+            relief=tk.RAISED,
+            width=6
+        )
+        self.threads_dropdown.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.btn_calibrate = tk.Button(
+            options_frame,
+            text="Calibrate",
+            command=self.start_calibration,
+            font=("Helvetica", 11),
+            bg="white",
+            fg="black",
+            relief=tk.RAISED,
+            cursor="hand2"
         )
-        self.text_area.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.btn_calibrate.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.tuning_label = tk.Label(options_frame, text="", fg="#666", font=("Helvetica", 10))
+        self.tuning_label.pack(side=tk.LEFT)
+        self._refresh_tuning_label()
+        self.model_size.trace_add("write", self._refresh_tuning_label)
 
     def select_file(self):
         file_path = filedialog.askopenfilename(
@@ -261,10 +474,12 @@ class WhisperApp:
         if file_path:
             # Reset everything when a new file is selected
             self.current_file = file_path
-            self.segments_data = []
+            self.segments_data = SegmentStore()
+            self.transcript_source = None
 
-            # Clear text area
-            self.text_area.delete(1.0, tk.END)
+            # Clear text area (dropping anything still queued from a previous run)
+            self.ui_updates.reset()
+            self.ui_updates.drain()
 
             # Reset button states
             self.btn_start.config(state=tk.NORMAL)
@@ -272,6 +487,7 @@ class WhisperApp:
             self.btn_save.config(state=tk.DISABLED)
             self.btn_save_srt.config(state=tk.DISABLED)
             self.btn_save_srt_words.config(state=tk.DISABLED)
+            self.btn_export.config(state=tk.DISABLED)
 
             # Update status
             filename = Path(file_path).name
@@ -279,6 +495,13 @@ class WhisperApp:
 
     def start_transcription(self):
         """Start transcription when user clicks Start button"""
+        if self.queue_panel is not None and self.queue_panel.running:
+            messagebox.showinfo("Queue Running", "Stop the transcription queue or wait for it to finish first.")
+            return
+        if self.calibrating:
+            messagebox.showinfo("Calibrating", "Wait for the calibration to finish first.")
+            return
+
         if self.current_file:
             # Clear stop event
             self.stop_event.clear()
@@ -286,67 +509,250 @@ class WhisperApp:
             # Start transcription in separate thread
             threading.Thread(target=self.transcribe, args=(self.current_file,), daemon=True).start()
 
+    def open_queue(self):
+        """Show the multi-file queue window"""
+        if self.queue_panel is None:
+            self.queue_panel = QueuePanel(self)
+        else:
+            self.queue_panel.show()
+
+    def open_library(self):
+        """Show the transcript library window"""
+        if self.library_panel is None:
+            self.library_panel = LibraryPanel(self)
+        else:
+            self.library_panel.show()
+
+    def _on_library_error(self, message):
+        """Show that the transcript library stopped saving (any thread)"""
+        self.root.after(0, lambda: self.status.config(text=message, fg="#F44336"))
+
+    def open_library_transcript(self, transcript_id, seconds=0.0):
+        """Show a stored transcript scrolled to seconds (main thread), returns whether it was opened"""
+        if self.transcribing or (self.queue_panel is not None and self.queue_panel.running):
+            messagebox.showinfo("Transcription Running", "Wait for the transcription to finish first.")
+            return False
+        meta = self.library.get(transcript_id)
+        if meta is None:
+            return False
+
+        self.segments_data = SegmentStore(self.library.segments(transcript_id))
+        self.current_file = meta["file_path"]
+        self.transcript_source = None  # Word timings can't be aligned without the run's settings
+        self.ui_updates.reset()
+        self.ui_updates.drain()
+        self.transcript_view.set_count(len(self.segments_data))
+        self.transcript_view.jump_to_time(seconds)
+
+        # Start re-transcribes the file, if it is still where it was
+        file_exists = bool(meta["file_path"]) and os.path.exists(meta["file_path"])
+        self.btn_start.config(state=tk.NORMAL if file_exists else tk.DISABLED)
+        self.btn_stop.config(state=tk.DISABLED)
+        self.btn_save.config(state=tk.NORMAL)
+        self.btn_save_srt.config(state=tk.NORMAL)
+        self.btn_save_srt_words.config(state=tk.NORMAL)
+        self.btn_export.config(state=tk.NORMAL)
+        self.status.config(
+            text=f"Library: {meta['file_name']} ({len(self.segments_data)} segments, "
+                 f"{transcript_library.format_date(meta['created'])})",
+            fg="#1565C0"
+        )
+        return True
+
     def stop_transcription(self):
         """Stop ongoing transcription"""
         self.stop_event.set()
+        # Killing the worker ends even a long segment decode or model load right away
+        # (only this window's request; a background warm-up keeps its model)
+        self.worker.cancel(self)
         self.status.config(text="Stopping transcription...", fg="#FF9800")
 
-    def load_model(self):
-        """Load the Whisper model (lazy loading)"""
-        requested_model = self.model_size.get()
+    def model_key(self):
+        """Cache key (size, device, compute_type) for the current selection"""
+        # Always CPU; the compute type is the manual choice, else the calibrated one, else int8
+        override = self.compute_type.get()
+        compute_type, _ = cpu_tuning.resolve(self.model_size.get(), None if override == "Auto" else override)
+        return (self.model_size.get(), "cpu", compute_type)
+
+    def model_options(self):
+        """Extra loader options for the current selection"""
+        override = self.cpu_threads.get()
+        threads = 0 if override == "Auto" else int(override)
+        if self.parallel_chunks.get():
+            # One model serves all chunks concurrently, so split the cores between them
+            workers = chunked.default_workers()
+            return {"num_workers": workers, "cpu_threads": threads or max(1, (os.cpu_count() or 1) // workers)}
+        if threads:
+            return {"cpu_threads": threads}
+        tuned = cpu_tuning.tuned_settings(self.model_size.get())
+        return {"cpu_threads": tuned["cpu_threads"]} if tuned else {}
+
+    def _refresh_tuning_label(self, *args):
+        """Show the calibrated settings for the selected model size"""
+        settings = cpu_tuning.tuned_settings(self.model_size.get())
+        self.tuning_label.config(text=f"Auto: {cpu_tuning.describe(settings)}")
+
+    def _refresh_presets(self, *args):
+        """Show each preset's measured real-time factor for the selected model"""
+        measured = presets.measured_rtf(self.edition, self.model_size.get())
+        menu = self.preset_dropdown["menu"]
+        for index, name in enumerate(presets.PRESET_NAMES):
+            if name in measured:
+                menu.entryconfig(index, label=f"{name} ({measured[name][0]:.1f}x real time)")
+            else:
+                menu.entryconfig(index, label=name)
+        name = self.preset.get()
+        self.preset_label.config(
+            text=f"{name}: {presets.get_preset(name)['description']}, {presets.describe_rtf(measured, name)}"
+        )
 
-        # Only reload if model hasn't been loaded or if a different model is requested
-        if self.model is None or self.loaded_model_size != requested_model:
+    def start_calibration(self):
+        """Time the selected model across compute types and thread counts in the background"""
+        if self.transcribing or self.calibrating or (self.queue_panel is not None and self.queue_panel.running):
+            messagebox.showinfo("Calibrate", "Wait for the current transcription to finish first.")
+            return
+        model_size = self.model_size.get()
+        if not messagebox.askyesno(
+            "Calibrate",
+            f"Time the {model_size} model with each compute type and thread count?\n\n"
+            "This loads the model several times and can take a few minutes for the larger sizes. "
+            + ("The first 30 seconds of the selected file are used." if self.current_file
+               else "Select a speech recording first for the most representative result.")
+        ):
+            return
+        self.calibrating = True
+        self.btn_calibrate.config(state=tk.DISABLED)
+        self.btn_start.config(state=tk.DISABLED)
+        self.progress.start(10)
+        threading.Thread(target=self._calibrate_worker, args=(model_size, self.current_file), daemon=True).start()
+
+    def _calibrate_worker(self, model_size, file_path):
+        def progress(done, total, label):
+            text = f"Calibrating {model_size}: {label} ({done + 1}/{total})..."
+            self.root.after(0, lambda: self.status.config(text=text, fg="#FF9800"))
+
+        try:
+            content_hash = result_cache.file_content_hash(file_path) if file_path else None
+            lang_code = self.get_language_code(self.language.get())
+            settings = self.worker.calibrate(model_size, file_path, content_hash, language=lang_code or "en",
+                                             progress=progress, owner=self)
+            error = None if settings else "No compute type could be loaded."
+        except Exception as e:
+            settings, error = None, str(e)
+        self.root.after(0, lambda: self._on_calibration_done(model_size, settings, error))
+
+    def _on_calibration_done(self, model_size, settings, error):
+        """Apply a finished calibration (main thread)"""
+        self.calibrating = False
+        self.progress.stop()
+        self.btn_calibrate.config(state=tk.NORMAL)
+        if self.current_file:
+            self.btn_start.config(state=tk.NORMAL)
+        self._refresh_tuning_label()
+        if error:
+            self.status.config(text="Calibration failed", fg="#F44336")
+            messagebox.showerror("Calibrate", f"Calibration failed: {error}")
+            return
+        self.status.config(text=f"Calibrated {model_size}: {cpu_tuning.describe(settings)}", fg="#4CAF50")
+        self.schedule_warm_up()  # Auto settings may have changed
+
+    def schedule_warm_up(self, *args):
+        """Debounce dropdown changes before warming up the newly selected model"""
+        if self._warmup_after_id is not None:
+            self.root.after_cancel(self._warmup_after_id)
+        self._warmup_after_id = self.root.after(300, self.warm_up_model)
+
+    def warm_up_model(self):
+        """Speculatively load the selected model in the background (main thread)"""
+        if self._warmup_after_id is not None:
+            self.root.after_cancel(self._warmup_after_id)
+            self._warmup_after_id = None
+        with self._warmup_lock:
+            # A newer selection replaces any target the worker hasn't started yet
+            self._warmup_target = (self.model_key(), self.model_options())
+            if self._warmup_thread is None:
+                self._warmup_thread = threading.Thread(target=self._warm_up_worker, daemon=True)
+                self._warmup_thread.start()
+
+    def _warm_up_worker(self):
+        """Load warm-up targets until no newer selection is pending"""
+        # The worker process imports the inference stack here, after the window is up
+        try:
+            self.worker.start()
+            startup_timing.mark("backend_imported")
+        except Exception:
+            pass  # Reported when the model is loaded
+
+        while True:
+            with self._warmup_lock:
+                target = self._warmup_target
+                self._warmup_target = None
+                if target is None:
+                    self._warmup_thread = None
+                    return
+
+            key, options = target
+            if self.model_cache.contains(*key, **options):
+                continue
+
+            name = key[0]
+            if not self.transcribing:
+                self.root.after(0, lambda n=name: self.status.config(text=f"Preparing {n} model in the background...", fg="#666"))
             try:
+                # A Start pressed meanwhile waits on this same load inside the cache
+                self.model_cache.get(*key, **options)
+            except Exception:
+                # Errors are reported when the user actually starts a transcription
+                continue
+
+            startup_timing.mark("model_ready")
+            self.root.after(0, lambda t=target: self._on_warm_up_done(t))
+
+    def _on_warm_up_done(self, target):
+        """Report a finished warm-up unless it was superseded (main thread)"""
+        if self.transcribing or target != (self.model_key(), self.model_options()):
+            return
+        name = target[0][0]
+        if self.current_file:
+            text = f"Ready: {Path(self.current_file).name} ({name} model loaded)"
+        else:
+            text = f"Ready. Select a file to begin transcription. ({name} model loaded)"
+        self.status.config(text=text, fg="#1565C0" if self.current_file else "#666")
+
+    def load_model(self):
+        """Load the Whisper model through the LRU model cache"""
+        requested_model, device, compute_type = self.model_key()
+        options = self.model_options()
+        try:
+            if self.model_cache.is_loading(requested_model, device, compute_type, **options):
+                self.root.after(0, lambda name=requested_model: self.status.config(text=f"Waiting for {name} model to finish loading...", fg="#FF9800"))
+            elif not self.model_cache.contains(requested_model, device, compute_type, **options):
                 self.root.after(0, lambda name=requested_model: self.status.config(text=f"Loading {name} model...", fg="#FF9800"))
                 self.root.after(0, lambda: self.root.update())
 
-                # Always use CPU with int8 optimization
-                self.model = WhisperModel(
-                    requested_model,
-                    device="cpu",
-                    compute_type="int8"
-                )
+            # Cache hit returns the resident model, a miss loads it (evicting the least recently used)
+            self.model = self.model_cache.get(requested_model, device, compute_type, owner=self, **options)
 
-                # Track which model is loaded
-                self.loaded_model_size = requested_model
+            # Track which model is loaded
+            self.loaded_model_size = requested_model
 
-                return True
-            except Exception as e:
-                error_msg = str(e)
-                self.root.after(0, lambda msg=error_msg: messagebox.showerror("Model Error", f"Failed to load model: {msg}"))
-                return False
-        return True
+            return True
+        except WorkerStopped:
+            raise
+        except Exception as e:
+            error_msg = str(e)
+            self.root.after(0, lambda msg=error_msg: messagebox.showerror("Model Error", f"Failed to load model: {msg}"))
+            return False
 
     def get_language_code(self, language_name):
         """Convert language name to ISO code for Whisper"""
-        language_map = {
-            "Auto": None,
-            "English": "en",
-            "Spanish": "es",
-            "French": "fr",
-            "German": "de",
-            "Italian": "it",
-            "Portuguese": "pt",
-            "Dutch": "nl",
-            "Russian": "ru",
-            "Chinese": "zh",
-            "Japanese": "ja",
-            "Korean": "ko",
-            "Arabic": "ar",
-            "Hindi": "hi",
-            "Turkish": "tr",
-            "Polish": "pl",
-            "Ukrainian": "uk",
-            "Swedish": "sv",
-            "Danish": "da",
-            "Norwegian": "no",
-            "Finnish": "fi"
-        }
-        return language_map.get(language_name, None)
+        return transcriber.get_language_code(language_name)
 
     def transcribe(self, file_path):
         """Transcribe audio/video file"""
+        self.transcribing = True
+        self.run_metrics = None
+        library_writer = None  # Stores the segments in the library as they arrive
         try:
             # Disable buttons during transcription (on main thread)
             self.root.after(0, lambda: self.btn_select.config(state=tk.DISABLED))
@@ -355,12 +761,14 @@ class WhisperApp:
             self.root.after(0, lambda: self.btn_save.config(state=tk.DISABLED))
             self.root.after(0, lambda: self.btn_save_srt.config(state=tk.DISABLED))
             self.root.after(0, lambda: self.btn_save_srt_words.config(state=tk.DISABLED))
+            self.root.after(0, lambda: self.btn_export.config(state=tk.DISABLED))
 
             # Clear previous transcription
-            self.root.after(0, lambda: self.text_area.delete(1.0, tk.END))
+            self.ui_updates.reset()
 
             # Clear previous segments data
-            self.segments_data = []
+            self.segments_data = SegmentStore()
+            self.transcript_source = None
 
             # Start progress bar
             self.root.after(0, lambda: self.progress.start(10))
@@ -368,46 +776,191 @@ class WhisperApp:
             filename = Path(file_path).name
             self.root.after(0, lambda fn=filename: self.status.config(text=f"Transcribing: {fn}...", fg="#FF9800"))
 
-            # Load model if needed
-            if not self.load_model():
-                return
-
             # Get selected language
             selected_lang = self.language.get()
             lang_code = self.get_language_code(selected_lang)
-
-            # Transcribe with streaming output and word-level timestamps
-            segments, info = self.model.transcribe(
-                file_path,
-                beam_size=5,
-                language=lang_code,
-                word_timestamps=True  # Enable word-level timestamps for SRT export
+            model_size = self.model_size.get()
+            preset = self.preset.get()
+            decode_options = self.backend.decoding_options(preset)
+            cache_model = self.backend.cache_model_name(model_size)
+            cache_settings = {
+                "beam_size": presets.get_preset(preset)["beam_size"],
+                # Word timings are aligned afterwards, only if a word-level export asks for them
+                "word_timestamps": False,
+                "decoding": presets.cache_tag(preset),
+            }
+
+            # Per-stage timings, shown live and appended to the performance log
+            metrics = self.run_metrics = RunMetrics(
+                edition=self.edition,
+                file=filename,
+                model=model_size,
+                preset=preset,
+                device=self.model_key()[1],
+                compute_type=self.model_key()[2],
+                cpu_threads=self.model_options().get("cpu_threads", 0),
+                parallel=self.parallel_chunks.get() and self.backend.supports_parallel_chunks
             )
 
+            # Reuse a cached transcript of the same audio with the same settings
+            with metrics.stage("hash"):
+                content_hash = result_cache.file_content_hash(file_path)
+                cached = self.result_cache.find(content_hash, cache_model, lang_code, **cache_settings)
+            if cached is not None:
+                self.show_cached_result(cached, filename)
+                # Transcripts cached before the library existed are added on their next use
+                cached_key = self.result_cache.make_key(content_hash, cache_model, lang_code, **cache_settings)
+                try:
+                    if not self.library.has(cached_key):
+                        self.library.add(cached[0], content_hash, file_path, result_key=cached_key,
+                                         edition=self.edition, model=model_size, language=cached[1].language,
+                                         preset=preset, duration=cached[1].duration)
+                except Exception as e:
+                    self.library.report_error(e)  # The library is optional, the cached transcript is already shown
+                self.transcript_source = {
+                    "file": file_path,
+                    "hash": content_hash,
+                    "model_key": self.model_key(),
+                    "model_options": self.model_options(),
+                    "language": cached[1].language,
+                    "info": cached[1],
+                    "cache_key": (content_hash, cache_model, lang_code, cache_settings),
+                    "complete": True,
+                }
+                metrics.finish("cached")
+                return
+
+            # Offer to resume an interrupted run of the same audio and settings
+            run_key = self.result_cache.make_key(content_hash, cache_model, lang_code, **cache_settings)
+            checkpoint = Checkpoint.for_key(run_key)
+            resume_from = 0.0
+            saved = checkpoint.load()
+            with metrics.paused():
+                resume = saved is not None and saved.segments and self.ask_resume(filename, saved)
+            if resume:
+                resume_from = saved.resume_point
+                self.segments_data = SegmentStore(saved.segments)
+                self.ui_updates.put(len(self.segments_data))
+                # Keep decoding in the language the first part was transcribed in
+                lang_code = lang_code or saved.language
+
+            # The worker maps decoded samples from disk when this file was decoded before (any model or language)
+            self.root.after(0, lambda fn=filename: self.status.config(text=f"Decoding audio: {fn}...", fg="#FF9800"))
+            with metrics.stage("audio_decode"):
+                _, metrics.context["audio_cached"] = self.worker.prepare_audio(file_path, content_hash, owner=self)
+
+            # Load model if needed (a model warmed up in the background is just a cache hit)
+            with metrics.stage("model_load"):
+                if not self.load_model():
+                    return
+            if self.stop_event.is_set():
+                raise WorkerStopped("Stopped")  # Pressed while the worker was idle or between requests
+
+            cache_summary = self.model_cache.summary()
+            self.root.after(0, lambda fn=filename, cs=cache_summary: self.status.config(text=f"Transcribing: {fn}... ({cs})", fg="#FF9800"))
+
+            # Transcribe with streaming output using the preset's decoder settings
+            # (the call itself runs language detection, segments are decoded as they are pulled)
+            with metrics.stage("language_detection"):
+                # With parallel chunks the worker splits at silences and decodes the chunks concurrently,
+                # segments still arrive in order
+                parallel = self.parallel_chunks.get() and self.backend.supports_parallel_chunks
+                segments, info = self.worker.transcribe(
+                    self.model,
+                    file_path,
+                    content_hash,
+                    workers=chunked.default_workers() if parallel else 1,
+                    owner=self,
+                    language=lang_code,
+                    word_timestamps=False,
+                    clip_start=resume_from,
+                    # Condition the resumed decode on what was said just before the cut
+                    initial_prompt=self.segments_data[-1].text.strip() if resume_from else None,
+                    **decode_options
+                )
+            metrics.start_decoding(info.duration, resume_from)
+            metrics.context["language"] = info.language
+            metrics.context["resumed_at"] = resume_from
+            self.transcript_source = {
+                "file": file_path,
+                "hash": content_hash,
+                "model_key": self.model_key(),
+                "model_options": self.model_options(),
+                "language": info.language,
+                "info": info,
+                "cache_key": (content_hash, cache_model, lang_code, cache_settings),
+                "complete": False,
+            }
+
+            # Checkpoint segments as they arrive so Stop or a crash can be resumed
+            if resume_from:
+                checkpoint.reopen()
+            else:
+                checkpoint.start({"file": filename, "model": model_size})
+                checkpoint.write_info(info)
+            library_writer = self.library.begin(content_hash, file_path, edition=self.edition, model=model_size,
+                                                preset=preset, language=info.language)
+            library_writer.extend(self.segments_data)  # The part saved before a resume
+
             # Display segments as they're transcribed (streaming)
             detected_lang = "unknown"
-            for segment in segments:
-                # Check if stop was requested
-                if self.stop_event.is_set():
-                    self.root.after(0, lambda: self.status.config(text="Transcription stopped by user", fg="#FF9800"))
-                    return  # Exit transcription early
+            try:
+                for segment in segments:
+                    # Check if stop was requested
+                    if self.stop_event.is_set():
+                        metrics.finish("stopped")
+                        self.root.after(0, lambda: self.status.config(text="Transcription stopped by user (progress saved, Start resumes)", fg="#FF9800"))
+                        self.root.after(0, self.warm_up_model)  # The worker was killed, load the model again
+                        return  # Exit transcription early
+
+                    # A resumed decode can repeat the tail of the last saved segment
+                    if segment.end <= resume_from:
+                        continue
+
+                    # Store segment data for SRT export (copied into compact columns, the object is dropped)
+                    self.segments_data.append(segment)
+                    checkpoint.append(segment)
+                    library_writer.add(segment)
+                    metrics.add_segment(segment.end)
+
+                    # The next UI tick shows everything up to the newest segment in one redraw
+                    self.ui_updates.put(len(self.segments_data))
+            finally:
+                segments.close()  # Kills the worker if the stream was left unfinished
+                checkpoint.close()
+            metrics.finish("done")
+
+            # Finished, the checkpoint is no longer needed
+            checkpoint.delete()
+            self.transcript_source["complete"] = True
 
-                # Store segment data for SRT export
-                self.segments_data.append(segment)
+            # Get detected language from info
+            detected_lang = info.language if hasattr(info, 'language') else "unknown"
 
-                # Format: [00:00:00] Text
-                start_time = self.format_timestamp(segment.start)
-                line = f"[{start_time}] {segment.text.strip()}\n"
+            # Searchable from the Library window from now on
+            library_saved = library_writer.finish(result_key=run_key, language=detected_lang, duration=info.duration,
+                                                  realtime_factor=metrics.realtime_factor) is not None
+            library_writer = None
 
-                # Insert text at the end and auto-scroll
-                self.root.after(0, lambda text=line: self._append_text(text))
+            # Remember the finished transcript for re-runs and exports
+            try:
+                self.result_cache.put(
+                    run_key,
+                    self.segments_data,
+                    info,
+                    meta={"file": filename, "model": model_size, "language": detected_lang}
+                )
+            except Exception:
+                pass  # A full or read-only cache must not fail the transcription
 
-            # Get detected language from info
-            detected_lang = info.language if hasattr(info, 'language') else "unknown"
             if lang_code is None:
                 status_text = f"✓ Transcription complete! Detected language: {detected_lang}"
             else:
                 status_text = f"✓ Transcription complete! Language: {selected_lang}"
+            if metrics.realtime_factor:
+                status_text += f" ({metrics.realtime_factor:.1f}x real time)"
+            if not library_saved:
+                status_text += " - not saved to the library"
 
             self.root.after(0, lambda st=status_text: self.status.config(text=st, fg="#4CAF50"))
 
@@ -415,6 +968,14 @@ class WhisperApp:
             self.root.after(0, lambda: self.btn_save.config(state=tk.NORMAL))
             self.root.after(0, lambda: self.btn_save_srt.config(state=tk.NORMAL))
             self.root.after(0, lambda: self.btn_save_srt_words.config(state=tk.NORMAL))
+            self.root.after(0, lambda: self.btn_export.config(state=tk.NORMAL))
+
+        except WorkerStopped:
+            # Stop killed the worker mid-decode; received segments are checkpointed, start a fresh worker
+            if self.run_metrics is not None and self.run_metrics.finished is None:
+                self.run_metrics.finish("stopped")
+            self.root.after(0, lambda: self.status.config(text="Transcription stopped by user (progress saved, Start resumes)", fg="#FF9800"))
+            self.root.after(0, self.warm_up_model)
 
         except Exception as e:
             error_msg = str(e)
@@ -422,6 +983,19 @@ class WhisperApp:
             self.root.after(0, lambda msg=error_msg: self.status.config(text=f"Error: {msg}", fg="#F44336"))
 
         finally:
+            self.transcribing = False
+            if library_writer is not None:
+                library_writer.abort()  # Stopped or failed, the checkpoint keeps the partial transcript
+
+            # One JSON line per run in the performance log
+            metrics = self.run_metrics
+            if metrics is not None and metrics.finished is None:
+                metrics.finish("error")
+            if metrics is not None:
+                metrics.append_to_log()
+                self.root.after(0, self._refresh_perf)
+                self.root.after(0, self._refresh_presets)
+
             # Stop progress bar and re-enable buttons (on main thread)
             self.root.after(0, lambda: self.progress.stop())
             self.root.after(0, lambda: self.btn_stop.config(state=tk.DISABLED))  # Disable stop button
@@ -433,188 +1007,246 @@ class WhisperApp:
                 self.root.after(0, lambda: self.btn_save.config(state=tk.NORMAL))
                 self.root.after(0, lambda: self.btn_save_srt.config(state=tk.NORMAL))
                 self.root.after(0, lambda: self.btn_save_srt_words.config(state=tk.NORMAL))
+                self.root.after(0, lambda: self.btn_export.config(state=tk.NORMAL))
 
-    def _append_text(self, text):
-        """Append text to text area and auto-scroll (must be called on main thread)"""
-        self.text_area.insert(tk.END, text)
-        self.text_area.see(tk.END)  # Auto-scroll to bottom
+    def ask_resume(self, filename, saved):
+        """Ask on the main thread whether to resume a saved run (blocks the worker thread)"""
+        answer = {}
+        done = threading.Event()
+
+        def ask():
+            try:
+                answer["resume"] = messagebox.askyesno(
+                    "Resume Transcription",
+                    f"An interrupted transcription of {filename} was saved at "
+                    f"{self.format_timestamp(saved.resume_point)} ({len(saved.segments)} segments).\n\n"
+                    f"Resume from there? Choose No to start over."
+                )
+            finally:
+                done.set()
+
+        self.root.after(0, ask)
+        done.wait()
+        return answer.get("resume", False)
+
+    def show_cached_result(self, cached, filename):
+        """Restore a cached transcript instead of transcribing again (worker thread)"""
+        segments, info, meta = cached
+        self.segments_data = SegmentStore(segments)
+
+        # One batched insert for the whole transcript
+        if segments:
+            self.ui_updates.put(len(self.segments_data))
+
+        status_text = f"✓ Loaded {filename} from cache ({len(segments)} segments). Language: {info.language}"
+        self.root.after(0, lambda st=status_text: self.status.config(text=st, fg="#4CAF50"))
+
+    def go_to_timestamp(self):
+        """Scroll the transcript to the time typed in the Go to box"""
+        seconds = parse_timestamp(self.goto_entry.get())
+        if seconds is None:
+            self.status.config(text="Enter a time such as 1:23:45, 83:45 or 5025", fg="#F44336")
+            return
+        index = self.transcript_view.jump_to_time(seconds)
+        if index is not None:
+            self.status.config(text=f"Segment {index + 1} of {self.transcript_view.count}", fg="#666")
+
+    def _refresh_ui_rate(self):
+        """Show the UI update rate while a transcription is running"""
+        if self.transcribing:
+            self.ui_rate_label.config(text=f"{self.ui_updates.updates_per_second()} UI updates/s")
+        else:
+            self.ui_rate_label.config(text="")
+        self._refresh_perf()
+        self.root.after(1000, self._refresh_ui_rate)
+
+    def _refresh_perf(self):
+        """Show live timings of the running transcription, or the last run's stage breakdown"""
+        metrics = self.run_metrics
+        if metrics is None:
+            self.perf_label.config(text="")
+        elif metrics.finished is None:
+            self.perf_label.config(text=metrics.live_text())
+        else:
+            self.perf_label.config(text=metrics.summary())
 
     def format_timestamp(self, seconds):
         """Convert seconds to HH:MM:SS format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        return transcriber.format_timestamp(seconds)
 
     def format_srt_timestamp(self, seconds):
         """Convert seconds to SRT timestamp format (HH:MM:SS,mmm)"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        milliseconds = int((seconds - int(seconds)) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+        return transcriber.format_srt_timestamp(seconds)
 
     def generate_srt(self):
         """Generate SRT subtitle format from segments"""
-        if not self.segments_data:
-            return ""
-
-        srt_content = []
-        for i, segment in enumerate(self.segments_data, start=1):
-            start_time = self.format_srt_timestamp(segment.start)
-            end_time = self.format_srt_timestamp(segment.end)
-            text = segment.text.strip()
-
-            srt_content.append(f"{i}")
-            srt_content.append(f"{start_time} --> {end_time}")
-            srt_content.append(text)
-            srt_content.append("")  # Empty line between entries
-
-        return "\n".join(srt_content)
+        return transcriber.generate_srt(self.segments_data)
 
     def generate_srt_words(self):
         """Generate SRT subtitle format with word-level timestamps (karaoke style)"""
-        if not self.segments_data:
-            return ""
-
-        srt_content = []
-        subtitle_index = 1
-
-        for segment in self.segments_data:
-            # Check if segment has word-level timestamps
-            if hasattr(segment, 'words') and segment.words:
-                words = list(segment.words)
-
-                # Create a subtitle for each word, showing full segment text with current word underlined
-                for i, word in enumerate(words):
-                    start_time = self.format_srt_timestamp(word.start)
-                    end_time = self.format_srt_timestamp(word.end)
-
-                    # Build the text with the current word underlined
-                    text_parts = []
-                    for j, w in enumerate(words):
-                        word_text = w.word.strip()
-                        if j == i:
-                            # Underline the current word
-                            text_parts.append(f"<u>{word_text}</u>")
-                        else:
-                            text_parts.append(word_text)
-
-                    text = " ".join(text_parts)
-
-                    srt_content.append(f"{subtitle_index}")
-                    srt_content.append(f"{start_time} --> {end_time}")
-                    srt_content.append(text)
-                    srt_content.append("")  # Empty line between entries
-
-                    subtitle_index += 1
-            else:
-                # Fallback to segment-level if words not available
-                start_time = self.format_srt_timestamp(segment.start)
-                end_time = self.format_srt_timestamp(segment.end)
-                text = segment.text.strip()
-
-                srt_content.append(f"{subtitle_index}")
-                srt_content.append(f"{start_time} --> {end_time}")
-                srt_content.append(text)
-                srt_content.append("")
-
-                subtitle_index += 1
-
-        return "\n".join(srt_content)
+        return transcriber.generate_srt_words(self.segments_data)
 
     def save_transcription(self):
         """Save transcription to a text file"""
-        if not self.current_file:
-            return
-
-        # Suggest filename based on input file
-        input_path = Path(self.current_file)
-        default_name = input_path.stem + "_transcription.txt"
-
-        save_path = filedialog.asksaveasfilename(
-            title="Save Transcription",
-            defaultextension=".txt",
-            initialfile=default_name,
-            filetypes=[
-                ("Text files", "*.txt"),
-                ("All files", "*.*")
-            ]
-        )
-
-        if save_path:
-            try:
-                transcription = self.text_area.get(1.0, tk.END).strip()
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write(transcription)
-
-                messagebox.showinfo("Success", f"Transcription saved to:\n{save_path}")
-            except Exception as e:
-                messagebox.showerror("Save Error", f"Failed to save file: {str(e)}")
+        self.save_format("txt", "Save Transcription", "transcription", "Transcription saved to")
 
     def save_srt(self):
         """Save transcription as SRT subtitle file"""
+        self.save_format("srt", "Save SRT Subtitles", "SRT", "SRT subtitles saved to")
+
+    def save_srt_words(self):
+        """Save transcription as SRT subtitle file with word-level timestamps"""
+        self.save_format("srt_words", "Save Word-level SRT Subtitles", "word-level SRT", "Word-level SRT subtitles saved to")
+
+    def save_format(self, name, title, label, success_text):
+        """Ask where to save one format, then export it"""
         if not self.current_file or not self.segments_data:
             return
 
         # Suggest filename based on input file
+        exporter = transcriber.EXPORTERS[name]
         input_path = Path(self.current_file)
-        default_name = input_path.stem  # Don't add extension, defaultextension will handle it
-
         save_path = filedialog.asksaveasfilename(
-            title="Save SRT Subtitles",
-            defaultextension=".srt",
-            initialfile=default_name,
+            title=title,
+            defaultextension=exporter.extension,
+            initialfile=input_path.stem + exporter.suffix,
             filetypes=[
-                ("SRT files", "*.srt"),
+                (exporter.title, "*" + exporter.extension),
                 ("All files", "*.*")
             ]
         )
 
         if save_path:
-            try:
-                srt_content = self.generate_srt()
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write(srt_content)
-
-                messagebox.showinfo("Success", f"SRT subtitles saved to:\n{save_path}")
-            except Exception as e:
-                messagebox.showerror("Save Error", f"Failed to save SRT file: {str(e)}")
+            self.export([(name, save_path)], label, success_text)
 
-    def save_srt_words(self):
-        """Save transcription as SRT subtitle file with word-level timestamps"""
+    def export_all(self):
+        """Write every selected format next to each other in one pass over the transcript"""
         if not self.current_file or not self.segments_data:
             return
+        formats = [name for name, variable in self.export_formats.items() if variable.get()]
+        if not formats:
+            messagebox.showinfo("Export All", "Select at least one format.")
+            return
 
-        # Suggest filename based on input file
         input_path = Path(self.current_file)
-        default_name = input_path.stem + "_words"  # Don't add extension, defaultextension will handle it
-
-        save_path = filedialog.asksaveasfilename(
-            title="Save Word-level SRT Subtitles",
-            defaultextension=".srt",
-            initialfile=default_name,
-            filetypes=[
-                ("SRT files", "*.srt"),
-                ("All files", "*.*")
-            ]
-        )
-
-        if save_path:
+        output_dir = filedialog.askdirectory(title="Export All To", initialdir=str(input_path.parent))
+        if not output_dir:
+            return
+        targets = [(name, os.path.join(output_dir, input_path.stem + transcriber.EXPORTERS[name].suffix))
+                   for name in formats]
+        existing = [Path(path).name for _, path in targets if os.path.exists(path)]
+        if existing and not messagebox.askyesno("Export All", "Replace existing files?\n\n" + "\n".join(existing)):
+            return
+        self.export(targets, ", ".join(formats), "Exported")
+
+    def export(self, targets, label, success_text):
+        """Export (format name, path) targets, aligning words first when a word-level format needs them"""
+        needs_words = transcriber.needs_words(name for name, _ in targets)
+        if not needs_words or word_alignment.has_word_timings(self.segments_data) or self.transcript_source is None:
+            # Without a source to align against, word-level formats fall back to segment timings
+            self.export_in_background(targets, label, success_text)
+        else:
+            self.align_words_then_export(targets, label, success_text)
+
+    def export_in_background(self, targets, label, success_text, segments=None):
+        """Stream (format name, path) targets to disk on a worker thread in one pass, reporting progress in the status bar"""
+        segments = self.segments_data if segments is None else segments
+        info = self.transcript_source["info"] if self.transcript_source is not None else None
+        previous_status = self.status.cget("text")
+
+        def progress(done, total):
+            percent = int(done * 100 / total) if total else 100
+            self.root.after(0, lambda p=percent: self.status.config(text=f"Saving {label}... {p}%", fg="#FF9800"))
+
+        def worker():
             try:
-                srt_content = self.generate_srt_words()
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write(srt_content)
-
-                messagebox.showinfo("Success", f"Word-level SRT subtitles saved to:\n{save_path}")
+                paths = transcriber.write_exports(segments, targets, progress=progress, info=info)
+            except Exception as e:
+                error_msg = str(e)
+                self.root.after(0, lambda: self.status.config(text=previous_status, fg="#666"))
+                self.root.after(0, lambda msg=error_msg: messagebox.showerror("Save Error", f"Failed to save {label} file: {msg}"))
+                return
+            self.root.after(0, lambda: self.status.config(text=previous_status, fg="#4CAF50"))
+            self.root.after(0, lambda: messagebox.showinfo("Success", f"{success_text}:\n" + "\n".join(paths)))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def align_words_then_export(self, targets, label, success_text):
+        """Compute word timings for the finished transcript in the background, then export the targets"""
+        source = self.transcript_source
+        segments = self.segments_data
+        self.stop_event.clear()
+        for button in (self.btn_select, self.btn_start, self.btn_save, self.btn_save_srt, self.btn_save_srt_words,
+                       self.btn_export):
+            button.config(state=tk.DISABLED)
+        self.btn_stop.config(state=tk.NORMAL)  # Stop cancels the alignment
+        self.progress.start(10)
+
+        def progress(done, total):
+            percent = int(done * 100 / total) if total else 100
+            self.root.after(0, lambda p=percent: self.status.config(text=f"Aligning words... {p}%", fg="#FF9800"))
+
+        def worker():
+            aligned, error = None, None
+            try:
+                self.root.after(0, lambda: self.status.config(text="Aligning words...", fg="#FF9800"))
+                model = self.model_cache.get(*source["model_key"], owner=self, **source["model_options"])
+                aligned = self.worker.align_words(
+                    model, source["file"], source["hash"], segments, source["language"],
+                    # A model loaded for parallel chunks can align several batches at once
+                    workers=source["model_options"].get("num_workers", 1),
+                    progress=progress,
+                    owner=self
+                )
+                if aligned is not None:
+                    aligned = SegmentStore(aligned)
+                    if source["complete"]:
+                        # Cache with words so the next word-level export of this file is instant
+                        content_hash, cache_model, lang_code, cache_settings = source["cache_key"]
+                        try:
+                            key = self.result_cache.make_key(content_hash, cache_model, lang_code,
+                                                             **dict(cache_settings, word_timestamps=True))
+                            self.result_cache.put(key, aligned, source["info"],
+                                                  meta={"file": Path(source["file"]).name, "model": source["model_key"][0],
+                                                        "language": source["language"]})
+                        except Exception:
+                            pass  # A full or read-only cache must not fail the export
+            except WorkerStopped:
+                self.root.after(0, self.warm_up_model)  # Stop killed the worker, load the model again
             except Exception as e:
-                messagebox.showerror("Save Error", f"Failed to save SRT file: {str(e)}")
+                error = str(e)
+            self.root.after(0, lambda: self._on_alignment_done(targets, label, success_text, segments, aligned, error))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_alignment_done(self, targets, label, success_text, segments, aligned, error):
+        """Export the aligned transcript, or report why not (main thread)"""
+        self.progress.stop()
+        self.btn_stop.config(state=tk.DISABLED)
+        for button in (self.btn_select, self.btn_start, self.btn_save, self.btn_save_srt, self.btn_save_srt_words,
+                       self.btn_export):
+            button.config(state=tk.NORMAL)
+        if error:
+            self.status.config(text=f"Word alignment failed: {error}", fg="#F44336")
+            messagebox.showerror("Save Error", f"Failed to compute word timings: {error}")
+            return
+        if aligned is None:
+            self.status.config(text="Word alignment stopped", fg="#FF9800")
+            return
+        if self.segments_data is segments:
+            self.segments_data = aligned  # Later word-level exports reuse the timings
+        self.status.config(text="Word timings ready", fg="#4CAF50")
+        self.export_in_background(targets, label, success_text, segments=aligned)
 
 
 def main():
     multiprocessing.freeze_support()  # Required for PyInstaller on macOS
     root = tk.Tk()
     app = WhisperApp(root)
+
+    # Startup timing harness (no-op unless WHISPERUI_STARTUP_TIMING is set)
+    startup_timing.on_complete(lambda: root.after(0, root.destroy))
+    root.after_idle(lambda: startup_timing.mark("window_ready"))
     root.mainloop()
 
 
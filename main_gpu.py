@@ -13,531 +13,106 @@ if sys.stdout is None:
 if sys.stderr is None:
     sys.stderr = open(os.devnull, 'w')
 
+import startup_timing
 import tkinter as tk
-from tkinter import filedialog, scrolledtext, messagebox
-from tkinter import ttk
-from pathlib import Path
 import threading
 import multiprocessing
-import traceback
-import whisper
-import torch
+import backends
+import hardware_probe
+from main import WhisperApp
 
+# whisper and torch are imported lazily on a background thread once the window is up
+startup_timing.mark("imports")
 
-class WhisperApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Whisper Transcription Tool (GPU Edition)")
-        self.root.geometry("1000x600")
-
-        # Model will be loaded lazily
-        self.model = None
-        self.loaded_model_size = None  # Track which model is currently loaded
-        self.model_size = tk.StringVar(value="base")
-        self.language = tk.StringVar(value="Auto")
 
-        # Check if CUDA is available and compatible
-        self.cuda_available = False
-        if torch.cuda.is_available():
-            try:
-                # Try to create a small tensor on GPU to verify it works
-                torch.zeros(1).cuda()
-                self.cuda_available = True
-            except Exception:
-                # GPU exists but not compatible (e.g., compute capability too new)
-                self.cuda_available = False
+class GPUWhisperApp(WhisperApp):
+    """The shared app on openai-whisper, on CUDA when a usable GPU is found"""
 
-        self.device = tk.StringVar(value="cuda" if self.cuda_available else "cpu")
-        self.current_file = None
-        self.segments_data = []  # Store segments with timestamps for SRT export
-        self.stop_event = threading.Event()  # Event to signal transcription stop
+    window_title = "Whisper Transcription Tool (GPU Edition)"
+    edition = "gpu"
+    backend_class = backends.OpenAIWhisperBackend
 
-        self.setup_ui()
+    def __init__(self, root):
+        # Hardware capabilities come from the saved probe, or a fresh one, after the window appears
+        self.capabilities = None
+        self.capabilities_cached = False
+        self.cuda_present = False
+        self.cuda_available = False
+        self.hardware_ready = threading.Event()
+        self.device = tk.StringVar(value="cpu")
 
-    def setup_ui(self):
-        # Main container
-        main_frame = tk.Frame(self.root, padx=20, pady=20)
-        main_frame.pack(fill=tk.BOTH, expand=True)
+        super().__init__(root)
+        self.device.trace_add("write", self.schedule_warm_up)
 
-        # Title
+    def device_display_name(self):
+        """Human readable device for the title"""
+        if not self.hardware_ready.is_set():
+            return "Detecting hardware..."
         if self.cuda_available:
-            device_name = "GPU (CUDA)"
-        elif torch.cuda.is_available():
-            device_name = "CPU (GPU not compatible)"
-        else:
-            device_name = "CPU"
-
-        title_label = tk.Label(
-            main_frame,
-            text=f"Whisper Transcription - {device_name}",
-            font=("Helvetica", 18, "bold")
-        )
-        title_label.pack(pady=(0, 20))
-
-        # Controls frame
-        controls_frame = tk.Frame(main_frame)
-        controls_frame.pack(fill=tk.X, pady=(0, 10))
-
-        # Model selection
-        model_frame = tk.Frame(controls_frame)
-        model_frame.pack(side=tk.LEFT, padx=(0, 10))
-
-        tk.Label(model_frame, text="Model Size:", font=("Helvetica", 11)).pack(side=tk.LEFT, padx=(0, 5))
-        self.model_dropdown = tk.OptionMenu(
-            model_frame,
-            self.model_size,
-            "tiny", "base", "small", "medium", "large-v2", "large-v3"
-        )
-        self.model_dropdown.config(
-            font=("Helvetica", 11),
-            bg="white",
-            fg="black",
-            highlightthickness=1,
-            relief=tk.RAISED,
-            width=12
-        )
-        self.model_dropdown.pack(side=tk.LEFT)
-
-        # Language selection
-        language_frame = tk.Frame(controls_frame)
-        language_frame.pack(side=tk.LEFT, padx=(0, 10))
-
-        tk.Label(language_frame, text="Language:", font=("Helvetica", 11)).pack(side=tk.LEFT, padx=(0, 5))
-        self.language_dropdown = tk.OptionMenu(
-            language_frame,
-            self.language,
-            "Auto",
-            "English", "Spanish", "French", "German", "Italian", "Portuguese",
-            "Dutch", "Russian", "Chinese", "Japanese", "Korean",
-            "Arabic", "Hindi", "Turkish", "Polish", "Ukrainian",
-            "Swedish", "Danish", "Norwegian", "Finnish"
-        )
-        self.language_dropdown.config(
-            font=("Helvetica", 11),
-            bg="white",
-            fg="black",
-            highlightthickness=1,
-            relief=tk.RAISED,
-            width=12
-        )
-        self.language_dropdown.pack(side=tk.LEFT)
-
-        # Buttons frame (to organize on next row)
-        buttons_frame = tk.Frame(main_frame)
-        buttons_frame.pack(pady=(10, 10))
-
-        # Select file button
-        self.btn_select = tk.Button(
-            buttons_frame,
-            text="Select File",
-            command=self.select_file,
-            bg="#E8F5E9",
-            fg="#2E7D32",
-            font=("Helvetica", 13, "bold"),
-            padx=30,
-            pady=12,
-            relief=tk.RAISED,
-            bd=2,
-            activebackground="#C8E6C9",
-            activeforeground="#1B5E20",
-            highlightthickness=0
-        )
-        self.btn_select.pack(side=tk.LEFT, padx=5)
-
-        # Start button
-        self.btn_start = tk.Button(
-            buttons_frame,
-            text="Start Transcription",
-            command=self.start_transcription,
-            bg="#E3F2FD",
-            fg="#1565C0",
-            font=("Helvetica", 13, "bold"),
-            padx=30,
-            pady=12,
-            relief=tk.RAISED,
-            bd=2,
-            state=tk.DISABLED,
-            disabledforeground="#BBDEFB",
-            activebackground="#BBDEFB",
-            activeforeground="#0D47A1",
-            highlightthickness=0
-        )
-        self.btn_start.pack(side=tk.LEFT, padx=5)
-
-        # Stop button
-        self.btn_stop = tk.Button(
-            buttons_frame,
-            text="Stop",
-            command=self.stop_transcription,
-            bg="#FFEBEE",
-            fg="#C62828",
-            font=("Helvetica", 13, "bold"),
-            padx=30,
-            pady=12,
-            relief=tk.RAISED,
-            bd=2,
-            state=tk.DISABLED,
-            disabledforeground="#FFCDD2",
-            activebackground="#FFCDD2",
-            activeforeground="#B71C1C",
-            highlightthickness=0
-        )
-        self.btn_stop.pack(side=tk.LEFT, padx=5)
-
-        # Save button
-        self.btn_save = tk.Button(
-            buttons_frame,
-            text="Save Text",
-            command=self.save_transcription,
-            bg="#FFF3E0",
-            fg="#E65100",
-            font=("Helvetica", 13, "bold"),
-            padx=20,
-            pady=12,
-            relief=tk.RAISED,
-            bd=2,
-            state=tk.DISABLED,
-            disabledforeground="#FFCCBC",
-            activebackground="#FFE0B2",
-            activeforeground="#BF360C",
-            highlightthickness=0
-        )
-        self.btn_save.pack(side=tk.LEFT, padx=5)
-
-        # Save SRT button
-        self.btn_save_srt = tk.Button(
-            buttons_frame,
-            text="Save SRT",
-            command=self.save_srt,
-            bg="#F3E5F5",
-            fg="#6A1B9A",
-            font=("Helvetica", 13, "bold"),
-            padx=20,
-            pady=12,
-            relief=tk.RAISED,
-            bd=2,
-            state=tk.DISABLED,
-            disabledforeground="#CE93D8",
-            activebackground="#E1BEE7",
-            activeforeground="#4A148C",
-            highlightthickness=0
-        )
-        self.btn_save_srt.pack(side=tk.LEFT, padx=5)
-
-        # Status label
-        self.status = tk.Label(
-            main_frame,
-            text="Ready. Select a file to begin transcription.",
-            fg="#666",
-            font=("Helvetica", 10)
-        )
-        self.status.pack(pady=(0, 10))
-
-        # Progress bar
-        self.progress = ttk.Progressbar(
-            main_frame,
-            mode='indeterminate',
-            length=760
-        )
-        self.progress.pack(pady=(0, 10))
-
-        # Text area for transcription
-        text_frame = tk.Frame(main_frame)
-        text_frame.pack(fill=tk.BOTH, expand=True)
-
-        tk.Label(text_frame, text="Transcription:", font=("Helvetica", 12, "bold")).pack(anchor=tk.W)
-
-        self.text_area = scrolledtext.ScrolledText(
-            text_frame,
-            height=20,
-            width=80,
-            font=("Courier", 11),
-            wrap=tk.WORD
-        )
-        self.text_area.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
-
-    def select_file(self):
-        file_path = filedialog.askopenfilename(
-            title="Select Audio or Video File",
-            filetypes=[
-                ("Audio/Video files", "*.mp3 *.mp4 *.wav *.m4a *.avi *.mov *.flac *.ogg *.wma *.aac"),
-                ("Audio files", "*.mp3 *.wav *.m4a *.flac *.ogg *.wma *.aac"),
-                ("Video files", "*.mp4 *.avi *.mov *.mkv"),
-                ("All files", "*.*")
-            ]
-        )
-
-        if file_path:
-            # Reset everything when a new file is selected
-            self.current_file = file_path
-            self.segments_data = []
-
-            # Clear text area
-            self.text_area.delete(1.0, tk.END)
-
-            # Reset button states
-            self.btn_start.config(state=tk.NORMAL)
-            self.btn_stop.config(state=tk.DISABLED)
-            self.btn_save.config(state=tk.DISABLED)
-            self.btn_save_srt.config(state=tk.DISABLED)
-
-            # Update status
-            filename = Path(file_path).name
-            self.status.config(text=f"Ready: {filename}", fg="#1565C0")
-
-    def start_transcription(self):
-        """Start transcription when user clicks Start button"""
-        if self.current_file:
-            # Clear stop event
-            self.stop_event.clear()
-
-            # Start transcription in separate thread
-            threading.Thread(target=self.transcribe, args=(self.current_file,), daemon=True).start()
-
-    def stop_transcription(self):
-        """Stop ongoing transcription"""
-        self.stop_event.set()
-        self.status.config(text="Stopping transcription...", fg="#FF9800")
+            return f"GPU (CUDA): {self.capabilities['gpu_name']}" if self.capabilities.get("gpu_name") else "GPU (CUDA)"
+        if self.cuda_present:
+            return "CPU (GPU not compatible)"
+        return "CPU"
+
+    def title_text(self):
+        # Updated once the hardware probe finishes
+        return f"Whisper Transcription - {self.device_display_name()}"
+
+    def setup_hardware_controls(self, controls_frame, options_frame):
+        """The device is picked by the hardware probe, there are no CPU tuning controls"""
+
+    def start_background_setup(self):
+        """Get the hardware capabilities off the UI thread (probed in a child process only when they changed)"""
+        threading.Thread(target=self._probe_hardware, daemon=True).start()
+
+    def _probe_hardware(self):
+        capabilities, cached = hardware_probe.capabilities()
+        startup_timing.mark("hardware_ready")
+        self.root.after(0, lambda: self._on_hardware_probed(capabilities, cached))
+
+    def _on_hardware_probed(self, capabilities, cached):
+        """Apply the probe result to the UI and start the warm-up (main thread)"""
+        self.capabilities = capabilities
+        self.capabilities_cached = cached
+        self.cuda_present = capabilities["cuda_present"]
+        self.cuda_available = capabilities["cuda_usable"]
+        self.backend.fp16 = capabilities["fp16"]
+        self.worker.settings["fp16"] = capabilities["fp16"]  # Applied when the worker starts
+        self.hardware_ready.set()
+        self.title_label.config(text=self.title_text())
+        if not self.transcribing and not self.current_file:
+            self.status.config(text=f"{hardware_probe.describe(capabilities)}. Select a file to begin transcription.", fg="#666")
+        self.device.set("cuda" if self.cuda_available else "cpu")
+        self.warm_up_model()  # The inference worker imports whisper and torch, the app never does
+
+    def model_key(self):
+        """Cache key (size, device, compute_type) for the current selection"""
+        device = self.device.get()
+        return (self.model_size.get(), device, "float16" if device == "cuda" and self.backend.fp16 else "float32")
+
+    def model_options(self):
+        return {}
 
     def load_model(self):
-        """Load the Whisper model (lazy loading)"""
-        requested_model = self.model_size.get()
-
-        # Only reload if model hasn't been loaded or if a different model is requested
-        if self.model is None or self.loaded_model_size != requested_model:
-            try:
-                self.root.after(0, lambda name=requested_model: self.status.config(text=f"Loading {name} model...", fg="#FF9800"))
-                self.root.after(0, lambda: self.root.update())
-
-                # Load model with GPU if available
-                # Set download_root to user's home directory to avoid permission issues
-                device = self.device.get()
-                download_root = os.path.expanduser("~/.cache/whisper")
-                os.makedirs(download_root, exist_ok=True)
-                self.model = whisper.load_model(requested_model, device=device, download_root=download_root)
-
-                # Track which model is loaded
-                self.loaded_model_size = requested_model
-
-                return True
-            except Exception as e:
-                error_msg = str(e)
-                self.root.after(0, lambda msg=error_msg: messagebox.showerror("Model Error", f"Failed to load model: {msg}"))
-                return False
-        return True
-
-    def get_language_code(self, language_name):
-        """Convert language name to ISO code for Whisper"""
-        language_map = {
-            "Auto": None,
-            "English": "en",
-            "Spanish": "es",
-            "French": "fr",
-            "German": "de",
-            "Italian": "it",
-            "Portuguese": "pt",
-            "Dutch": "nl",
-            "Russian": "ru",
-            "Chinese": "zh",
-            "Japanese": "ja",
-            "Korean": "ko",
-            "Arabic": "ar",
-            "Hindi": "hi",
-            "Turkish": "tr",
-            "Polish": "pl",
-            "Ukrainian": "uk",
-            "Swedish": "sv",
-            "Danish": "da",
-            "Norwegian": "no",
-            "Finnish": "fi"
-        }
-        return language_map.get(language_name, None)
-
-    def transcribe(self, file_path):
-        """Transcribe audio/video file"""
-        try:
-            # Disable buttons during transcription (on main thread)
-            self.root.after(0, lambda: self.btn_select.config(state=tk.DISABLED))
-            self.root.after(0, lambda: self.btn_start.config(state=tk.DISABLED))
-            self.root.after(0, lambda: self.btn_stop.config(state=tk.NORMAL))  # Enable stop button
-            self.root.after(0, lambda: self.btn_save.config(state=tk.DISABLED))
-            self.root.after(0, lambda: self.btn_save_srt.config(state=tk.DISABLED))
-
-            # Clear previous transcription
-            self.root.after(0, lambda: self.text_area.delete(1.0, tk.END))
-
-            # Clear previous segments data
-            self.segments_data = []
-
-            # Start progress bar
-            self.root.after(0, lambda: self.progress.start(10))
-
-            filename = Path(file_path).name
-            self.root.after(0, lambda fn=filename: self.status.config(text=f"Transcribing: {fn}...", fg="#FF9800"))
-
-            # Load model if needed
-            if not self.load_model():
-                return
-
-            # Get selected language
-            selected_lang = self.language.get()
-            lang_code = self.get_language_code(selected_lang)
-
-            # Transcribe
-            result = self.model.transcribe(
-                file_path,
-                language=lang_code,
-                verbose=False
-            )
-
-            # Process segments
-            detected_lang = result.get("language", "unknown")
-            for segment in result["segments"]:
-                # Check if stop was requested
-                if self.stop_event.is_set():
-                    self.root.after(0, lambda: self.status.config(text="Transcription stopped by user", fg="#FF9800"))
-                    return  # Exit transcription early
-
-                # Store segment data for SRT export
-                self.segments_data.append(segment)
-
-                # Format: [00:00:00] Text
-                start_time = self.format_timestamp(segment["start"])
-                line = f"[{start_time}] {segment['text'].strip()}\n"
-
-                # Insert text at the end and auto-scroll
-                self.root.after(0, lambda text=line: self._append_text(text))
-
-            # Get detected language from info
-            if lang_code is None:
-                status_text = f"✓ Transcription complete! Detected language: {detected_lang}"
-            else:
-                status_text = f"✓ Transcription complete! Language: {selected_lang}"
-
-            self.root.after(0, lambda st=status_text: self.status.config(text=st, fg="#4CAF50"))
-
-            # Enable save buttons (on main thread)
-            self.root.after(0, lambda: self.btn_save.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.btn_save_srt.config(state=tk.NORMAL))
-
-        except Exception as e:
-            error_msg = str(e)
-            self.root.after(0, lambda msg=error_msg: messagebox.showerror("Transcription Error", f"An error occurred: {msg}"))
-            self.root.after(0, lambda msg=error_msg: self.status.config(text=f"Error: {msg}", fg="#F44336"))
-
-        finally:
-            # Stop progress bar and re-enable buttons (on main thread)
-            self.root.after(0, lambda: self.progress.stop())
-            self.root.after(0, lambda: self.btn_stop.config(state=tk.DISABLED))  # Disable stop button
-            self.root.after(0, lambda: self.btn_select.config(state=tk.NORMAL))
-            self.root.after(0, lambda: self.btn_start.config(state=tk.NORMAL))
-
-            # Enable save buttons if we have transcribed segments
-            if self.segments_data:
-                self.root.after(0, lambda: self.btn_save.config(state=tk.NORMAL))
-                self.root.after(0, lambda: self.btn_save_srt.config(state=tk.NORMAL))
-
-    def _append_text(self, text):
-        """Append text to text area and auto-scroll (must be called on main thread)"""
-        self.text_area.insert(tk.END, text)
-        self.text_area.see(tk.END)  # Auto-scroll to bottom
-
-    def format_timestamp(self, seconds):
-        """Convert seconds to HH:MM:SS format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-
-    def format_srt_timestamp(self, seconds):
-        """Convert seconds to SRT timestamp format (HH:MM:SS,mmm)"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        milliseconds = int((seconds - int(seconds)) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
-
-    def generate_srt(self):
-        """Generate SRT subtitle format from segments"""
-        if not self.segments_data:
-            return ""
-
-        srt_content = []
-        for i, segment in enumerate(self.segments_data, start=1):
-            start_time = self.format_srt_timestamp(segment["start"])
-            end_time = self.format_srt_timestamp(segment["end"])
-            text = segment["text"].strip()
-
-            srt_content.append(f"{i}")
-            srt_content.append(f"{start_time} --> {end_time}")
-            srt_content.append(text)
-            srt_content.append("")  # Empty line between entries
-
-        return "\n".join(srt_content)
-
-    def save_transcription(self):
-        """Save transcription to a text file"""
-        if not self.current_file:
-            return
-
-        # Suggest filename based on input file
-        input_path = Path(self.current_file)
-        default_name = input_path.stem + "_transcription.txt"
-
-        save_path = filedialog.asksaveasfilename(
-            title="Save Transcription",
-            defaultextension=".txt",
-            initialfile=default_name,
-            filetypes=[
-                ("Text files", "*.txt"),
-                ("All files", "*.*")
-            ]
-        )
-
-        if save_path:
-            try:
-                transcription = self.text_area.get(1.0, tk.END).strip()
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write(transcription)
-
-                messagebox.showinfo("Success", f"Transcription saved to:\n{save_path}")
-            except Exception as e:
-                messagebox.showerror("Save Error", f"Failed to save file: {str(e)}")
-
-    def save_srt(self):
-        """Save transcription as SRT subtitle file"""
-        if not self.current_file or not self.segments_data:
-            return
-
-        # Suggest filename based on input file
-        input_path = Path(self.current_file)
-        default_name = input_path.stem  # Don't add extension, defaultextension will handle it
-
-        save_path = filedialog.asksaveasfilename(
-            title="Save SRT Subtitles",
-            defaultextension=".srt",
-            initialfile=default_name,
-            filetypes=[
-                ("SRT files", "*.srt"),
-                ("All files", "*.*")
-            ]
-        )
-
-        if save_path:
-            try:
-                srt_content = self.generate_srt()
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write(srt_content)
-
-                messagebox.showinfo("Success", f"SRT subtitles saved to:\n{save_path}")
-            except Exception as e:
-                messagebox.showerror("Save Error", f"Failed to save SRT file: {str(e)}")
+        """Load the Whisper model through the LRU model cache"""
+        # Load model with GPU if available (wait for the hardware probe first)
+        self.hardware_ready.wait()
+        if super().load_model():
+            return True
+        if self.capabilities_cached and self.device.get() == "cuda":
+            # The saved probe may no longer hold (e.g. the GPU was removed), probe again next launch
+            hardware_probe.forget()
+        return False
 
 
 def main():
     multiprocessing.freeze_support()  # Required for PyInstaller
     root = tk.Tk()
-    app = WhisperApp(root)
+    app = GPUWhisperApp(root)
+
+    # Startup timing harness (no-op unless WHISPERUI_STARTUP_TIMING is set)
+    startup_timing.on_complete(lambda: root.after(0, root.destroy))
+    root.after_idle(lambda: startup_timing.mark("window_ready"))
     root.mainloop()
 
 
@@ -0,0 +1,198 @@
+"""
+WhisperUI model cache
+Keeps several loaded models resident, keyed by (size, device, compute_type),
+and evicts the least recently used one when the RAM budget is exceeded
+"""
+
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+# Default budget, override with WHISPERUI_MODEL_CACHE_MB
+DEFAULT_BUDGET_MB = 4096
+
+# Approximate parameter counts (millions) used to estimate resident size
+MODEL_PARAMS_M = {
+    "tiny": 39,
+    "base": 74,
+    "small": 244,
+    "medium": 769,
+    "large-v1": 1550,
+    "large-v2": 1550,
+    "large-v3": 1550,
+}
+
+# Approximate bytes per weight for each compute type
+BYTES_PER_PARAM = {
+    "int8": 1,
+    "int8_float32": 1,
+    "int8_float16": 1,
+    "int8_bfloat16": 1,
+    "int16": 2,
+    "float16": 2,
+    "bfloat16": 2,
+    "float32": 4,
+}
+
+# Runtime overhead on top of the weights (buffers, tokenizer, allocator slack)
+OVERHEAD_MB = 100
+
+
+def estimate_model_mb(model_size, compute_type="int8"):
+    """Estimate the resident size of a model in MB"""
+    params_m = MODEL_PARAMS_M.get(model_size, MODEL_PARAMS_M["large-v3"])
+    bytes_per_param = BYTES_PER_PARAM.get(compute_type, 4)
+    return params_m * bytes_per_param + OVERHEAD_MB
+
+
+def budget_from_env():
+    """Read the cache budget from WHISPERUI_MODEL_CACHE_MB"""
+    try:
+        return int(os.environ.get("WHISPERUI_MODEL_CACHE_MB", DEFAULT_BUDGET_MB))
+    except ValueError:
+        return DEFAULT_BUDGET_MB
+
+
+class ModelCache:
+    """Thread-safe LRU cache of loaded models under a RAM budget"""
+
+    def __init__(self, loader, budget_mb=None):
+        self.loader = loader  # loader(model_size, device=..., compute_type=..., **kwargs)
+        self.budget_mb = budget_from_env() if budget_mb is None else budget_mb
+        self._models = OrderedDict()  # key -> (model, estimated_mb)
+        self._loading = {}  # key -> (threading.Event, estimated_mb) for in-flight loads
+        self._lock = threading.RLock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_times = {}  # key -> seconds of the most recent load
+        self.total_load_time = 0.0
+        self.last_load = None  # (key, seconds)
+
+    @staticmethod
+    def make_key(model_size, device="cpu", compute_type="int8", **load_kwargs):
+        # Extra loader options (threads, workers) get their own entry
+        if load_kwargs:
+            return (model_size, device, compute_type, tuple(sorted(load_kwargs.items())))
+        return (model_size, device, compute_type)
+
+    def contains(self, model_size, device="cpu", compute_type="int8", **load_kwargs):
+        """Check whether a model is already resident"""
+        with self._lock:
+            return self.make_key(model_size, device, compute_type, **load_kwargs) in self._models
+
+    def is_loading(self, model_size, device="cpu", compute_type="int8", **load_kwargs):
+        """Check whether a model is currently being loaded by another thread"""
+        with self._lock:
+            return self.make_key(model_size, device, compute_type, **load_kwargs) in self._loading
+
+    def get(self, model_size, device="cpu", compute_type="int8", **load_kwargs):
+        """Return a cached model, loading it (and evicting others) on a miss
+
+        If another thread is already loading the same model, wait for that
+        load instead of starting a second one.
+        """
+        key = self.make_key(model_size, device, compute_type, **load_kwargs)
+        while True:
+            with self._lock:
+                if key in self._models:
+                    self.hits += 1
+                    self._models.move_to_end(key)
+                    return self._models[key][0]
+
+                pending = self._loading.get(key)
+                if pending is None:
+                    self.misses += 1
+                    size_mb = estimate_model_mb(model_size, compute_type)
+                    # Make room before loading so peak memory stays within budget
+                    self._evict_for(size_mb)
+                    done = threading.Event()
+                    self._loading[key] = (done, size_mb)
+                    break
+
+            # Someone else is loading this model, wait and look again
+            pending[0].wait()
+
+        try:
+            started = time.perf_counter()
+            model = self.loader(model_size, device=device, compute_type=compute_type, **load_kwargs)
+            seconds = time.perf_counter() - started
+        except Exception:
+            with self._lock:
+                del self._loading[key]
+            done.set()
+            raise
+
+        with self._lock:
+            self.load_times[key] = seconds
+            self.total_load_time += seconds
+            self.last_load = (key, seconds)
+            self._models[key] = (model, size_mb)
+            del self._loading[key]
+        done.set()
+        return model
+
+    def _evict_for(self, size_mb):
+        """Evict least recently used models until size_mb fits in the budget"""
+        loading_mb = sum(pending_mb for _, pending_mb in self._loading.values())
+        while self._models and self.resident_mb() + loading_mb + size_mb > self.budget_mb:
+            self._models.popitem(last=False)
+            self.evictions += 1
+        gc.collect()  # Release the evicted model's weights promptly
+
+    def evict(self, model_size, device="cpu", compute_type="int8", **load_kwargs):
+        """Drop a single model from the cache"""
+        with self._lock:
+            if self._models.pop(self.make_key(model_size, device, compute_type, **load_kwargs), None) is not None:
+                self.evictions += 1
+                gc.collect()
+
+    def clear(self):
+        """Drop every cached model"""
+        with self._lock:
+            self.evictions += len(self._models)
+            self._models.clear()
+            gc.collect()
+
+    def resident_mb(self):
+        """Estimated MB held by resident models"""
+        with self._lock:
+            return sum(size_mb for _, size_mb in self._models.values())
+
+    def stats(self):
+        """Snapshot of cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "resident": [self._key_name(key) for key in self._models],
+                "resident_mb": self.resident_mb(),
+                "budget_mb": self.budget_mb,
+                "load_times": {self._key_name(key): seconds for key, seconds in self.load_times.items()},
+                "total_load_time": self.total_load_time,
+            }
+
+    @staticmethod
+    def _key_name(key):
+        name = "/".join(key[:3])
+        if len(key) > 3:
+            name += "/" + ",".join(f"{option}={value}" for option, value in key[3])
+        return name
+
+    def summary(self):
+        """One-line summary for the status bar"""
+        stats = self.stats()
+        summary = (f"cache {stats['hits']} hits / {stats['misses']} misses, "
+                   f"{len(stats['resident'])} resident ~{stats['resident_mb']} of {stats['budget_mb']} MB")
+        if self.last_load:
+            key, seconds = self.last_load
+            summary += f", last load {key[0]} {seconds:.1f}s"
+        return summary
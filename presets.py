@@ -0,0 +1,93 @@
+"""
+WhisperUI decoding presets
+Named speed/accuracy trade-offs shared by the CPU (faster-whisper) and GPU
+(openai-whisper) editions, with the real-time factor each one achieved on this
+machine taken from the run metrics log
+"""
+
+import statistics
+
+import run_metrics
+
+
+# Temperatures retried in turn when a window's output looks like a hallucination or loop
+TEMPERATURE_FALLBACK = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+PRESETS = {
+    "Fast": {
+        "description": "greedy decoding, no temperature fallback",
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": (0.0,),
+    },
+    "Balanced": {
+        "description": "beam 3 with temperature fallback",
+        "beam_size": 3,
+        "best_of": 3,
+        "temperature": TEMPERATURE_FALLBACK,
+    },
+    "Accurate": {
+        "description": "beam 5, best of 5 with temperature fallback",
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": TEMPERATURE_FALLBACK,
+    },
+}
+PRESET_NAMES = tuple(PRESETS)
+
+# The settings every transcription used before presets existed
+DEFAULT_PRESET = "Accurate"
+
+
+def get_preset(name):
+    """Settings of a preset, the default for unknown names"""
+    return PRESETS.get(name, PRESETS[DEFAULT_PRESET])
+
+
+def faster_whisper_options(name):
+    """Keyword arguments for transcriber.transcribe / WhisperModel.transcribe"""
+    preset = get_preset(name)
+    return {
+        "beam_size": preset["beam_size"],
+        "best_of": preset["best_of"],
+        "temperature": list(preset["temperature"]),
+    }
+
+
+def openai_whisper_options(name):
+    """Keyword arguments for whisper.Whisper.transcribe"""
+    preset = get_preset(name)
+    return {
+        # openai-whisper decodes greedily when beam_size is None
+        "beam_size": preset["beam_size"] if preset["beam_size"] > 1 else None,
+        "best_of": preset["best_of"],
+        "temperature": preset["temperature"],
+    }
+
+
+def cache_tag(name):
+    """Result cache qualifier: None for the default preset so earlier cached results still match"""
+    name = name if name in PRESETS else DEFAULT_PRESET
+    return None if name == DEFAULT_PRESET else name
+
+
+def measured_rtf(edition, model, records=None):
+    """Median real-time factor and run count per preset from completed runs in the log
+
+    Runs logged before presets existed count as the default preset.
+    """
+    rates = {}
+    for record in run_metrics.read_log() if records is None else records:
+        if (record.get("outcome") != "done" or record.get("edition") != edition
+                or record.get("model") != model or not record.get("realtime_factor")):
+            continue
+        rates.setdefault(record.get("preset") or DEFAULT_PRESET, []).append(record["realtime_factor"])
+    return {name: (statistics.median(values), len(values)) for name, values in rates.items()}
+
+
+def describe_rtf(measured, name):
+    """Short label such as '12.3x real time (4 runs)'"""
+    if name not in measured:
+        return "not measured yet"
+    rtf, runs = measured[name]
+    return f"{rtf:.1f}x real time ({runs} run{'s' if runs != 1 else ''})"
@@ -0,0 +1,376 @@
+"""
+WhisperUI queue panel
+Window for transcribing many files unattended: files are added and reordered
+in a list, run back to back on the app's warm model and their outputs are
+written next to each file (or to a chosen folder)
+"""
+
+import os
+import time
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from tkinter import ttk
+
+import transcriber
+import chunked
+import result_cache
+import presets
+import batch_transcribe
+from job_queue import JobScheduler, QUEUED, RUNNING, DONE, FAILED
+from segment_store import SegmentStore
+from inference_worker import WorkerStopped
+
+
+# Minimum time between list refreshes while a job reports progress
+REFRESH_MS = 250
+
+
+def format_duration(seconds):
+    """Short human readable duration: 42s, 3m 05s, 1h 02m"""
+    if seconds is None:
+        return "…"
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+class QueuePanel:
+    """Toplevel window listing queued files, driven by a JobScheduler"""
+
+    def __init__(self, app):
+        self.app = app
+        self.root = app.root
+        # The worker serves one request at a time, so a file decoded ahead would only wait behind the current one
+        self.scheduler = JobScheduler(self.run_job, on_change=self._on_change, decode=self.decode_job, prefetch=0)
+        self.settings = None  # Model and output settings captured when the queue starts
+
+        self.shortest_first = tk.BooleanVar(value=False)
+        self.output_dir = None  # None writes outputs next to each input file
+        self.formats = {name: tk.BooleanVar(value=name in ("txt", "srt")) for name in transcriber.EXPORTERS}
+        self._refresh_after_id = None
+
+        self.window = tk.Toplevel(self.root)
+        self.window.title("Transcription Queue")
+        self.window.geometry("760x420")
+        # Closing only hides the window, the queue keeps running
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+        self.setup_ui()
+        self.refresh()
+
+    def show(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    @property
+    def running(self):
+        return self.scheduler.running
+
+    def setup_ui(self):
+        frame = tk.Frame(self.window, padx=10, pady=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        # File list
+        list_frame = tk.Frame(frame)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+
+        columns = ("file", "duration", "status", "speed")
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="extended")
+        for column, title, width, anchor in (
+            ("file", "File", 360, tk.W),
+            ("duration", "Duration", 90, tk.E),
+            ("status", "Status", 160, tk.W),
+            ("speed", "Speed", 80, tk.E),
+        ):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor=anchor, stretch=(column == "file"))
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # List editing
+        edit_frame = tk.Frame(frame)
+        edit_frame.pack(fill=tk.X, pady=(8, 0))
+        for text, command in (
+            ("Add Files...", self.add_files),
+            ("Add Folder...", self.add_folder),
+            ("Remove", self.remove_selected),
+            ("Move Up", lambda: self.move_selected(-1)),
+            ("Move Down", lambda: self.move_selected(1)),
+            ("Retry Failed", self.retry_selected),
+            ("Clear Finished", self.scheduler.clear_finished),
+        ):
+            tk.Button(edit_frame, text=text, command=command, font=("Helvetica", 11)).pack(side=tk.LEFT, padx=(0, 5))
+
+        # Scheduling and outputs
+        options_frame = tk.Frame(frame)
+        options_frame.pack(fill=tk.X, pady=(8, 0))
+        tk.Checkbutton(
+            options_frame,
+            text="Shortest first",
+            variable=self.shortest_first,
+            command=lambda: setattr(self.scheduler, "shortest_first", self.shortest_first.get()),
+            font=("Helvetica", 11)
+        ).pack(side=tk.LEFT, padx=(0, 10))
+
+        tk.Label(options_frame, text="Outputs:", font=("Helvetica", 11)).pack(side=tk.LEFT)
+        for name, variable in self.formats.items():
+            tk.Checkbutton(options_frame, text=name, variable=variable, font=("Helvetica", 11)).pack(side=tk.LEFT)
+
+        self.output_label = tk.Label(options_frame, text="", fg="#666", font=("Helvetica", 10))
+        self.output_label.pack(side=tk.RIGHT)
+        tk.Button(options_frame, text="Output Folder...", command=self.choose_output_dir,
+                  font=("Helvetica", 11)).pack(side=tk.RIGHT, padx=(0, 5))
+        self._update_output_label()
+
+        # Run controls and totals
+        run_frame = tk.Frame(frame)
+        run_frame.pack(fill=tk.X, pady=(8, 0))
+        self.btn_start = tk.Button(run_frame, text="Start Queue", command=self.start,
+                                   fg="#1565C0", font=("Helvetica", 12, "bold"), padx=15)
+        self.btn_start.pack(side=tk.LEFT, padx=(0, 5))
+        self.btn_stop = tk.Button(run_frame, text="Stop", command=self.stop, state=tk.DISABLED,
+                                  fg="#C62828", font=("Helvetica", 12, "bold"), padx=15)
+        self.btn_stop.pack(side=tk.LEFT, padx=(0, 10))
+        self.summary_label = tk.Label(run_frame, text="", fg="#666", font=("Helvetica", 10))
+        self.summary_label.pack(side=tk.LEFT)
+
+    def add_files(self):
+        paths = filedialog.askopenfilenames(
+            parent=self.window,
+            title="Add Audio or Video Files",
+            filetypes=[
+                ("Audio/Video files", " ".join(f"*{ext}" for ext in transcriber.MEDIA_EXTENSIONS)),
+                ("All files", "*.*")
+            ]
+        )
+        if paths:
+            self.scheduler.add(paths)
+
+    def add_folder(self):
+        directory = filedialog.askdirectory(parent=self.window, title="Add Folder")
+        if directory:
+            files = batch_transcribe.collect_files([directory], recursive=True)
+            if files:
+                self.scheduler.add(files)
+            else:
+                messagebox.showinfo("Add Folder", "No audio or video files found in that folder.", parent=self.window)
+
+    def selected_ids(self):
+        return [int(item) for item in self.tree.selection()]
+
+    def remove_selected(self):
+        self.scheduler.remove(self.selected_ids())
+
+    def move_selected(self, delta):
+        ids = self.selected_ids()
+        # Move the block in an order that keeps the selected jobs from swapping with each other
+        for job_id in (reversed(ids) if delta > 0 else ids):
+            self.scheduler.move(job_id, delta)
+
+    def retry_selected(self):
+        ids = self.selected_ids() or [job.id for job in self.scheduler.jobs()]
+        self.scheduler.retry(set(ids))
+
+    def choose_output_dir(self):
+        directory = filedialog.askdirectory(parent=self.window, title="Output Folder")
+        # Cancelling the dialog switches back to writing next to each file
+        self.output_dir = directory or None
+        self._update_output_label()
+
+    def _update_output_label(self):
+        self.output_label.config(text=f"→ {self.output_dir}" if self.output_dir else "→ next to each file")
+
+    def start(self):
+        """Capture the current settings and start working through the queue (main thread)"""
+        if self.app.transcribing or self.app.calibrating:
+            messagebox.showinfo("Queue", "Wait for the current transcription to finish first.", parent=self.window)
+            return
+        formats = tuple(name for name, variable in self.formats.items() if variable.get())
+        if not formats:
+            messagebox.showinfo("Queue", "Select at least one output format.", parent=self.window)
+            return
+
+        self.settings = {
+            "model_key": self.app.model_key(),
+            "model_options": self.app.model_options(),
+            "parallel": self.app.parallel_chunks.get() and self.app.backend.supports_parallel_chunks,
+            "preset": self.app.preset.get(),
+            "language": transcriber.get_language_code(self.app.language.get()),
+            "formats": formats,
+            "output_dir": self.output_dir,
+        }
+        self.scheduler.shortest_first = self.shortest_first.get()
+        if self.scheduler.start():
+            self.refresh()
+
+    def stop(self):
+        self.scheduler.stop()
+        self.app.worker.cancel(self)  # Ends the current file's decode right away, it is requeued
+        self.app.schedule_warm_up()  # Then load the model into a fresh worker
+        self.btn_stop.config(state=tk.DISABLED)
+
+    def cache_settings(self):
+        """Result cache settings for the captured preset and formats"""
+        settings = self.settings
+        return {
+            "beam_size": presets.get_preset(settings["preset"])["beam_size"],
+            # Word timings are only worth their cost when a word-level format is written
+            "word_timestamps": transcriber.needs_words(settings["formats"]),
+            "decoding": presets.cache_tag(settings["preset"]),
+        }
+
+    def decode_job(self, job):
+        """Decode a job's audio in the worker, which keeps it for the transcription (decode thread)
+
+        Skipped when a cached transcript exists. Returns None either way,
+        the audio stays in the worker.
+        """
+        settings = self.settings
+        content_hash = result_cache.file_content_hash(job.path)
+        cache_model = self.app.backend.cache_model_name(settings["model_key"][0])
+        if self.app.result_cache.find(content_hash, cache_model, settings["language"],
+                                      **self.cache_settings()) is not None:
+            return None
+        self.app.worker.prepare_audio(job.path, content_hash, owner=self)
+        return None
+
+    def run_job(self, job, audio, stop_event):
+        """Transcribe one queued file and write its outputs (scheduler thread)"""
+        settings = self.settings
+        model_size = settings["model_key"][0]
+        cache_model = self.app.backend.cache_model_name(model_size)
+        lang_code = settings["language"]
+        cache_settings = self.cache_settings()
+        decode_options = dict(self.app.backend.decoding_options(settings["preset"]),
+                              word_timestamps=cache_settings["word_timestamps"])
+        output_dir = settings["output_dir"]
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        output_base = batch_transcribe.output_base_for(job.path, output_dir)
+
+        # Reuse a cached transcript of the same audio with the same settings
+        content_hash = result_cache.file_content_hash(job.path)
+        cached = self.app.result_cache.find(content_hash, cache_model, lang_code, **cache_settings)
+        if cached is not None:
+            segments, info, _ = cached
+            job.cached = True
+            job.duration = job.duration or info.duration
+            self._add_to_library(segments, info, content_hash, job,
+                                 self.app.result_cache.make_key(content_hash, cache_model, lang_code, **cache_settings))
+            return transcriber.write_outputs(segments, output_base, settings["formats"], info=info)
+
+        # The same worker and model the main window uses, so the warm model is shared
+        try:
+            model = self.app.model_cache.get(*settings["model_key"], owner=self, **settings["model_options"])
+            segments, info = self.app.worker.transcribe(
+                model, job.path, content_hash,
+                workers=chunked.default_workers() if settings["parallel"] else 1,
+                owner=self,
+                language=lang_code,
+                **decode_options
+            )
+            job.duration = job.duration or info.duration
+
+            store = SegmentStore()
+            try:
+                for segment in segments:
+                    if stop_event.is_set():
+                        return None
+                    store.append(segment)
+                    if info.duration:
+                        progress = min(1.0, segment.end / info.duration)
+                        # Notify only when the shown percentage moves, not once per segment
+                        changed = int(progress * 100) != int(job.progress * 100)
+                        job.progress = progress
+                        if changed:
+                            self._on_change(job)
+            finally:
+                segments.close()  # Kills the worker if the stream was left unfinished
+        except WorkerStopped:
+            return None  # Stop killed the worker, the job is requeued
+        if stop_event.is_set():
+            return None
+
+        outputs = transcriber.write_outputs(store, output_base, settings["formats"], info=info)
+        run_key = self.app.result_cache.make_key(content_hash, cache_model, lang_code, **cache_settings)
+        try:
+            self.app.result_cache.put(run_key, store, info,
+                                      meta={"file": job.name, "model": model_size, "language": info.language})
+        except Exception:
+            pass  # A full or read-only cache must not fail the job
+        self._add_to_library(store, info, content_hash, job, run_key)
+        return outputs
+
+    def _add_to_library(self, segments, info, content_hash, job, run_key):
+        """Make a finished job searchable in the Library window (scheduler thread)"""
+        settings = self.settings
+        try:
+            if not self.app.library.has(run_key):
+                self.app.library.add(segments, content_hash, job.path, result_key=run_key,
+                                     edition=self.app.edition, model=settings["model_key"][0],
+                                     language=info.language, preset=settings["preset"], duration=info.duration)
+        except Exception as e:
+            self.app.library.report_error(e)  # Like the result cache, the library must not fail the job
+
+    def _on_change(self, job):
+        """Coalesce scheduler notifications into one list refresh (any thread)"""
+        self.root.after(0, self._schedule_refresh)
+
+    def _schedule_refresh(self):
+        if self._refresh_after_id is None:
+            self._refresh_after_id = self.root.after(REFRESH_MS, self.refresh)
+
+    def refresh(self):
+        """Redraw the job list, buttons and totals (main thread)"""
+        self._refresh_after_id = None
+        jobs = self.scheduler.jobs()
+        shown = set(self.tree.get_children())
+        wanted = [str(job.id) for job in jobs]
+
+        for item in shown - set(wanted):
+            self.tree.delete(item)
+        for index, job in enumerate(jobs):
+            values = (job.name, format_duration(job.duration), self._status_text(job),
+                      f"{job.speed:.1f}x" if job.speed else "")
+            item = str(job.id)
+            if item in shown:
+                self.tree.item(item, values=values)
+                if self.tree.index(item) != index:
+                    self.tree.move(item, "", index)
+            else:
+                self.tree.insert("", index, iid=item, values=values)
+
+        running = self.scheduler.running
+        self.btn_start.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.btn_stop.config(state=tk.NORMAL if running and not self.scheduler.stop_event.is_set() else tk.DISABLED)
+
+        summary = self.scheduler.summary()
+        text = f"{summary['done']}/{summary['total']} done"
+        if summary["failed"]:
+            text += f", {summary['failed']} failed"
+        if summary["speed"]:
+            text += (f" · {format_duration(summary['audio_seconds'])} of audio in "
+                     f"{format_duration(summary['busy_seconds'])} ({summary['speed']:.1f}x real time)")
+            if running and summary["remaining_seconds"]:
+                eta = summary["remaining_seconds"] / summary["speed"]
+                text += f" · about {format_duration(eta)} left"
+        elif running and self.scheduler.started:
+            text += f" · running for {format_duration(time.time() - self.scheduler.started)}"
+        timings = self.scheduler.timings
+        if timings.decode_seconds:
+            text += f" · decode {format_duration(timings.decode_seconds)}"
+        self.summary_label.config(text=text)
+
+    @staticmethod
+    def _status_text(job):
+        if job.status == RUNNING:
+            return f"Running {int(job.progress * 100)}%"
+        if job.status == DONE:
+            return "Done (cached)" if job.cached else "Done"
+        if job.status == FAILED:
+            return f"Failed: {job.error}"
+        return QUEUED
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+WhisperUI transcription result cache
+Persistent on-disk cache of finished transcripts keyed by a hash of the audio
+content plus the settings that change the output, with size-bounded LRU eviction
+
+Inspect or clear it from the command line:
+    python result_cache.py --list
+    python result_cache.py --clear
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import transcriber
+
+
+# Base directory for WhisperUI caches, override with WHISPERUI_CACHE_DIR
+CACHE_ROOT = os.environ.get("WHISPERUI_CACHE_DIR", os.path.expanduser("~/.cache/whisperui"))
+
+# Default size limit, override with WHISPERUI_RESULT_CACHE_MB
+DEFAULT_MAX_MB = 256
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Content hashes already computed this session: (path, size, mtime_ns) -> hex digest
+_hash_memo = {}
+_hash_lock = threading.Lock()
+
+
+def file_content_hash(path):
+    """SHA-256 of a file's contents, memoized per (path, size, mtime) for this session"""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _hash_lock:
+        if memo_key in _hash_memo:
+            return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    content_hash = digest.hexdigest()
+
+    with _hash_lock:
+        _hash_memo[memo_key] = content_hash
+    return content_hash
+
+
+def evict_lru(paths, max_bytes):
+    """Delete the least recently used (oldest mtime) files until their total fits in max_bytes"""
+    files = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
+            pass  # Already gone, or still mapped by another process on Windows
+
+
+def max_mb_from_env():
+    try:
+        return int(os.environ.get("WHISPERUI_RESULT_CACHE_MB", DEFAULT_MAX_MB))
+    except ValueError:
+        return DEFAULT_MAX_MB
+
+
+class ResultCache:
+    """Content-addressed store of transcripts (gzip JSON, one file per entry)"""
+
+    def __init__(self, directory=None, max_mb=None):
+        self.directory = Path(directory or os.path.join(CACHE_ROOT, "results"))
+        self.max_bytes = (max_mb_from_env() if max_mb is None else max_mb) * 1024 * 1024
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content_hash, model_size, language=None, beam_size=5, word_timestamps=True, decoding=None):
+        """Cache key for an audio hash and the settings that change the transcript
+
+        decoding names other decoder settings (a preset); None keeps the key
+        of the original beam search settings.
+        """
+        settings = [content_hash, model_size, language or "auto", beam_size, bool(word_timestamps)]
+        if decoding is not None:
+            settings.append(decoding)
+        settings = json.dumps(settings)
+        return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json.gz"
+
+    def get(self, key):
+        """Return (segments, info, meta) for a key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Touch so eviction treats this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        segments = [transcriber.segment_from_dict(item) for item in data["segments"]]
+        info = transcriber.TranscriptInfo(**data["info"])
+        return segments, info, data.get("meta", {})
+
+    def find(self, content_hash, model_size, language=None, beam_size=5, word_timestamps=True, decoding=None):
+        """Look up a transcript; a result with word timings also satisfies a request without them"""
+        for with_words in ((True,) if word_timestamps else (False, True)):
+            hit = self.get(self.make_key(content_hash, model_size, language, beam_size, with_words, decoding))
+            if hit is not None:
+                return hit
+        return None
+
+    def put(self, key, segments, info, meta=None):
+        """Store a finished transcript, then evict old entries beyond the size limit"""
+        data = {
+            "segments": [transcriber.segment_to_dict(segment) for segment in segments],
+            "info": {
+                "language": info.language,
+                "language_probability": getattr(info, 'language_probability', None),
+                "duration": info.duration,
+            },
+            "meta": dict(meta or {}, created=time.time()),
+        }
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so a crash never leaves a half-written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.evict_to_limit()
+
+    def _files(self):
+        if not self.directory.is_dir():
+            return []
+        return [path for path in self.directory.glob("*.json.gz") if path.is_file()]
+
+    def evict_to_limit(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            evict_lru(self._files(), self.max_bytes)
+
+    def entries(self):
+        """Describe cached transcripts, most recently used first"""
+        result = []
+        for path in self._files():
+            stat = path.stat()
+            entry = {"key": path.name.split(".")[0], "bytes": stat.st_size, "last_used": stat.st_mtime}
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    data = json.load(f)
+                entry.update(data.get("meta", {}))
+                entry["segments"] = len(data["segments"])
+            except (OSError, ValueError):
+                entry["corrupt"] = True
+            result.append(entry)
+        return sorted(result, key=lambda entry: entry["last_used"], reverse=True)
+
+    def stats(self):
+        files = self._files()
+        return {
+            "directory": str(self.directory),
+            "entries": len(files),
+            "bytes": sum(path.stat().st_size for path in files),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        """Delete every cached transcript, returning how many were removed"""
+        removed = 0
+        with self._lock:
+            for path in self._files():
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the WhisperUI transcription cache")
+    parser.add_argument("--list", action="store_true", help="List cached transcripts")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached transcripts")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache()
+    if args.clear:
+        print(f"Removed {cache.clear()} cached transcript(s) from {cache.directory}")
+        return 0
+
+    if args.list:
+        for entry in cache.entries():
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))
+            print(f"{used}  {entry['bytes'] / 1024:8.1f} KB  {entry.get('model', '?'):<9} "
+                  f"{entry.get('language', '?'):<5} {entry.get('segments', 0):>6} seg  {entry.get('file', entry['key'])}")
+
+    stats = cache.stats()
+    print(f"{stats['entries']} entries, {stats['bytes'] / 1048576:.1f} of {stats['max_bytes'] / 1048576:.0f} MB "
+          f"in {stats['directory']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+WhisperUI run metrics
+Per-stage timings for one transcription (model load, audio decode, language
+detection, decoding) plus time to first segment, segments per second and
+real-time factor, appended as one JSON line per run to a log
+
+Summarize the log from the command line:
+    python run_metrics.py
+    python run_metrics.py --log path/to/perf_log.jsonl
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from result_cache import CACHE_ROOT
+
+
+def default_log_path():
+    """Log file, override with WHISPERUI_PERF_LOG"""
+    return os.environ.get("WHISPERUI_PERF_LOG", os.path.join(CACHE_ROOT, "perf_log.jsonl"))
+
+
+class RunMetrics:
+    """Timings of one transcription run, safe to read from the UI thread while it runs"""
+
+    def __init__(self, **context):
+        self.context = context  # file, model, edition... copied into the log record
+        self.started = time.perf_counter()
+        self.wall_started = time.time()
+        self.stages = {}  # name -> seconds, in the order they ran
+        self.current_stage = None
+        self.first_segment = None  # seconds from start to the first segment
+        self.decode_started = None  # when segments started being pulled from the model
+        self.segments = 0
+        self.audio_start = 0.0  # first second of audio transcribed in this run (resume)
+        self.audio_position = 0.0  # end of the latest segment
+        self.audio_duration = None
+        self.finished = None
+        self.outcome = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block as a named stage (repeated stages add up)"""
+        self.current_stage = name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+                self.current_stage = None
+
+    @contextmanager
+    def paused(self):
+        """Leave a block (waiting on the user) out of the run's wall time"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.started += time.perf_counter() - started
+
+    def start_decoding(self, audio_duration, audio_start=0.0):
+        """Called once the model returned its segment stream"""
+        with self._lock:
+            self.audio_duration = audio_duration
+            self.audio_start = self.audio_position = audio_start
+            self.decode_started = time.perf_counter()
+            self.current_stage = "decoding"
+
+    def add_segment(self, end):
+        with self._lock:
+            if self.first_segment is None:
+                self.first_segment = time.perf_counter() - self.started
+            self.segments += 1
+            self.audio_position = max(self.audio_position, end)
+
+    def finish(self, outcome):
+        """Close the run: outcome is done, stopped, cached or error"""
+        with self._lock:
+            now = time.perf_counter()
+            if self.decode_started is not None:
+                self.stages["decoding"] = self.stages.get("decoding", 0.0) + now - self.decode_started
+            self.finished = now
+            self.outcome = outcome
+            self.current_stage = None
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def audio_seconds(self):
+        """Audio transcribed in this run"""
+        return max(0.0, self.audio_position - self.audio_start)
+
+    @property
+    def realtime_factor(self):
+        """Audio seconds per wall second for the whole run (2.0 means twice as fast as real time)"""
+        elapsed = self.elapsed
+        return self.audio_seconds / elapsed if elapsed > 0 and self.audio_seconds else None
+
+    @property
+    def segments_per_second(self):
+        if self.decode_started is None or not self.segments:
+            return None
+        seconds = (self.finished or time.perf_counter()) - self.decode_started
+        return self.segments / seconds if seconds > 0 else None
+
+    def live_text(self):
+        """Short progress line for the status bar"""
+        with self._lock:
+            stage = self.current_stage
+        if stage is not None and stage != "decoding":
+            return f"{stage.replace('_', ' ')} {self.elapsed:.1f}s"
+        parts = []
+        if self.first_segment is not None:
+            parts.append(f"first segment {self.first_segment:.1f}s")
+        if self.segments_per_second:
+            parts.append(f"{self.segments_per_second:.1f} seg/s")
+        if self.realtime_factor:
+            parts.append(f"{self.realtime_factor:.1f}x real time")
+        return ", ".join(parts) or f"waiting for first segment {self.elapsed:.1f}s"
+
+    def summary(self):
+        """Stage breakdown for the completion status"""
+        stages = ", ".join(f"{name.replace('_', ' ')} {seconds:.1f}s" for name, seconds in self.stages.items())
+        text = f"{self.elapsed:.1f}s total ({stages})" if stages else f"{self.elapsed:.1f}s total"
+        if self.realtime_factor:
+            text += f", {self.realtime_factor:.1f}x real time"
+        return text
+
+    def as_record(self):
+        with self._lock:
+            record = dict(self.context)
+            record.update({
+                "time": self.wall_started,
+                "outcome": self.outcome,
+                "wall_seconds": round(self.elapsed, 3),
+                "stages": {name: round(seconds, 3) for name, seconds in self.stages.items()},
+                "time_to_first_segment": None if self.first_segment is None else round(self.first_segment, 3),
+                "segments": self.segments,
+                "audio_seconds": round(self.audio_seconds, 3),
+                "audio_duration": self.audio_duration,
+            })
+        sps = self.segments_per_second
+        rtf = self.realtime_factor
+        record["segments_per_second"] = None if sps is None else round(sps, 3)
+        record["realtime_factor"] = None if rtf is None else round(rtf, 3)
+        return record
+
+    def append_to_log(self, path=None):
+        """Append this run as one JSON line; logging problems never fail a run"""
+        path = path or default_log_path()
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.as_record(), separators=(",", ":")) + "\n")
+        except OSError:
+            pass
+
+
+def read_log(path=None):
+    """Records from a log file, skipping lines that don't parse"""
+    records = []
+    try:
+        with open(path or default_log_path(), encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def summarize(records):
+    """Median metrics per (edition, model, preset) over completed runs"""
+    groups = defaultdict(list)
+    for record in records:
+        if record.get("outcome") == "done":
+            # Runs from before decoding presets have no preset recorded
+            groups[(record.get("edition", "?"), record.get("model", "?"), record.get("preset") or "-")].append(record)
+
+    def median(values):
+        values = [value for value in values if value is not None]
+        return round(statistics.median(values), 3) if values else None
+
+    summary = []
+    for (edition, model, preset), runs in sorted(groups.items()):
+        stage_names = sorted({name for run in runs for name in run.get("stages", {})})
+        summary.append({
+            "edition": edition,
+            "model": model,
+            "preset": preset,
+            "runs": len(runs),
+            "realtime_factor": median(run.get("realtime_factor") for run in runs),
+            "time_to_first_segment": median(run.get("time_to_first_segment") for run in runs),
+            "segments_per_second": median(run.get("segments_per_second") for run in runs),
+            "stages": {name: median(run.get("stages", {}).get(name) for run in runs) for name in stage_names},
+        })
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize the WhisperUI performance log")
+    parser.add_argument("--log", help=f"Log file (default: {default_log_path()})")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    records = read_log(args.log)
+    summary = summarize(records)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"{len(records)} run(s) in {args.log or default_log_path()}")
+    for row in summary:
+        stages = ", ".join(f"{name} {seconds}s" for name, seconds in row["stages"].items() if seconds is not None)
+        print(f"{row['edition']:<4} {row['model']:<9} {row['preset']:<9} {row['runs']:>4} runs  "
+              f"{row['realtime_factor'] or 0:6.1f}x real time  first segment {row['time_to_first_segment'] or 0:5.1f}s  "
+              f"{row['segments_per_second'] or 0:5.1f} seg/s  ({stages})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+WhisperUI compact segment store
+Columnar storage for transcripts of very long recordings: segment and word
+times live in typed arrays, segment text in one UTF-8 buffer and word strings
+in an interned vocabulary, instead of one Python object per segment and word
+"""
+
+import sys
+from array import array
+
+from transcriber import Segment, Word
+
+
+class SegmentStore:
+    """Append-only columnar list of segments with word timings
+
+    Behaves like a read-only list of transcriber.Segment records: len(),
+    truthiness, indexing and iteration build lightweight views on demand.
+    """
+
+    __slots__ = (
+        "starts", "ends", "text_offsets", "_text",
+        "word_offsets", "word_starts", "word_ends", "word_probs", "word_ids",
+        "_vocab", "_vocab_ids",
+    )
+
+    def __init__(self, segments=()):
+        # Segment i: times starts[i]/ends[i], text _text[text_offsets[i]:text_offsets[i + 1]]
+        self.starts = array('d')
+        self.ends = array('d')
+        self.text_offsets = array('Q', [0])
+        self._text = bytearray()
+
+        # Words of segment i are word_offsets[i]:word_offsets[i + 1] in the word columns
+        self.word_offsets = array('Q', [0])
+        self.word_starts = array('d')
+        self.word_ends = array('d')
+        self.word_probs = array('f')
+        self.word_ids = array('I')
+
+        # Interned word strings, most words repeat many times over a long recording
+        self._vocab = []
+        self._vocab_ids = {}
+
+        self.extend(segments)
+
+    def append(self, segment):
+        """Add a segment (faster-whisper Segment or transcriber.Segment) while streaming"""
+        self.starts.append(segment.start)
+        self.ends.append(segment.end)
+        self._text += segment.text.encode("utf-8")
+        self.text_offsets.append(len(self._text))
+
+        for word in getattr(segment, 'words', None) or ():
+            word_id = self._vocab_ids.get(word.word)
+            if word_id is None:
+                word_id = self._vocab_ids[word.word] = len(self._vocab)
+                self._vocab.append(word.word)
+            self.word_starts.append(word.start)
+            self.word_ends.append(word.end)
+            self.word_probs.append(word.probability)
+            self.word_ids.append(word_id)
+        self.word_offsets.append(len(self.word_ids))
+
+    def extend(self, segments):
+        for segment in segments:
+            self.append(segment)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __bool__(self):
+        return len(self.starts) > 0
+
+    def text(self, index):
+        """Text of one segment"""
+        return self._text[self.text_offsets[index]:self.text_offsets[index + 1]].decode("utf-8")
+
+    def word_count(self, index):
+        return self.word_offsets[index + 1] - self.word_offsets[index]
+
+    def iter_words(self, index):
+        """(start, end, word) tuples for one segment, without building Word objects"""
+        vocab = self._vocab
+        for w in range(self.word_offsets[index], self.word_offsets[index + 1]):
+            yield self.word_starts[w], self.word_ends[w], vocab[self.word_ids[w]]
+
+    def words(self, index):
+        """Word records of one segment, or None when it has no word timings"""
+        first, last = self.word_offsets[index], self.word_offsets[index + 1]
+        if first == last:
+            return None
+        vocab = self._vocab
+        return [
+            Word(self.word_starts[w], self.word_ends[w], vocab[self.word_ids[w]], self.word_probs[w])
+            for w in range(first, last)
+        ]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return Segment(self.starts[index], self.ends[index], self.text(index), self.words(index))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def iter_rows(self):
+        """(index, start, end, text) for every segment, without building word lists"""
+        for index in range(len(self)):
+            yield index, self.starts[index], self.ends[index], self.text(index)
+
+    def nbytes(self):
+        """Approximate memory held by the store"""
+        columns = (
+            self.starts, self.ends, self.text_offsets, self.word_offsets,
+            self.word_starts, self.word_ends, self.word_probs, self.word_ids,
+        )
+        total = sum(column.buffer_info()[1] * column.itemsize for column in columns)
+        total += len(self._text)
+        total += sum(sys.getsizeof(word) for word in self._vocab)
+        total += sys.getsizeof(self._vocab) + sys.getsizeof(self._vocab_ids)
+        return total
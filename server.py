@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+WhisperUI HTTP service
+Local transcription server for other tools: jobs are queued with a bounded
+backlog, run by a fixed number of workers that share warm models and the
+result cache, and their segments can be streamed back as they are produced
+
+Examples:
+    python server.py --port 8765 --concurrency 2
+    curl -X POST localhost:8765/jobs -H "Content-Type: application/json" -d '{"path": "/data/talk.mp3"}'
+    curl -X POST "localhost:8765/jobs?stream=1&filename=talk.mp3" --data-binary @talk.mp3
+    curl localhost:8765/jobs/<id>/stream
+
+Endpoints:
+    GET    /health                  queue depth, workers and model cache statistics
+    GET    /jobs                    all known jobs
+    POST   /jobs                    JSON {"path": ...} or a raw upload; options as JSON
+                                    fields or query parameters (model, language,
+                                    beam_size, word_timestamps, filename, stream)
+    GET    /jobs/<id>               job status with the segments produced so far
+    GET    /jobs/<id>/stream        newline-delimited JSON, one segment per line, until done
+    GET    /jobs/<id>/result?format=srt   finished transcript as txt, srt, srt_words, vtt, json or tsv
+    DELETE /jobs/<id>               cancel a queued or running job
+"""
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import transcriber
+import cpu_tuning
+import result_cache
+from audio_cache import AudioCache
+from model_cache import ModelCache
+from segment_store import SegmentStore
+
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_QUEUE = 16
+MAX_FINISHED_JOBS = 200  # finished jobs kept around for status and result requests
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+class QueueFull(Exception):
+    """Raised when the job backlog is at its limit"""
+
+
+class Job:
+    """One transcription request and the segments it has produced so far"""
+
+    def __init__(self, source, options, filename=None, upload=False):
+        self.id = uuid.uuid4().hex[:12]
+        self.source = source  # path of the media file (a temp file for uploads)
+        self.filename = filename or Path(source).name
+        self.upload = upload  # delete the source once the job has finished
+        self.options = options
+        self.status = "queued"
+        self.error = None
+        self.info = None
+        self.cached = False
+        self.segments = SegmentStore()
+        self.stop_event = threading.Event()
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._changed = threading.Condition()
+
+    def set_running(self):
+        with self._changed:
+            self.status = "running"
+            self.started = time.time()
+            self._changed.notify_all()
+
+    def set_info(self, info):
+        with self._changed:
+            self.info = info
+            self._changed.notify_all()
+
+    def add_segment(self, segment):
+        with self._changed:
+            self.segments.append(segment)
+            self._changed.notify_all()
+
+    def finish(self, status, error=None):
+        with self._changed:
+            self.status = status
+            self.error = error
+            self.finished = time.time()
+            self._changed.notify_all()
+
+    @property
+    def is_finished(self):
+        return self.status in FINISHED
+
+    def wait_for_segments(self, index, timeout=None):
+        """Block until there are segments past index or the job has finished"""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.segments) > index or self.is_finished, timeout)
+            return self.segments[index:], self.is_finished
+
+    def to_dict(self, with_segments=False):
+        data = {
+            "id": self.id,
+            "file": self.filename,
+            "status": self.status,
+            "options": self.options,
+            "segments_done": len(self.segments),
+            "cached": self.cached,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if self.info is not None:
+            data["language"] = self.info.language
+            data["duration"] = self.info.duration
+        if self.error:
+            data["error"] = self.error
+        if self.started and self.finished and self.info is not None and self.finished > self.started:
+            data["speed"] = round(self.info.duration / (self.finished - self.started), 2)
+        if with_segments:
+            data["segments"] = [transcriber.segment_to_dict(segment) for segment in self.segments]
+        return data
+
+
+class TranscriptionService:
+    """Bounded job queue served by a fixed number of worker threads"""
+
+    def __init__(self, concurrency=1, max_queue=DEFAULT_MAX_QUEUE, default_model="base",
+                 device="cpu", compute_type=None, cpu_threads=0, model_cache=None, results=None, audio_cache=None):
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max_queue
+        self.default_model = default_model
+        self.device = device
+        self.compute_type = compute_type  # None: calibrated per model size, else int8
+        # 0: calibrated per model size, else cores divided by concurrency; CTranslate2 gives each of
+        # the model's `concurrency` workers this many threads
+        self.cpu_threads = cpu_threads
+        self.model_cache = model_cache or ModelCache(transcriber.load_model)
+        self.result_cache = results or result_cache.ResultCache()
+        self.audio_cache = audio_cache or AudioCache()
+        self.upload_dir = tempfile.mkdtemp(prefix="whisperui-uploads-")
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._jobs = OrderedDict()  # id -> Job, oldest first
+        self._lock = threading.Lock()
+        self._workers = []
+        self._running = 0
+
+    def model_settings(self, model_size):
+        """Compute type and CPU threads for a model, filling in unset ones from the calibration"""
+        if self.device != "cpu":
+            return self.compute_type or "int8", self.cpu_threads
+        return cpu_tuning.resolve(model_size, self.compute_type, self.cpu_threads, streams=self.concurrency)
+
+    def load_model(self, model_size):
+        """Shared warm model with one CTranslate2 worker per job worker, so concurrent jobs decode in parallel"""
+        compute_type, cpu_threads = self.model_settings(model_size)
+        return self.model_cache.get(model_size, self.device, compute_type,
+                                    cpu_threads=cpu_threads, num_workers=self.concurrency)
+
+    def start(self):
+        for index in range(self.concurrency):
+            worker = threading.Thread(target=self._worker, name=f"job-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self):
+        """Cancel outstanding jobs and stop the workers"""
+        for job in self.jobs():
+            if not job.is_finished:
+                self.cancel(job.id)
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._workers = []
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def normalize_options(self, options):
+        """Validate request options, filling in the server defaults"""
+        model = options.get("model") or self.default_model
+        if model not in transcriber.MODEL_SIZES:
+            raise ValueError(f"unknown model {model!r}, expected one of {', '.join(transcriber.MODEL_SIZES)}")
+        language = options.get("language") or "Auto"
+        if not isinstance(language, str):
+            raise ValueError("\"language\" must be a string")
+        try:
+            beam_size = int(options.get("beam_size", 5))
+        except (TypeError, ValueError):
+            raise ValueError("\"beam_size\" must be an integer")
+        word_timestamps = options.get("word_timestamps", True)
+        if isinstance(word_timestamps, str):
+            word_timestamps = word_timestamps.lower() not in ("0", "false", "no")
+        return {
+            "model": model,
+            "language": transcriber.get_language_code(language),
+            "beam_size": beam_size,
+            "word_timestamps": bool(word_timestamps),
+        }
+
+    def submit(self, source, options, filename=None, upload=False):
+        """Queue a job, raising QueueFull when the backlog is at its limit"""
+        job = Job(source, self.normalize_options(options), filename=filename, upload=upload)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+            raise QueueFull(f"job queue is full ({self.max_queue} waiting)")
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id):
+        """Stop a running job or drop a queued one"""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.stop_event.set()
+        if job.status == "queued":
+            # The worker skips it when it comes off the queue
+            job.finish("cancelled")
+        return job
+
+    def _prune(self):
+        # Forget the oldest finished jobs beyond the limit (lock held)
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            running = self._running
+        return {
+            "status": "ok",
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "queued": self._queue.qsize(),
+            "running": running,
+            "jobs": {status: statuses.count(status) for status in set(statuses)},
+            "models": self.model_cache.stats(),
+            "result_cache": self.result_cache.stats(),
+            "audio_cache": self.audio_cache.stats(),
+        }
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if job.is_finished:
+                continue  # Cancelled while queued
+            with self._lock:
+                self._running += 1
+            try:
+                self.run_job(job)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                if job.upload:
+                    try:
+                        os.unlink(job.source)
+                    except OSError:
+                        pass
+
+    def run_job(self, job):
+        """Transcribe one job the same way the desktop app does"""
+        job.set_running()
+        options = job.options
+        try:
+            # Reuse a cached transcript of the same audio with the same settings
+            content_hash = result_cache.file_content_hash(job.source)
+            cached = self.result_cache.find(
+                content_hash, options["model"], options["language"],
+                beam_size=options["beam_size"], word_timestamps=options["word_timestamps"]
+            )
+            if cached is not None:
+                segments, info, _ = cached
+                job.cached = True
+                job.set_info(info)
+                for segment in segments:
+                    job.add_segment(segment)
+                job.finish("done")
+                return
+
+            model = self.load_model(options["model"])
+            segments, info = transcriber.transcribe(
+                model,
+                self.audio_cache.load(job.source, content_hash),
+                language=options["language"],
+                beam_size=options["beam_size"],
+                word_timestamps=options["word_timestamps"],
+                stop_event=job.stop_event
+            )
+            job.set_info(info)
+            for segment in segments:
+                if job.stop_event.is_set():
+                    break
+                job.add_segment(segment)
+
+            if job.stop_event.is_set():
+                job.finish("cancelled")
+                return
+
+            try:
+                run_key = self.result_cache.make_key(
+                    content_hash, options["model"], options["language"],
+                    beam_size=options["beam_size"], word_timestamps=options["word_timestamps"]
+                )
+                self.result_cache.put(
+                    run_key, job.segments, info,
+                    meta={"file": job.filename, "model": options["model"], "language": info.language}
+                )
+            except Exception:
+                pass  # A full or read-only cache must not fail the job
+            job.finish("done")
+        except Exception as e:
+            job.finish("failed", str(e))
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """JSON API over the service attached to the server"""
+
+    server_version = "WhisperUI"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message, headers=None):
+        self.send_json(status, {"error": message}, headers)
+
+    def route(self):
+        """Split the path into (parts, query)"""
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        return parts, query
+
+    def find_job(self, job_id):
+        job = self.service.get(job_id)
+        if job is None:
+            self.send_error_json(404, f"no job {job_id}")
+        return job
+
+    def do_GET(self):
+        parts, query = self.route()
+        if parts == ["health"]:
+            self.send_json(200, self.service.stats())
+        elif parts == ["jobs"]:
+            self.send_json(200, {"jobs": [job.to_dict() for job in self.service.jobs()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.find_job(parts[1])
+            if job:
+                self.send_json(200, job.to_dict(with_segments=True))
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "stream":
+            job = self.find_job(parts[1])
+            if job:
+                self.stream_job(job)
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+            job = self.find_job(parts[1])
+            if job:
+                self.send_result(job, query.get("format", "txt"))
+        else:
+            self.send_error_json(404, "not found")
+
+    def do_POST(self):
+        parts, query = self.route()
+        if parts != ["jobs"]:
+            self.send_error_json(404, "not found")
+            return
+
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.send_error_json(411, "Content-Length required")
+            return
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_error_json(400, "invalid Content-Length")
+            return
+
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(body, dict):
+                    raise ValueError("the JSON body must be an object")
+                options = dict(query, **body)
+                path = options.pop("path", None)
+                if not path:
+                    raise ValueError("missing \"path\"")
+                if not isinstance(path, str):
+                    raise ValueError("\"path\" must be a string")
+                path = os.path.expanduser(path)
+                if not os.path.isfile(path):
+                    raise ValueError(f"file not found: {path}")
+                job = self.service.submit(path, options, filename=options.pop("filename", None))
+            else:
+                options = dict(query)
+                filename = os.path.basename(options.pop("filename", "upload"))
+                source = self.save_upload(length, Path(filename).suffix)
+                try:
+                    job = self.service.submit(source, options, filename=filename, upload=True)
+                except Exception:
+                    os.unlink(source)
+                    raise
+        except QueueFull as e:
+            self.send_error_json(503, str(e), {"Retry-After": "5"})
+            return
+        except ValueError as e:
+            self.send_error_json(400, str(e))
+            return
+
+        if query.get("stream", "").lower() in ("1", "true", "yes"):
+            self.stream_job(job)
+        else:
+            self.send_json(202, dict(job.to_dict(), url=f"/jobs/{job.id}", stream=f"/jobs/{job.id}/stream"))
+
+    def do_DELETE(self):
+        parts, _ = self.route()
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.service.cancel(parts[1])
+            if job is None:
+                self.send_error_json(404, f"no job {parts[1]}")
+            else:
+                self.send_json(200, job.to_dict())
+        else:
+            self.send_error_json(404, "not found")
+
+    def save_upload(self, length, suffix):
+        """Copy the request body to a temp file without holding it in memory"""
+        fd, path = tempfile.mkstemp(dir=self.service.upload_dir, suffix=suffix)
+        with os.fdopen(fd, 'wb') as f:
+            remaining = length
+            while remaining > 0:
+                block = self.rfile.read(min(UPLOAD_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                f.write(block)
+                remaining -= len(block)
+        if remaining:
+            os.unlink(path)
+            raise ValueError("upload ended before Content-Length bytes were received")
+        return path
+
+    def stream_job(self, job):
+        """Send the job's segments as newline-delimited JSON while they are produced"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        # Without a Content-Length the stream ends when the connection closes
+        self.close_connection = True
+
+        def send(record):
+            self.wfile.write(json.dumps(record).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+        try:
+            send({"type": "job", **job.to_dict()})
+            sent = 0
+            info_sent = False
+            while True:
+                segments, finished = job.wait_for_segments(sent, timeout=15)
+                if not info_sent and job.info is not None:
+                    send({"type": "info", "language": job.info.language, "duration": job.info.duration})
+                    info_sent = True
+                for segment in segments:
+                    send({"type": "segment", "index": sent, **transcriber.segment_to_dict(segment)})
+                    sent += 1
+                if finished and sent >= len(job.segments):
+                    break
+            send({"type": "end", **job.to_dict()})
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away, the job keeps running
+
+    def send_result(self, job, format_name):
+        if format_name not in transcriber.EXPORTERS:
+            self.send_error_json(400, f"unknown format {format_name!r}, expected one of {', '.join(transcriber.EXPORTERS)}")
+            return
+        if job.status != "done":
+            self.send_error_json(409, f"job is {job.status}")
+            return
+        body = "".join(transcriber.iter_export(format_name, job.segments, info=job.info)).encode("utf-8")
+        self.send_response(200)
+        content_type = "application/json" if format_name == "json" else "text/plain"
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_server(service, host="127.0.0.1", port=DEFAULT_PORT, quiet=False):
+    """HTTP server bound to host:port serving the given service (port 0 picks a free port)"""
+    server = ThreadingHTTPServer((host, port), RequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.quiet = quiet
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve WhisperUI transcription over local HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--model", default="base", choices=transcriber.MODEL_SIZES, help="Default model size (default: base)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Jobs transcribed at the same time (default: 1)")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help=f"Jobs allowed to wait before requests are refused (default: {DEFAULT_MAX_QUEUE})")
+    parser.add_argument("--device", default="cpu", help="Inference device (default: cpu)")
+    parser.add_argument("--compute-type", help="CTranslate2 compute type (default: calibrated, else int8)")
+    parser.add_argument("--cpu-threads", type=int, default=0,
+                        help="CPU threads per concurrent job; the shared model runs --concurrency workers with "
+                             "this many threads each (default: calibrated with concurrency 1, else cores divided by concurrency)")
+    parser.add_argument("--preload", action="store_true", help="Load the default model before accepting requests")
+    parser.add_argument("--quiet", action="store_true", help="Don't log requests")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    service = TranscriptionService(
+        concurrency=args.concurrency,
+        max_queue=args.max_queue,
+        default_model=args.model,
+        device=args.device,
+        compute_type=args.compute_type,
+        cpu_threads=args.cpu_threads
+    )
+    if args.preload:
+        print(f"Loading {args.model} model...")
+        service.load_model(args.model)
+
+    service.start()
+    server = create_server(service, args.host, args.port, quiet=args.quiet)
+    host, port = server.server_address[:2]
+    print(f"WhisperUI server listening on http://{host}:{port} "
+          f"({args.concurrency} worker(s), queue limit {args.max_queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+WhisperUI startup timing
+Records cold-start milestones (imports, window ready, backend imported, model
+ready) when WHISPERUI_STARTUP_TIMING is set, and provides a harness that
+launches both editions and checks the timings against a budget
+
+Run the harness:
+    python startup_timing.py --edition both --runs 3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+# Set by the harness: where to write the report, the spawn time and which mark ends the run
+REPORT_ENV = "WHISPERUI_STARTUP_TIMING"
+T0_ENV = "WHISPERUI_STARTUP_T0"
+WAIT_FOR_ENV = "WHISPERUI_STARTUP_WAIT_FOR"
+
+EDITIONS = {
+    "cpu": "main.py",
+    "gpu": "main_gpu.py",
+}
+
+# Default budget in seconds for each milestone
+DEFAULT_BUDGET = {
+    "imports": 0.5,
+    "window_ready": 1.0,
+}
+
+
+_t0 = float(os.environ.get(T0_ENV, time.time()))
+_marks = {}
+_lock = threading.Lock()
+_on_complete = None
+_reported = False
+
+
+def enabled():
+    return bool(os.environ.get(REPORT_ENV))
+
+
+def mark(name):
+    """Record the first time a milestone is reached (seconds since process spawn)"""
+    global _reported
+    if not enabled():
+        return
+    with _lock:
+        if name in _marks:
+            return
+        _marks[name] = time.time() - _t0
+        if _reported:
+            return
+        _reported = complete = os.environ.get(WAIT_FOR_ENV, "window_ready") in _marks
+        # Written at every milestone, so a launch that never gets there still leaves its timings
+        _write_report(dict(_marks), complete)
+
+    if complete and _on_complete is not None:
+        _on_complete()
+
+
+def on_complete(callback):
+    """Register a callback run (from any thread) once the awaited milestone is reached"""
+    global _on_complete
+    _on_complete = callback
+
+
+def _write_report(report, complete):
+    target = os.environ.get(REPORT_ENV)
+    if target in ("1", "-"):
+        if complete:
+            print(json.dumps(report), flush=True)
+        return
+    # Replaced atomically, the harness may read it after killing the app mid-write
+    tmp_path = f"{target}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f)
+    os.replace(tmp_path, target)
+
+
+def run_once(edition, wait_for, timeout):
+    """Launch one edition, returns (milestones reached, error or None)
+
+    A launch that times out is killed; the milestones it reached are kept.
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), EDITIONS[edition])
+    fd, report_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    env = dict(os.environ)
+    env[REPORT_ENV] = report_path
+    env[WAIT_FOR_ENV] = wait_for
+    env[T0_ENV] = repr(time.time())
+    try:
+        proc = subprocess.Popen([sys.executable, script], env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            _, stderr = proc.communicate(timeout=timeout)
+            error = None
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            _, stderr = proc.communicate()
+            error = f"timed out after {timeout:g}s"
+        with open(report_path, encoding='utf-8') as f:
+            content = f.read()
+        marks = json.loads(content) if content else {}
+        if error is None and wait_for not in marks:
+            error = f"exited before {wait_for}: {stderr.decode(errors='replace')[-500:].strip()}"
+        return marks, error
+    finally:
+        os.unlink(report_path)
+
+
+def summarize(runs):
+    """Median of each milestone across runs"""
+    summary = {}
+    for name in sorted({key for run in runs for key in run}):
+        values = sorted(run[name] for run in runs if name in run)
+        summary[name] = values[len(values) // 2]
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure WhisperUI cold-start times")
+    parser.add_argument("--edition", choices=["cpu", "gpu", "both"], default="both")
+    parser.add_argument("--runs", type=int, default=3, help="Launches per edition (median is reported)")
+    parser.add_argument("--wait-for", default="model_ready",
+                        help="Milestone that ends each launch (window_ready skips model loading)")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds before a launch is abandoned")
+    parser.add_argument("--budget", action="append", default=[], metavar="MARK=SECONDS",
+                        help="Fail if a milestone median exceeds the budget (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    budget = dict(DEFAULT_BUDGET)
+    for item in args.budget:
+        name, _, seconds = item.partition("=")
+        budget[name] = float(seconds)
+
+    editions = ["cpu", "gpu"] if args.edition == "both" else [args.edition]
+    report = {}
+    for edition in editions:
+        runs, errors = [], []
+        for index in range(args.runs):
+            marks, error = run_once(edition, args.wait_for, args.timeout)
+            runs.append(marks)
+            if error:
+                errors.append(f"{edition}: launch {index + 1} {error}")
+        report[edition] = {"runs": runs, "median": summarize(runs), "errors": errors}
+
+    errors = [error for edition in editions for error in report[edition]["errors"]]
+    over_budget = [
+        f"{edition}: {name} {seconds:.2f}s > {budget[name]:.2f}s"
+        for edition in editions
+        for name, seconds in report[edition]["median"].items()
+        if name in budget and seconds > budget[name]
+    ]
+    failures = errors + over_budget
+    report["budget"] = budget
+    report["failures"] = failures
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for edition in editions:
+            print(f"{edition} edition (median of {args.runs}):")
+            for name, seconds in sorted(report[edition]["median"].items(), key=lambda item: item[1]):
+                limit = f"  (budget {budget[name]:.2f}s)" if name in budget else ""
+                print(f"  {name:<18} {seconds:7.2f}s{limit}")
+        for error in errors:
+            print(f"FAILED {error}", file=sys.stderr)
+        for failure in over_budget:
+            print(f"OVER BUDGET {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
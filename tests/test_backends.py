@@ -0,0 +1,157 @@
+"""
+Tests of the inference backends through the Backend interface: faster-whisper
+with the stub model from benchmarks/stub_backend.py, openai-whisper only when
+torch and whisper are installed
+"""
+
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import backends  # noqa: E402
+import transcriber  # noqa: E402
+from stub_backend import SAMPLING_RATE, load_stub, synthetic_speech  # noqa: E402
+
+
+def write_wav(path, samples, sampling_rate=SAMPLING_RATE):
+    """16-bit mono WAV of float samples in [-1, 1]"""
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sampling_rate)
+        f.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+
+
+class BackendTestMixin:
+    """Checks shared by every backend; subclasses set backend and model"""
+
+    backend = None
+    model = None
+    audio_seconds = 40
+    finds_segments = True  # A real model may hear nothing in the synthetic tones
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="whisperui-test-")
+        self.audio = synthetic_speech(self.audio_seconds, seed=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_is_a_registered_backend(self):
+        self.assertIsInstance(self.backend, backends.Backend)
+        self.assertIs(backends.BACKENDS[self.backend.name], type(self.backend))
+
+    def test_transcribe_streams_segments(self):
+        segments, info = self.backend.transcribe(self.model, self.audio, language="en")
+        # A lazy stream, info is complete before any segment is pulled
+        self.assertIs(iter(segments), segments)
+        self.assertIsInstance(info, transcriber.TranscriptInfo)
+        self.assertEqual(info.language, "en")
+        self.assertAlmostEqual(info.duration, self.audio_seconds, places=2)
+
+        collected = list(segments)
+        if self.finds_segments:
+            self.assertGreater(len(collected), 0)
+        starts = [segment.start for segment in collected]
+        self.assertEqual(starts, sorted(starts))
+        for segment in collected:
+            self.assertLessEqual(segment.start, segment.end)
+            self.assertLessEqual(segment.end, info.duration + 0.01)
+
+    def test_stop_event_ends_the_stream(self):
+        stop_event = threading.Event()
+        segments, _ = self.backend.transcribe(self.model, self.audio, language="en", stop_event=stop_event)
+        next(segments, None)
+        stop_event.set()
+        self.assertEqual(list(segments), [])
+
+    def test_load_audio_decodes_to_16khz_mono_float32(self):
+        path = Path(self.directory) / "speech.wav"
+        write_wav(path, self.audio[:2 * SAMPLING_RATE])
+        samples = self.backend.load_audio(path)
+        self.assertEqual(samples.dtype, np.float32)
+        self.assertEqual(samples.ndim, 1)
+        self.assertAlmostEqual(len(samples) / SAMPLING_RATE, 2.0, places=1)
+
+    def test_align_words_keeps_segments_and_adds_words(self):
+        segments, info = self.backend.transcribe(self.model, self.audio, language="en", word_timestamps=False)
+        segments = list(segments)
+        progress = []
+        aligned = self.backend.align_words(self.model, self.audio, segments, info.language, workers=2,
+                                           progress=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(len(aligned), len(segments))
+        for before, after in zip(segments, aligned):
+            self.assertIsInstance(after, transcriber.Segment)
+            self.assertEqual((after.start, after.end, after.text), (before.start, before.end, before.text))
+            if before.text.strip():
+                self.assertTrue(after.words)
+            for word in after.words or ():
+                self.assertIsInstance(word, transcriber.Word)
+                self.assertLessEqual(word.start, word.end)
+        if segments:
+            self.assertEqual(progress[-1], (len(segments), len(segments)))
+
+    def test_align_words_returns_none_when_stopped(self):
+        segments, info = self.backend.transcribe(self.model, self.audio, language="en")
+        stop_event = threading.Event()
+        stop_event.set()
+        self.assertIsNone(self.backend.align_words(self.model, self.audio, list(segments), info.language,
+                                                   stop_event=stop_event))
+
+
+class FasterWhisperBackendTest(BackendTestMixin, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.backend = backends.get_backend("faster-whisper")
+        self.model = load_stub()
+
+    def test_clip_start_keeps_absolute_times(self):
+        segments, _ = self.backend.transcribe(self.model, self.audio, language="en", clip_start=20.0)
+        segments = list(segments)
+        self.assertGreater(len(segments), 0)
+        self.assertGreaterEqual(segments[0].start, 20.0)
+
+
+def openai_whisper_model():
+    """The tiny openai-whisper model if torch, whisper and its download are all here, else a skip reason"""
+    if importlib.util.find_spec("torch") is None or importlib.util.find_spec("whisper") is None:
+        return None, "torch and openai-whisper are not installed"
+    if not os.path.exists(os.path.expanduser("~/.cache/whisper/tiny.pt")):
+        return None, "the tiny openai-whisper model is not downloaded"
+    if shutil.which("ffmpeg") is None:
+        return None, "ffmpeg is not installed"
+    return backends.get_backend("openai-whisper").load_model("tiny", device="cpu"), None
+
+
+class OpenAIWhisperBackendTest(BackendTestMixin, unittest.TestCase):
+
+    finds_segments = False
+
+    @classmethod
+    def setUpClass(cls):
+        cls.shared_model, reason = openai_whisper_model()
+        if reason:
+            raise unittest.SkipTest(reason)
+
+    def setUp(self):
+        super().setUp()
+        self.backend = backends.get_backend("openai-whisper")
+        self.model = self.shared_model
+
+
+if __name__ == "__main__":
+    unittest.main()
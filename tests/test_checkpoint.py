@@ -0,0 +1,106 @@
+"""
+Tests of checkpoint recovery: a line torn by a crash is ignored on load and
+cut off when the run is resumed
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from checkpoint import Checkpoint  # noqa: E402
+from transcriber import Segment, TranscriptInfo, Word  # noqa: E402
+
+
+SEGMENTS = [
+    Segment(0.0, 2.0, " First segment", [Word(0.0, 0.9, " First", 0.5), Word(1.0, 1.9, " segment", 0.75)]),
+    Segment(2.0, 4.5, " second one", None),
+    Segment(4.5, 7.0, " third", [Word(4.5, 6.9, " third", 1.0)]),
+]
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="whisperui-test-")
+        self.path = Path(self.directory) / "run.jsonl"
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write_run(self, segments):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.start({"file": "talk.mp3", "model": "base"})
+        checkpoint.write_info(TranscriptInfo("en", 0.98, 60.0))
+        for segment in segments:
+            checkpoint.append(segment)
+        checkpoint.close()
+
+    def tear_last_line(self):
+        """Cut the file part way through its last record, as a crash mid-write would"""
+        data = self.path.read_bytes()
+        self.path.write_bytes(data[:-12])
+
+    def test_load_round_trips_a_run(self):
+        self.write_run(SEGMENTS)
+        run = Checkpoint(self.path).load()
+        self.assertEqual(run.header["file"], "talk.mp3")
+        self.assertEqual(run.language, "en")
+        self.assertEqual(run.segments, SEGMENTS)
+        self.assertEqual(run.resume_point, 7.0)
+
+    def test_torn_line_is_ignored(self):
+        self.write_run(SEGMENTS)
+        self.tear_last_line()
+        run = Checkpoint(self.path).load()
+        self.assertEqual(run.segments, SEGMENTS[:2])
+        self.assertEqual(run.resume_point, 4.5)
+
+    def test_garbage_line_ends_the_run(self):
+        self.write_run(SEGMENTS[:1])
+        with open(self.path, 'ab') as f:
+            f.write(b"{not json\n")
+            f.write(b'{"type":"segment","start":9.0,"end":10.0,"text":" after","words":null}\n')
+        self.assertEqual(Checkpoint(self.path).load().segments, SEGMENTS[:1])
+
+    def test_reopen_truncates_the_torn_line(self):
+        self.write_run(SEGMENTS)
+        self.tear_last_line()
+
+        checkpoint = Checkpoint(self.path)
+        run = checkpoint.load()
+        torn_size = self.path.stat().st_size
+        checkpoint.reopen()
+        self.assertLess(self.path.stat().st_size, torn_size)
+        self.assertTrue(self.path.read_bytes().endswith(b"\n"))
+
+        # The resumed run continues from the last intact segment
+        checkpoint.append(SEGMENTS[2])
+        checkpoint.close()
+        resumed = Checkpoint(self.path).load()
+        self.assertEqual(resumed.segments, run.segments + [SEGMENTS[2]])
+        self.assertEqual(resumed.header, run.header)
+
+    def test_reopen_without_load_reads_first(self):
+        self.write_run(SEGMENTS[:2])
+        self.tear_last_line()
+        checkpoint = Checkpoint(self.path)
+        checkpoint.reopen()
+        checkpoint.append(SEGMENTS[1])
+        checkpoint.close()
+        self.assertEqual(Checkpoint(self.path).load().segments, SEGMENTS[:2])
+
+    def test_delete_removes_the_file(self):
+        self.write_run(SEGMENTS)
+        checkpoint = Checkpoint(self.path)
+        checkpoint.delete()
+        self.assertFalse(checkpoint.exists())
+        self.assertIsNone(checkpoint.load())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests of how transcribe_chunked stitches concurrently decoded chunks back
+into one stream, with scripted models and the benchmark stub model
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import chunked  # noqa: E402
+import transcriber  # noqa: E402
+from stub_backend import SAMPLING_RATE, load_stub, synthetic_speech  # noqa: E402
+
+
+class ScriptedModel:
+    """Returns the same chunk-relative segments, given as (start, end) pairs or a function of the chunk length"""
+
+    def __init__(self, script):
+        self.script = script
+
+    def transcribe(self, audio, language=None, **kwargs):
+        duration = len(audio) / SAMPLING_RATE
+        times = self.script(duration) if callable(self.script) else self.script
+        segments = (transcriber.Segment(start, end, f" at {start:.2f}", None) for start, end in times)
+        return segments, transcriber.TranscriptInfo(language or "en", 1.0, duration)
+
+
+class TranscribeChunkedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.audio = synthetic_speech(120, seed=3)
+
+    def chunks(self, chunk_seconds):
+        return chunked.split_audio(self.audio, chunk_seconds)
+
+    def test_stream_stays_monotonic_across_overlaps(self):
+        # Overlapping segments inside each chunk, and one reaching back before the chunk's start
+        model = ScriptedModel([(-0.5, 2.0), (1.5, 4.0), (3.0, 5.0), (4.0, 4.5)])
+        segments, _ = chunked.transcribe_chunked(model, self.audio, workers=3, chunk_seconds=30.0, language="en")
+        segments = list(segments)
+
+        self.assertGreater(len(self.chunks(30.0)), 2)
+        self.assertEqual(len(segments), 4 * len(self.chunks(30.0)))
+        previous_end = 0.0
+        for segment in segments:
+            self.assertGreaterEqual(segment.start, previous_end)
+            self.assertGreaterEqual(segment.end, segment.start)
+            previous_end = segment.end
+
+    def test_segments_past_the_chunk_end_are_dropped(self):
+        # The last segment is text for the padding after the chunk, the one before straddles its end
+        model = ScriptedModel(lambda duration: [(0.0, 1.0), (duration - 1.0, duration + 0.5),
+                                                (duration + 0.2, duration + 2.0)])
+        segments, _ = chunked.transcribe_chunked(model, self.audio, workers=3, chunk_seconds=30.0, language="en")
+        segments = list(segments)
+
+        chunks = self.chunks(30.0)
+        self.assertEqual(len(segments), 2 * len(chunks))
+        for index, (offset, end, _) in enumerate(chunks):
+            first, straddling = segments[2 * index], segments[2 * index + 1]
+            self.assertAlmostEqual(first.start, offset)
+            self.assertAlmostEqual(straddling.end, end)  # Clamped to the chunk's end
+        self.assertLessEqual(segments[-1].end, len(self.audio) / SAMPLING_RATE)
+
+    def test_matches_sequential_output_on_the_stub(self):
+        audio = synthetic_speech(600, seed=3)
+        model = load_stub()
+        sequential, _ = transcriber.transcribe(model, audio, word_timestamps=True)
+        sequential = list(sequential)
+        stitched, info = chunked.transcribe_chunked(model, audio, workers=4, word_timestamps=True)
+        stitched = list(stitched)
+
+        self.assertGreater(len(chunked.split_audio(audio, chunked.choose_chunk_seconds(600, 4))), 1)
+        self.assertAlmostEqual(info.duration, 600.0)
+        # Cuts land in silence, so every utterance is found whole and at the same time
+        self.assertEqual(len(stitched), len(sequential))
+        for expected, segment in zip(sequential, stitched):
+            self.assertAlmostEqual(segment.start, expected.start, places=6)
+            self.assertAlmostEqual(segment.end, expected.end, places=6)
+            # The stub spaces int(length * 2.5) words, which rounding can move by one
+            self.assertLessEqual(abs(len(segment.words) - len(expected.words)), 1)
+
+    def test_resume_keeps_absolute_times(self):
+        model = ScriptedModel([(0.0, 1.0)])
+        segments, _ = chunked.transcribe_chunked(model, self.audio, workers=2, chunk_seconds=30.0,
+                                                 language="en", clip_start=45.0)
+        segments = list(segments)
+        self.assertGreater(len(segments), 1)
+        self.assertAlmostEqual(segments[0].start, 45.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
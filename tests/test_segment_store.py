@@ -0,0 +1,63 @@
+"""
+Tests of the columnar SegmentStore against the plain transcriber records it stores
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from segment_store import SegmentStore  # noqa: E402
+from transcriber import Segment, Word  # noqa: E402
+
+
+SEGMENTS = [
+    Segment(0.0, 2.5, " Hello there,", [Word(0.0, 0.8, " Hello", 0.9375), Word(0.9, 2.4, " there,", 0.5)]),
+    Segment(2.5, 4.0, " no word timings", None),
+    Segment(4.0, 6.25, " naïve café – 日本語", [Word(4.0, 4.5, " naïve", 0.75), Word(4.6, 5.0, " café", 0.25),
+                                              Word(5.1, 5.5, " –", 0.125), Word(5.6, 6.2, " 日本語", 1.0)]),
+    Segment(6.25, 7.0, "", None),
+    Segment(7.0, 9.5, " Hello again", [Word(7.0, 8.0, " Hello", 0.5), Word(8.1, 9.4, " again", 0.875)]),
+]
+
+
+class SegmentStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SegmentStore(SEGMENTS)
+
+    def test_iter_rows_round_trips_times_and_text(self):
+        rows = list(self.store.iter_rows())
+        self.assertEqual(rows, [(index, segment.start, segment.end, segment.text)
+                                for index, segment in enumerate(SEGMENTS)])
+
+    def test_iter_words_round_trips_each_segment(self):
+        for index, segment in enumerate(SEGMENTS):
+            expected = [(word.start, word.end, word.word) for word in segment.words or ()]
+            self.assertEqual(list(self.store.iter_words(index)), expected)
+            self.assertEqual(self.store.word_count(index), len(expected))
+
+    def test_segments_come_back_equal(self):
+        # Probabilities are stored as float32, so the test values are exact in it
+        self.assertEqual(list(self.store), SEGMENTS)
+        self.assertEqual(self.store[-1], SEGMENTS[-1])
+        self.assertEqual(self.store[1:3], SEGMENTS[1:3])
+
+    def test_repeated_words_are_interned(self):
+        self.assertEqual(len(self.store._vocab), len({word.word for s in SEGMENTS for word in s.words or ()}))
+
+    def test_append_while_streaming(self):
+        store = SegmentStore()
+        self.assertFalse(store)
+        for count, segment in enumerate(SEGMENTS, 1):
+            store.append(segment)
+            self.assertEqual(len(store), count)
+            self.assertEqual(store[count - 1], segment)
+        with self.assertRaises(IndexError):
+            store[len(SEGMENTS)]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+End-to-end tests of the HTTP service against localhost, with the stub model
+from benchmarks/stub_backend.py standing in for faster-whisper
+"""
+
+import http.client
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import result_cache  # noqa: E402
+import server  # noqa: E402
+from audio_cache import AudioCache  # noqa: E402
+from model_cache import ModelCache  # noqa: E402
+from stub_backend import load_stub, synthetic_speech  # noqa: E402
+
+
+def make_service(directory, **kwargs):
+    """Service on the stub model, with caches in a temporary directory"""
+    return server.TranscriptionService(
+        compute_type="int8",
+        cpu_threads=1,
+        model_cache=ModelCache(load_stub),
+        results=result_cache.ResultCache(Path(directory) / "results"),
+        # The test audio is stored already decoded
+        audio_cache=AudioCache(Path(directory) / "audio", decode=lambda path: np.load(path)),
+        **kwargs
+    )
+
+
+class ServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="whisperui-test-")
+        self.services = []
+        self.servers = []
+
+    def tearDown(self):
+        for httpd in self.servers:
+            httpd.shutdown()
+            httpd.server_close()
+        for service in self.services:
+            service.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def start(self, service, run_workers=True):
+        """Serve the service on a free localhost port, returns the base URL"""
+        if run_workers:
+            service.start()
+        self.services.append(service)
+        httpd = server.create_server(service, port=0, quiet=True)
+        self.servers.append(httpd)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        host, port = httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def audio_file(self, name, seconds, seed):
+        path = Path(self.directory) / f"{name}.npy"
+        np.save(path, synthetic_speech(seconds, seed=seed))
+        return str(path)
+
+    def post_job(self, base, path, **options):
+        body = json.dumps(dict(options, path=path)).encode("utf-8")
+        request = urllib.request.Request(f"{base}/jobs", data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            self.assertEqual(response.status, 202)
+            return json.loads(response.read())
+
+    def post_raw(self, base, body, headers):
+        """POST /jobs with exactly the given headers, returns (status, decoded JSON reply)"""
+        host, port = base.rsplit("/", 1)[-1].split(":")
+        connection = http.client.HTTPConnection(host, int(port), timeout=30)
+        try:
+            connection.putrequest("POST", "/jobs", skip_accept_encoding=True)
+            for name, value in headers.items():
+                connection.putheader(name, value)
+            connection.endheaders(body)
+            response = connection.getresponse()
+            self.assertEqual(response.headers["Content-Type"], "application/json")
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    def read_stream(self, base, job_id):
+        """NDJSON records of a job's stream, up to and including its end record"""
+        with urllib.request.urlopen(f"{base}/jobs/{job_id}/stream", timeout=60) as response:
+            self.assertEqual(response.headers["Content-Type"], "application/x-ndjson")
+            return [json.loads(line) for line in response if line.strip()]
+
+    def test_job_streams_segments_until_done(self):
+        base = self.start(make_service(self.directory))
+        job = self.post_job(base, self.audio_file("talk", 40, seed=1))
+
+        records = self.read_stream(base, job["id"])
+        kinds = [record["type"] for record in records]
+        self.assertEqual(kinds[0], "job")
+        self.assertIn("info", kinds)
+        self.assertEqual(kinds[-1], "end")
+        self.assertEqual(records[-1]["status"], "done")
+
+        segments = [record for record in records if record["type"] == "segment"]
+        self.assertGreater(len(segments), 3)
+        self.assertEqual([record["index"] for record in segments], list(range(len(segments))))
+        self.assertEqual(records[-1]["segments_done"], len(segments))
+
+        with urllib.request.urlopen(f"{base}/jobs/{job['id']}/result?format=srt", timeout=30) as response:
+            self.assertTrue(response.read().decode("utf-8").startswith("1\n00:00:"))
+
+    def test_full_queue_is_refused(self):
+        # No workers, so the first job stays queued and fills the backlog
+        base = self.start(make_service(self.directory, max_queue=1), run_workers=False)
+        path = self.audio_file("talk", 5, seed=2)
+        self.post_job(base, path)
+
+        with self.assertRaises(urllib.error.HTTPError) as refused:
+            self.post_job(base, path)
+        self.assertEqual(refused.exception.code, 503)
+        self.assertEqual(refused.exception.headers["Retry-After"], "5")
+
+    def test_second_job_reuses_warm_model(self):
+        service = make_service(self.directory)
+        base = self.start(service)
+
+        first = self.post_job(base, self.audio_file("first", 20, seed=3))
+        self.assertEqual(self.read_stream(base, first["id"])[-1]["status"], "done")
+        self.assertEqual((service.model_cache.misses, service.model_cache.hits), (1, 0))
+
+        # Different audio, so the result cache can't answer it and the model runs again
+        second = self.post_job(base, self.audio_file("second", 20, seed=4))
+        end = self.read_stream(base, second["id"])[-1]
+        self.assertEqual(end["status"], "done")
+        self.assertFalse(end["cached"])
+        self.assertEqual((service.model_cache.misses, service.model_cache.hits), (1, 1))
+
+    def test_bad_content_length_is_refused(self):
+        base = self.start(make_service(self.directory), run_workers=False)
+        status, reply = self.post_raw(base, b"{}", {"Content-Type": "application/json"})
+        self.assertEqual(status, 411)
+        self.assertIn("error", reply)
+        for length in ("abc", "-1", "1.5"):
+            status, reply = self.post_raw(base, b"{}", {"Content-Type": "application/json", "Content-Length": length})
+            self.assertEqual(status, 400, length)
+            self.assertEqual(reply["error"], "invalid Content-Length")
+
+    def test_malformed_json_is_refused(self):
+        base = self.start(make_service(self.directory), run_workers=False)
+        path = self.audio_file("talk", 5, seed=5)
+        for body in (b"[]", b'"x"', b"1", b"null", b"{not json", json.dumps({"path": 5}).encode("utf-8"),
+                     json.dumps({"path": path, "beam_size": [1]}).encode("utf-8"),
+                     json.dumps({"path": path, "language": ["en"]}).encode("utf-8")):
+            status, reply = self.post_raw(base, body, {"Content-Type": "application/json",
+                                                       "Content-Length": str(len(body))})
+            self.assertEqual(status, 400, body)
+            self.assertIn("error", reply)
+        self.assertEqual(self.services[0].jobs(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
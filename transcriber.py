@@ -0,0 +1,455 @@
+"""
+WhisperUI transcription engine
+GUI-free model loading, transcription and subtitle generation shared by the
+desktop app and the batch command line tool
+
+faster-whisper (and with it ctranslate2, tokenizers and av) is imported on
+first use so the GUI can show its window before paying for those imports
+"""
+
+import json
+from collections import namedtuple
+from contextlib import ExitStack
+
+
+MODEL_SIZES = ("tiny", "base", "small", "medium", "large-v2", "large-v3")
+
+# Extensions offered by the file picker, used when scanning directories
+MEDIA_EXTENSIONS = (
+    ".mp3", ".mp4", ".wav", ".m4a", ".avi", ".mov", ".mkv",
+    ".flac", ".ogg", ".wma", ".aac"
+)
+
+LANGUAGE_MAP = {
+    "Auto": None,
+    "English": "en",
+    "Spanish": "es",
+    "French": "fr",
+    "German": "de",
+    "Italian": "it",
+    "Portuguese": "pt",
+    "Dutch": "nl",
+    "Russian": "ru",
+    "Chinese": "zh",
+    "Japanese": "ja",
+    "Korean": "ko",
+    "Arabic": "ar",
+    "Hindi": "hi",
+    "Turkish": "tr",
+    "Polish": "pl",
+    "Ukrainian": "uk",
+    "Swedish": "sv",
+    "Danish": "da",
+    "Norwegian": "no",
+    "Finnish": "fi"
+}
+
+
+# Lightweight records for segments that didn't come straight from faster-whisper
+# (stitched chunks, cached results); they expose the same attributes the exporters use
+Segment = namedtuple("Segment", "start end text words")
+Word = namedtuple("Word", "start end word probability")
+TranscriptInfo = namedtuple("TranscriptInfo", "language language_probability duration")
+
+
+def shift_segment(segment, offset, limit=None):
+    """Copy a segment with its (and its words') times moved by offset seconds
+
+    Times are clamped to limit when given, so a chunk can't spill past its end.
+    """
+    def shift(seconds):
+        seconds += offset
+        return min(seconds, limit) if limit is not None else seconds
+
+    words = None
+    if getattr(segment, 'words', None):
+        words = [Word(shift(w.start), shift(w.end), w.word, w.probability) for w in segment.words]
+    return Segment(shift(segment.start), shift(segment.end), segment.text, words)
+
+
+def segment_to_dict(segment):
+    """Serialize a segment (and its word timings) to plain JSON types"""
+    data = {"start": segment.start, "end": segment.end, "text": segment.text}
+    if getattr(segment, 'words', None):
+        data["words"] = [[w.start, w.end, w.word, w.probability] for w in segment.words]
+    return data
+
+
+def segment_from_dict(data):
+    """Rebuild a segment serialized by segment_to_dict"""
+    words = None
+    if data.get("words"):
+        words = [Word(*w) for w in data["words"]]
+    return Segment(data["start"], data["end"], data["text"], words)
+
+
+def get_language_code(language_name):
+    """Convert language name to ISO code for Whisper (codes pass through)"""
+    if language_name in LANGUAGE_MAP:
+        return LANGUAGE_MAP[language_name]
+    if language_name in LANGUAGE_MAP.values():
+        return language_name
+    return None
+
+
+def import_backend():
+    """Import the faster-whisper inference stack (slow, call off the UI thread)"""
+    import faster_whisper
+    return faster_whisper
+
+
+def load_model(model_size, device="cpu", compute_type="int8", cpu_threads=0, num_workers=1):
+    """Load a faster-whisper model"""
+    WhisperModel = import_backend().WhisperModel
+
+    # Always use CPU with int8 optimization unless told otherwise
+    return WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers
+    )
+
+
+def transcribe(model, audio, language=None, beam_size=5, word_timestamps=True, stop_event=None,
+               clip_start=0.0, initial_prompt=None, best_of=5, temperature=None):
+    """Transcribe a file or audio array, returning a segment generator and info
+
+    The generator stops early when stop_event is set. clip_start skips the
+    first seconds of the audio (resume) while keeping absolute timestamps.
+    temperature None keeps the backend's fallback schedule (see presets.py).
+    """
+    options = {"best_of": best_of}
+    if temperature is not None:
+        options["temperature"] = temperature
+    if clip_start > 0:
+        options["clip_timestamps"] = [clip_start]
+    if initial_prompt:
+        options["initial_prompt"] = initial_prompt
+
+    segments, info = model.transcribe(
+        audio,
+        beam_size=beam_size,
+        language=language,
+        word_timestamps=word_timestamps,  # Enable word-level timestamps for SRT export
+        **options
+    )
+
+    def stream():
+        for segment in segments:
+            if stop_event is not None and stop_event.is_set():
+                return
+            yield segment
+
+    return stream(), info
+
+
+def format_timestamp(seconds):
+    """Convert seconds to HH:MM:SS format"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def format_srt_timestamp(seconds):
+    """Convert seconds to SRT timestamp format (HH:MM:SS,mmm)"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    milliseconds = int((seconds - int(seconds)) * 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+
+
+def format_segment_line(segment):
+    """Format a segment as a transcript line: [00:00:00] Text"""
+    return f"[{format_timestamp(segment.start)}] {segment.text.strip()}"
+
+
+def iter_segment_rows(segments, with_words=False):
+    """Yield (start, end, text, words) for each segment, words as (start, end, word) tuples
+
+    A SegmentStore is read straight from its columns without building records.
+    """
+    if hasattr(segments, "iter_rows"):
+        for index, start, end, text in segments.iter_rows():
+            words = list(segments.iter_words(index)) if with_words else None
+            yield start, end, text, words
+        return
+
+    for segment in segments:
+        words = None
+        if with_words and getattr(segment, 'words', None):
+            words = [(w.start, w.end, w.word) for w in segment.words]
+        yield segment.start, segment.end, segment.text, words
+
+
+# Exporters report progress every this many segments
+PROGRESS_EVERY = 200
+
+
+def _report(progress, done, total):
+    if progress is not None and (done % PROGRESS_EVERY == 0 or done == total):
+        progress(done, total)
+
+
+def format_vtt_timestamp(seconds):
+    """Convert seconds to WebVTT timestamp format (HH:MM:SS.mmm)"""
+    return format_srt_timestamp(seconds).replace(",", ".")
+
+
+# Exporter registry: format name -> Exporter subclass
+EXPORTERS = {}
+
+
+def register_exporter(cls):
+    """Class decorator adding an output format to EXPORTERS"""
+    EXPORTERS[cls.name] = cls
+    return cls
+
+
+class Exporter:
+    """One output format, written a segment at a time
+
+    Subclasses set the class attributes and return text from header(),
+    segment() and footer(); one instance writes one file, so it can keep
+    running state such as a subtitle counter. info is the transcript's
+    TranscriptInfo when known, None otherwise.
+    """
+
+    name = None  # Registry key, also used on the command line
+    title = None  # File dialog label
+    extension = None  # Extension offered by save dialogs
+    suffix = None  # Appended to the input file's stem for batch and "Export All" outputs
+    needs_words = False  # Reads word timings (word-level alignment runs first when missing)
+
+    def __init__(self, info=None):
+        self.info = info
+
+    def header(self):
+        return ""
+
+    def segment(self, index, start, end, text, words):
+        """Text for the segment at 0-based index, words as (start, end, word) tuples or None"""
+        raise NotImplementedError
+
+    def footer(self):
+        return ""
+
+
+@register_exporter
+class TextExporter(Exporter):
+    """Plain text transcript, one timestamped line per segment"""
+
+    name = "txt"
+    title = "Text files"
+    extension = ".txt"
+    suffix = "_transcription.txt"
+
+    def segment(self, index, start, end, text, words):
+        separator = "" if index == 0 else "\n"
+        return f"{separator}[{format_timestamp(start)}] {text.strip()}"
+
+
+@register_exporter
+class SRTExporter(Exporter):
+    """SRT subtitles, one entry per segment"""
+
+    name = "srt"
+    title = "SRT files"
+    extension = ".srt"
+    suffix = ".srt"
+
+    def segment(self, index, start, end, text, words):
+        # Entries are separated by an empty line, the last one ends with a single newline
+        separator = "" if index == 0 else "\n"
+        return f"{separator}{index + 1}\n{format_srt_timestamp(start)} --> {format_srt_timestamp(end)}\n{text.strip()}\n"
+
+
+@register_exporter
+class WordSRTExporter(Exporter):
+    """Word-level SRT entries (karaoke style) in one linear pass
+
+    Each segment's sentence is joined once; every entry is then the sentence
+    sliced around the current word, instead of rebuilding it word by word.
+    """
+
+    name = "srt_words"
+    title = "SRT files"
+    extension = ".srt"
+    suffix = "_words.srt"
+    needs_words = True
+
+    def __init__(self, info=None):
+        super().__init__(info)
+        self.subtitle_index = 1
+
+    def segment(self, index, start, end, text, words):
+        subtitle_index = self.subtitle_index
+        if not words:
+            # Fallback to segment-level if words not available
+            self.subtitle_index += 1
+            separator = "" if subtitle_index == 1 else "\n"
+            return (f"{separator}{subtitle_index}\n"
+                    f"{format_srt_timestamp(start)} --> {format_srt_timestamp(end)}\n"
+                    f"{text.strip()}\n")
+
+        stripped = [word.strip() for _, _, word in words]
+        sentence = " ".join(stripped)
+        entries = []
+        offset = 0
+        for (word_start, word_end, _), word_text in zip(words, stripped):
+            before = sentence[:offset]
+            after = sentence[offset + len(word_text):]
+            offset += len(word_text) + 1
+
+            separator = "" if subtitle_index == 1 else "\n"
+            entries.append(f"{separator}{subtitle_index}\n"
+                           f"{format_srt_timestamp(word_start)} --> {format_srt_timestamp(word_end)}\n"
+                           f"{before}<u>{word_text}</u>{after}\n")
+            subtitle_index += 1
+        self.subtitle_index = subtitle_index
+        return "".join(entries)
+
+
+@register_exporter
+class VTTExporter(Exporter):
+    """WebVTT subtitles, one cue per segment"""
+
+    name = "vtt"
+    title = "WebVTT files"
+    extension = ".vtt"
+    suffix = ".vtt"
+
+    def header(self):
+        return "WEBVTT\n"
+
+    def segment(self, index, start, end, text, words):
+        return f"\n{format_vtt_timestamp(start)} --> {format_vtt_timestamp(end)}\n{text.strip()}\n"
+
+
+@register_exporter
+class JSONExporter(Exporter):
+    """JSON document with the language, duration, segments and their word timings"""
+
+    name = "json"
+    title = "JSON files"
+    extension = ".json"
+    suffix = ".json"
+    needs_words = True
+
+    def header(self):
+        language = getattr(self.info, "language", None)
+        duration = getattr(self.info, "duration", None)
+        return f'{{"language": {json.dumps(language)}, "duration": {json.dumps(duration)}, "segments": ['
+
+    def segment(self, index, start, end, text, words):
+        data = {"start": round(start, 3), "end": round(end, 3), "text": text.strip()}
+        if words:
+            data["words"] = [{"start": round(w_start, 3), "end": round(w_end, 3), "word": word.strip()}
+                             for w_start, w_end, word in words]
+        return ("\n" if index == 0 else ",\n") + json.dumps(data, ensure_ascii=False)
+
+    def footer(self):
+        return "\n]}\n"
+
+
+@register_exporter
+class TSVExporter(Exporter):
+    """Tab separated start and end (in milliseconds) and text, for spreadsheets and scripts"""
+
+    name = "tsv"
+    title = "TSV files"
+    extension = ".tsv"
+    suffix = ".tsv"
+
+    def header(self):
+        return "start\tend\ttext\n"
+
+    def segment(self, index, start, end, text, words):
+        text = " ".join(text.split())  # Tabs and line breaks would split the row
+        return f"{round(start * 1000)}\t{round(end * 1000)}\t{text}\n"
+
+
+def iter_export(name, segments, progress=None, info=None):
+    """Yield one format's output piece by piece without building the whole document"""
+    exporter = EXPORTERS[name](info)
+    total = len(segments)
+    yield exporter.header()
+    rows = iter_segment_rows(segments, with_words=exporter.needs_words)
+    for index, (start, end, text, words) in enumerate(rows):
+        yield exporter.segment(index, start, end, text, words)
+        _report(progress, index + 1, total)
+    yield exporter.footer()
+
+
+def iter_text(segments, progress=None):
+    """Yield the plain text transcript line by line (one timestamped line per segment)"""
+    return iter_export("txt", segments, progress)
+
+
+def iter_srt(segments, progress=None):
+    """Yield SRT subtitle entries one at a time"""
+    return iter_export("srt", segments, progress)
+
+
+def iter_srt_words(segments, progress=None):
+    """Yield word-level SRT entries (karaoke style), one segment's entries at a time"""
+    return iter_export("srt_words", segments, progress)
+
+
+def generate_text(segments):
+    """Generate the plain text transcript (one timestamped line per segment)"""
+    return "".join(iter_text(segments))
+
+
+def generate_srt(segments):
+    """Generate SRT subtitle format from segments"""
+    return "".join(iter_srt(segments))
+
+
+def generate_srt_words(segments):
+    """Generate SRT subtitle format with word-level timestamps (karaoke style)"""
+    return "".join(iter_srt_words(segments))
+
+
+def write_export(path, chunks):
+    """Stream exporter output to a file without building the whole document"""
+    with open(path, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+        f.writelines(chunks)
+
+
+def needs_words(formats):
+    """Whether any of the formats reads word timings"""
+    return any(EXPORTERS[name].needs_words for name in formats)
+
+
+def write_exports(segments, targets, progress=None, info=None):
+    """Write several formats in a single pass over the segments
+
+    targets is a list of (format name, path). Every file is open at once and
+    each segment is formatted for all of them as it is read, so a SegmentStore
+    is decoded (and its words looked up) once however many formats are written.
+    """
+    exporters = [(EXPORTERS[name](info), path) for name, path in targets]
+    with_words = any(exporter.needs_words for exporter, _ in exporters)
+    total = len(segments)
+    with ExitStack() as stack:
+        files = [(exporter, stack.enter_context(open(path, 'w', encoding='utf-8', buffering=1024 * 1024)))
+                 for exporter, path in exporters]
+        for exporter, f in files:
+            f.write(exporter.header())
+        for index, (start, end, text, words) in enumerate(iter_segment_rows(segments, with_words=with_words)):
+            for exporter, f in files:
+                f.write(exporter.segment(index, start, end, text, words))
+            _report(progress, index + 1, total)
+        for exporter, f in files:
+            f.write(exporter.footer())
+    return [path for _, path in targets]
+
+
+def write_outputs(segments, output_base, formats=("txt", "srt"), progress=None, info=None):
+    """Write the selected output formats next to output_base in one pass, returning the paths"""
+    return write_exports(segments, [(name, f"{output_base}{EXPORTERS[name].suffix}") for name in formats],
+                         progress=progress, info=info)
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+WhisperUI transcript library
+Every finished transcript in one local SQLite database: segments with their
+timings, plus the file hash, model, language and real-time factor of the run,
+under an FTS5 full-text index for instant search across all of them
+
+Search or list it from the command line:
+    python transcript_library.py --search "quarterly budget"
+    python transcript_library.py --list
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import transcriber
+from result_cache import CACHE_ROOT
+
+
+BATCH_SIZE = 200  # Segments per write transaction while transcribing
+FLUSH_SECONDS = 5.0  # ...or sooner when segments arrive slowly
+STALE_SECONDS = 24 * 3600  # Unfinished transcripts older than this are left over from a crash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    result_key TEXT UNIQUE,
+    content_hash TEXT NOT NULL,
+    file_name TEXT,
+    file_path TEXT,
+    edition TEXT,
+    model TEXT,
+    language TEXT,
+    preset TEXT,
+    duration REAL,
+    realtime_factor REAL,
+    segment_count INTEGER NOT NULL DEFAULT 0,
+    complete INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    transcript_id INTEGER NOT NULL,
+    start_seconds REAL NOT NULL,
+    end_seconds REAL NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_by_transcript ON segments(transcript_id, start_seconds);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(text, content='segments', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS segments_ai AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_ad AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+METADATA = ("edition", "model", "language", "preset", "duration", "realtime_factor")
+
+
+def default_library_path():
+    """Library database, override with WHISPERUI_LIBRARY_FILE"""
+    return os.environ.get("WHISPERUI_LIBRARY_FILE", os.path.join(CACHE_ROOT, "library.sqlite3"))
+
+
+def fts_query(text):
+    """FTS5 expression for typed text: every word must appear, the last one may be unfinished"""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"  # Search as you type
+    return " ".join(terms)
+
+
+class TranscriptLibrary:
+    """SQLite store of finished transcripts, one connection per thread"""
+
+    def __init__(self, path=None, on_error=None):
+        self.path = path or default_library_path()
+        self.on_error = on_error  # on_error(message), from any thread, when a transcript could not be stored
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self):
+        """This thread's connection (SQLite connections can't be shared between threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            # Readers (search) don't wait for a transcription that is writing
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._prune_stale(conn)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def report_error(self, error):
+        """Pass a failed write on to on_error (the app's status bar, or stderr for the CLI)"""
+        if self.on_error is not None:
+            self.on_error(f"Transcript library not saving: {error}")
+
+    @staticmethod
+    def _prune_stale(conn):
+        stale = [row[0] for row in conn.execute(
+            "SELECT id FROM transcripts WHERE complete = 0 AND created < ?", (time.time() - STALE_SECONDS,)
+        )]
+        with conn:
+            for transcript_id in stale:
+                conn.execute("DELETE FROM segments WHERE transcript_id = ?", (transcript_id,))
+                conn.execute("DELETE FROM transcripts WHERE id = ?", (transcript_id,))
+
+    # Writing
+
+    def begin(self, content_hash, file_path, **meta):
+        """Start storing a transcript as it is decoded, returns a LibraryWriter"""
+        return LibraryWriter(self, content_hash, file_path, meta)
+
+    def add(self, segments, content_hash, file_path, result_key=None, **meta):
+        """Store a finished transcript in one go, returns its id"""
+        writer = self.begin(content_hash, file_path, **meta)
+        writer.extend(segments)
+        return writer.finish(result_key=result_key)
+
+    def delete(self, transcript_id):
+        conn = self.connection()
+        with conn:
+            conn.execute("DELETE FROM segments WHERE transcript_id = ?", (transcript_id,))
+            conn.execute("DELETE FROM transcripts WHERE id = ?", (transcript_id,))
+
+    # Reading
+
+    def has(self, result_key):
+        """Whether a finished transcript with this result cache key is stored"""
+        row = self.connection().execute(
+            "SELECT 1 FROM transcripts WHERE result_key = ? AND complete = 1", (result_key,)
+        ).fetchone()
+        return row is not None
+
+    def get(self, transcript_id):
+        """Metadata of one transcript, or None"""
+        row = self.connection().execute("SELECT * FROM transcripts WHERE id = ?", (transcript_id,)).fetchone()
+        return dict(row) if row else None
+
+    def segments(self, transcript_id):
+        """Segments of one transcript in order, as transcriber.Segment records"""
+        rows = self.connection().execute(
+            "SELECT start_seconds, end_seconds, text FROM segments WHERE transcript_id = ? ORDER BY start_seconds, id",
+            (transcript_id,)
+        )
+        return [transcriber.Segment(start, end, text, None) for start, end, text in rows]
+
+    def search(self, text, limit=200):
+        """Matching segments of finished transcripts, newest first, as dicts with the transcript's metadata
+
+        Newest first lets FTS5 stop after `limit` matches instead of ranking
+        every one, so common words stay instant across thousands of transcripts.
+        """
+        query = fts_query(text)
+        if query is None:
+            return []
+        rows = self.connection().execute(
+            """
+            SELECT s.transcript_id, s.start_seconds, s.end_seconds,
+                   snippet(segments_fts, 0, '[', ']', '…', 16) AS snippet,
+                   t.file_name, t.file_path, t.model, t.language, t.created
+            FROM segments_fts
+            JOIN segments s ON s.id = segments_fts.rowid
+            JOIN transcripts t ON t.id = s.transcript_id
+            WHERE segments_fts MATCH ? AND t.complete = 1
+            ORDER BY segments_fts.rowid DESC
+            LIMIT ?
+            """,
+            (query, limit)
+        )
+        return [dict(row) for row in rows]
+
+    def recent(self, limit=200):
+        """Most recently stored finished transcripts"""
+        rows = self.connection().execute(
+            "SELECT * FROM transcripts WHERE complete = 1 ORDER BY created DESC LIMIT ?", (limit,)
+        )
+        return [dict(row) for row in rows]
+
+    def stats(self):
+        conn = self.connection()
+        transcripts, segments, seconds = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(segment_count), 0), COALESCE(SUM(duration), 0) "
+            "FROM transcripts WHERE complete = 1"
+        ).fetchone()
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        return {"transcripts": transcripts, "segments": segments, "audio_hours": seconds / 3600, "bytes": size}
+
+
+class LibraryWriter:
+    """Stores one transcript's segments in batched transactions as they arrive
+
+    The transcript only shows up in searches once finish() is called; abort()
+    removes what was written. A library error is reported once through the
+    library's on_error and further writes are skipped, so it can never fail
+    a transcription.
+    """
+
+    def __init__(self, library, content_hash, file_path, meta, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS):
+        self.library = library
+        self.content_hash = content_hash
+        self.file_path = str(file_path) if file_path else None
+        self.meta = {name: meta.get(name) for name in METADATA}
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.transcript_id = None
+        self.count = 0
+        self.failed = False
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def _guard(self, action):
+        if self.failed:
+            return None
+        try:
+            return action(self.library.connection())
+        except sqlite3.Error as e:
+            self.failed = True
+            self.library.report_error(e)
+            return None
+
+    def _create(self, conn):
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO transcripts (content_hash, file_name, file_path, edition, model, language, preset, "
+                "duration, realtime_factor, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.content_hash, Path(self.file_path).name if self.file_path else None, self.file_path,
+                 *(self.meta[name] for name in METADATA), time.time())
+            )
+        self.transcript_id = cursor.lastrowid
+
+    def add(self, segment):
+        self._pending.append((segment.start, segment.end, segment.text))
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def extend(self, segments):
+        for segment in segments:
+            self.add(segment)
+
+    def flush(self):
+        """Write the pending segments in one transaction"""
+        pending, self._pending = self._pending, []
+        self._last_flush = time.monotonic()
+
+        def write(conn):
+            if self.transcript_id is None:
+                self._create(conn)
+            with conn:
+                conn.executemany(
+                    "INSERT INTO segments (transcript_id, start_seconds, end_seconds, text) VALUES (?, ?, ?, ?)",
+                    [(self.transcript_id, start, end, text) for start, end, text in pending]
+                )
+            self.count += len(pending)
+
+        if pending:
+            self._guard(write)
+
+    def finish(self, result_key=None, **meta):
+        """Make the transcript searchable, replacing an earlier one with the same result key; returns its id"""
+        self.flush()
+        self.meta.update((name, value) for name, value in meta.items() if name in METADATA)
+
+        def complete(conn):
+            if self.transcript_id is None:
+                self._create(conn)
+            with conn:
+                if result_key is not None:
+                    for (old_id,) in conn.execute(
+                        "SELECT id FROM transcripts WHERE result_key = ? AND id != ?", (result_key, self.transcript_id)
+                    ).fetchall():
+                        conn.execute("DELETE FROM segments WHERE transcript_id = ?", (old_id,))
+                        conn.execute("DELETE FROM transcripts WHERE id = ?", (old_id,))
+                conn.execute(
+                    "UPDATE transcripts SET result_key = ?, language = ?, duration = ?, realtime_factor = ?, "
+                    "segment_count = ?, complete = 1 WHERE id = ?",
+                    (result_key, self.meta["language"], self.meta["duration"], self.meta["realtime_factor"],
+                     self.count, self.transcript_id)
+                )
+            return self.transcript_id
+
+        return self._guard(complete)
+
+    def abort(self):
+        """Remove a transcript that won't be finished (stopped or failed run)"""
+        self._pending = []
+        if self.transcript_id is not None:
+            self._guard(lambda conn: self.library.delete(self.transcript_id))
+
+
+def format_date(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp)) if timestamp else ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the WhisperUI transcript library")
+    parser.add_argument("--search", help="Words to look for (the last one may be a prefix)")
+    parser.add_argument("--list", action="store_true", help="List the most recent transcripts")
+    parser.add_argument("--show", type=int, metavar="ID", help="Print one transcript")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    library = TranscriptLibrary(on_error=lambda message: print(message, file=sys.stderr))
+    if args.search:
+        started = time.perf_counter()
+        results = library.search(args.search, limit=args.limit)
+        print(f"{len(results)} matches in {(time.perf_counter() - started) * 1000:.0f} ms", file=sys.stderr)
+        for row in results:
+            print(f"#{row['transcript_id']} {row['file_name']} [{transcriber.format_timestamp(row['start_seconds'])}] "
+                  f"{row['snippet']}")
+    elif args.show is not None:
+        segments = library.segments(args.show)
+        if not segments:
+            print(f"No transcript #{args.show}", file=sys.stderr)
+            return 1
+        print(transcriber.generate_text(segments))
+    elif args.list:
+        for row in library.recent(limit=args.limit):
+            rtf = f"{row['realtime_factor']:.1f}x" if row["realtime_factor"] else "-"
+            print(f"#{row['id']:<5} {format_date(row['created'])}  {row['model'] or '-':<9} {row['language'] or '-':<3} "
+                  f"{row['segment_count']:>6} segments  {rtf:>6}  {row['file_name']}")
+    else:
+        stats = library.stats()
+        print(f"{stats['transcripts']} transcripts, {stats['segments']} segments, "
+              f"{stats['audio_hours']:.1f} h of audio, {stats['bytes'] / (1024 * 1024):.1f} MB in {library.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
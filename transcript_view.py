@@ -0,0 +1,148 @@
+"""
+WhisperUI virtualized transcript view
+Shows only the segments that fit in the window, read from the transcript's
+segment list, so inserting, scrolling and resizing cost the same for a
+ten-hour recording as for a short one. Segment start times double as the
+index for jumping to any timestamp
+"""
+
+import bisect
+import tkinter as tk
+
+import transcriber
+
+
+def parse_timestamp(text):
+    """Seconds from '1:02:03', '62:03', '3723' or '3723.5', None if unreadable"""
+    try:
+        seconds = 0.0
+        for part in text.strip().split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+class TranscriptView(tk.Frame):
+    """Scrollable transcript that renders a window of segments on demand
+
+    segments() returns the current transcript (a SegmentStore or a list of
+    segments); only its first `count` segments are shown, so a worker can
+    keep appending while set_count() tells the view how many are complete.
+    """
+
+    def __init__(self, master, segments, font=("Courier", 11), **kwargs):
+        super().__init__(master, **kwargs)
+        self.segments = segments
+        self.count = 0  # Segments available for display
+        self.top = 0  # First segment in the window
+        self.follow = True  # Keep the newest segment in view while transcribing
+        self.highlight = None  # Segment index last jumped to
+
+        self.text = tk.Text(self, height=20, width=80, font=font, wrap=tk.WORD, state=tk.DISABLED,
+                            cursor="arrow")
+        self.text.tag_configure("highlight", background="#FFF59D")
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Re-wrapping is limited to the rows on screen
+        self.text.bind("<Configure>", lambda event: self.render())
+        self.text.bind("<MouseWheel>", self._on_mousewheel)
+        self.text.bind("<Button-4>", lambda event: self.scroll(-3))  # X11 wheel
+        self.text.bind("<Button-5>", lambda event: self.scroll(3))
+        self.text.bind("<Prior>", lambda event: self.scroll(-self.visible_rows()))
+        self.text.bind("<Next>", lambda event: self.scroll(self.visible_rows()))
+        self.text.bind("<Home>", lambda event: self.scroll_to(0))
+        self.text.bind("<End>", lambda event: self.scroll_to(self.count))
+        self.text.bind("<Button-1>", lambda event: self.text.focus_set(), add=True)
+
+    def visible_rows(self):
+        """Segments that fit at one line each (wrapped ones simply run past the bottom)"""
+        height = self.text.winfo_height()
+        line = self.text.tk.call("font", "metrics", self.text.cget("font"), "-linespace")
+        if height <= 1:
+            return int(self.text.cget("height"))  # Not mapped yet
+        return max(1, int(height) // max(1, int(line)))
+
+    def set_count(self, count):
+        """Show segments up to count (main thread)"""
+        self.count = count
+        if self.follow:
+            self.top = max(0, count - self.visible_rows())
+        self.render()
+
+    def clear(self):
+        """Empty the view (main thread)"""
+        self.count = 0
+        self.top = 0
+        self.follow = True
+        self.highlight = None
+        self.render()
+
+    def scroll(self, rows):
+        self.scroll_to(self.top + rows)
+
+    def scroll_to(self, index):
+        """Put segment index at the top of the window (clamped)"""
+        rows = self.visible_rows()
+        self.top = max(0, min(index, self.count - rows))
+        # Scrolling back to the end resumes following new segments
+        self.follow = self.top + rows >= self.count
+        self.render()
+
+    def jump_to_time(self, seconds):
+        """Show and highlight the segment playing at seconds, returns its index or None"""
+        segments = self.segments()
+        count = min(self.count, len(segments))
+        if not count:
+            return None
+        starts = getattr(segments, "starts", None)
+        if starts is None:
+            starts = [segment.start for segment in segments[:count]]
+        # Start times are in order, so a binary search finds the segment
+        index = max(0, bisect.bisect_right(starts, seconds, 0, count) - 1)
+        self.highlight = index
+        self.scroll_to(index - 2)  # A little context above it
+        return index
+
+    def render(self):
+        """Draw the segments in the window (main thread)"""
+        segments = self.segments()
+        count = min(self.count, len(segments))
+        rows = self.visible_rows()
+        self.top = max(0, min(self.top, count - rows))
+        last = min(count, self.top + rows + 1)
+
+        lines = [transcriber.format_segment_line(segments[i]) for i in range(self.top, last)]
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "\n".join(lines))
+        if self.highlight is not None and self.top <= self.highlight < last:
+            line = self.highlight - self.top + 1
+            self.text.tag_add("highlight", f"{line}.0", f"{line}.end")
+        if self.follow:
+            self.text.see(tk.END)  # The last segment may wrap past the bottom
+        self.text.config(state=tk.DISABLED)
+
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, last / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        rows = self.visible_rows()
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.count))
+        elif unit == "pages":
+            self.scroll(int(amount) * rows)
+        else:
+            self.scroll(int(amount))
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        if abs(event.delta) >= 120:
+            self.scroll(-3 * (event.delta // 120))
+        else:
+            self.scroll(-event.delta)
+        return "break"
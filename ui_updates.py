@@ -0,0 +1,95 @@
+"""
+WhisperUI coalesced UI updates
+Worker threads push updates (such as the transcript's segment count) into a
+thread-safe queue; a fixed-rate tick on the Tk main thread reduces everything
+pending with combine() and applies the result in one widget update
+"""
+
+import queue
+import time
+from collections import deque
+
+
+# Marker that clears the transcript, kept in order with the items around it
+CLEAR = object()
+
+
+class UIUpdateQueue:
+    """Thread-safe update feed drained by a fixed-rate Tk tick
+
+    combine() reduces the items pending at a tick to one append() argument:
+    "".join for text chunks (the default), max for counts where only the
+    newest matters.
+    """
+
+    def __init__(self, root, append, clear, interval_ms=100, combine=None):
+        self.root = root
+        self.append = append  # append(combined), one widget update (e.g. TranscriptView.set_count)
+        self.clear = clear  # clear(), empty the widget
+        self.combine = combine or "".join  # Reduces the pending items to one append() argument
+        self.interval_ms = interval_ms
+        self._queue = queue.SimpleQueue()
+        self._after_id = None
+
+        # Counters for checking that the main thread stays responsive
+        self.updates = 0  # widget operations performed
+        self.items = 0  # items delivered
+        self._recent = deque()  # monotonic times of recent widget operations
+
+    def put(self, item):
+        """Queue an update item (any thread)"""
+        self._queue.put(item)
+
+    def reset(self):
+        """Queue a clear of the transcript (any thread)"""
+        self._queue.put(CLEAR)
+
+    def start(self):
+        """Start the drain tick (main thread)"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        """Stop the drain tick (main thread)"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def drain(self):
+        """Apply everything queued so far in as few widget operations as possible (main thread)"""
+        pending = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is CLEAR:
+                # Items queued before the clear would be wiped by it anyway
+                pending = []
+                self.clear()
+                self._count_update()
+            else:
+                pending.append(item)
+
+        if pending:
+            self.append(self.combine(pending))
+            self.items += len(pending)
+            self._count_update()
+
+    def _tick(self):
+        self._after_id = None
+        try:
+            self.drain()
+        finally:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def _count_update(self):
+        self.updates += 1
+        self._recent.append(time.monotonic())
+
+    def updates_per_second(self):
+        """Widget operations during the last second"""
+        cutoff = time.monotonic() - 1.0
+        while self._recent and self._recent[0] < cutoff:
+            self._recent.popleft()
+        return len(self._recent)
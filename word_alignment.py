@@ -0,0 +1,96 @@
+"""
+WhisperUI deferred word alignment
+Word timings for an already finished transcript, computed only when a
+word-level export asks for them: each segment's audio is encoded once and its
+text force-aligned with the model's cross-attention, without decoding again
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import transcriber
+
+
+SAMPLING_RATE = 16000
+BATCH_SIZE = 8  # Segments per encoder/alignment call
+
+# faster-whisper's defaults, punctuation is attached to the neighbouring word
+PREPEND_PUNCTUATIONS = "\"'“¿([{-"
+APPEND_PUNCTUATIONS = "\"'.。,，!！?？:：”)]}、"
+
+
+def has_word_timings(segments):
+    """Whether any segment carries word timings"""
+    word_ids = getattr(segments, 'word_ids', None)
+    if word_ids is not None:
+        return len(word_ids) > 0  # SegmentStore, without building segment views
+    return any(getattr(segment, 'words', None) for segment in segments)
+
+
+def align_words(model, audio, segments, language, batch_size=BATCH_SIZE, workers=1, progress=None, stop_event=None):
+    """Return the segments with word timings from one alignment pass over the audio
+
+    Segments are aligned in batches, one encoder and one alignment call each,
+    which CTranslate2 spreads over the model's threads. With workers > 1 (and a
+    model loaded with num_workers >= workers) batches also run concurrently.
+    progress(done, total) reports aligned segments. Returns None if stopped.
+    """
+    import numpy as np
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.tokenizer import Tokenizer
+
+    segments = list(segments)
+    total = len(segments)
+    tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=language or "en")
+    extractor = model.feature_extractor
+    hop = extractor.hop_length
+
+    def align_batch(first):
+        if stop_event is not None and stop_event.is_set():
+            return None
+        features, frames, batch, indices = [], [], [], []
+        for index in range(first, min(first + batch_size, total)):
+            segment = segments[index]
+            # Start on a feature frame boundary so word times map back exactly
+            seek = int(segment.start * SAMPLING_RATE) // hop
+            clip = np.asarray(audio[seek * hop:int(segment.end * SAMPLING_RATE)], dtype=np.float32)
+            text = segment.text if segment.text.startswith(" ") else " " + segment.text
+            tokens = tokenizer.encode(text.rstrip()) if segment.text.strip() and len(clip) >= hop else []
+            if not tokens:
+                continue
+            feature = extractor(clip)
+            frames.append(min(extractor.nb_max_frames, len(clip) // hop))
+            features.append(pad_or_trim(feature))
+            batch.append([{"seek": seek, "start": segment.start, "end": segment.end, "tokens": tokens}])
+            indices.append(index)
+
+        words = {}
+        if batch:
+            encoder_output = model.encode(np.stack(features))
+            model.add_word_timestamps(
+                batch, tokenizer, encoder_output, frames,
+                PREPEND_PUNCTUATIONS, APPEND_PUNCTUATIONS,
+                # Only used to spot overlong first words after a pause
+                last_speech_timestamp=segments[first - 1].end if first else 0.0,
+            )
+            for index, (subsegment,) in zip(indices, batch):
+                words[index] = [
+                    transcriber.Word(word["start"], word["end"], word["word"], word["probability"])
+                    for word in subsegment.get("words", ())
+                ]
+        return first, words
+
+    aligned = []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="align") as executor:
+        # map() yields batches in order, so segments are rebuilt as they complete
+        for result in executor.map(align_batch, range(0, total, batch_size)):
+            if result is None:
+                return None
+            first, words = result
+            for index in range(first, min(first + batch_size, total)):
+                segment = segments[index]
+                aligned.append(transcriber.Segment(segment.start, segment.end, segment.text, words.get(index)))
+            if progress:
+                progress(len(aligned), total)
+    if stop_event is not None and stop_event.is_set():
+        return None
+    return aligned